@@ -0,0 +1,210 @@
+"""
+Модуль нормалізації та розбору адрес базових станцій.
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import pandas as pd
+
+
+# Компоненти адреси: (регіон, район, населений пункт, вулиця, номер)
+AddressParts = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+
+PART_COLUMNS = ['region', 'district', 'locality', 'street', 'number']
+
+# Канонічне скорочення -> варіанти написання (повні назви, скорочення, рос. варіанти)
+ABBREVIATIONS = {
+    'ОБЛ.': ['ОБЛАСТЬ', 'ОБЛ.', 'ОБЛ'],
+    'Р-Н': ['РАЙОН', 'Р-Н', 'Р-ОН', 'Р-Н.'],
+    'М.': ['МІСТО', 'М.', 'ГОРОД'],
+    'СМТ': ['СЕЛИЩЕ МІСЬКОГО ТИПУ', 'ПОСЕЛОК ГОРОДСКОГО ТИПА', 'СМТ.', 'СМТ', 'ПГТ.', 'ПГТ'],
+    'СЕЛ.': ['СЕЛИЩЕ', 'СЕЛ.', 'ПОСЕЛОК', 'ПОС.'],
+    'С.': ['СЕЛО', 'С.'],
+    'ВУЛ.': ['ВУЛИЦЯ', 'ВУЛ.', 'ВУЛ', 'УЛИЦА', 'УЛ.'],
+    'ПР.': ['ПРОСПЕКТ', 'ПРОСП.', 'ПР-Т', 'ПР-Т.', 'ПР.'],
+    'БУЛ.': ['БУЛЬВАР', 'БУЛЬВ.', 'БУЛ.', 'Б-Р'],
+    'ПРОВ.': ['ПРОВУЛОК', 'ПРОВ.', 'ПЕРЕУЛОК', 'ПЕР.'],
+    'ПЛ.': ['ПЛОЩА', 'ПЛОЩАДЬ', 'ПЛ.'],
+    'Ш.': ['ШОСЕ', 'ШОССЕ', 'Ш.'],
+    'НАБ.': ['НАБЕРЕЖНА', 'НАБЕРЕЖНАЯ', 'НАБ.'],
+    'ТУП.': ['ТУПИК', 'ТУП.'],
+    'УЗВ.': ['УЗВІЗ', 'УЗВ.'],
+    'БУД.': ['БУДИНОК', 'БУД.', 'ДОМ'],
+}
+
+STREET_TYPES = ['ВУЛ.', 'ПР.', 'БУЛ.', 'ПРОВ.', 'ПЛ.', 'Ш.', 'НАБ.', 'ТУП.', 'УЗВ.']
+LOCALITY_TYPES = ['М.', 'СМТ', 'СЕЛ.', 'С.']
+
+_VARIANTS = {
+    variant: canonical
+    for canonical, variants in ABBREVIATIONS.items()
+    for variant in variants
+}
+
+
+def _variant_pattern(variant: str) -> str:
+    """Шаблон варіанту: окреме слово, крапка в кінці сама завершує слово."""
+    escaped = re.escape(variant).replace(r'\ ', r'\s+')
+    return escaped if variant.endswith('.') else escaped + r'(?!\w)'
+
+
+# Довші варіанти мають іти першими, інакше 'ПР.' перехопить 'ПР-Т'
+_ABBREVIATION_RE = re.compile(
+    r'(?<![\w-])(?:'
+    + '|'.join(_variant_pattern(v) for v in sorted(_VARIANTS, key=len, reverse=True))
+    + ')'
+)
+# 'Б.'/'Д.' означають будинок лише перед номером, інакше це ініціал ('ВУЛ. Б. ХМЕЛЬНИЦЬКОГО')
+_BUILDING_RE = re.compile(r'(?<![\w-])[БД]\.\s*(?=\d)')
+_SPACES_RE = re.compile(r'\s+')
+_COMMA_RE = re.compile(r'\s*,\s*')
+
+_TYPE_ALTERNATION = '|'.join(re.escape(t) for t in STREET_TYPES)
+_REGION_RE = re.compile(r'(?<!\w)ОБЛ\.')
+_DISTRICT_RE = re.compile(r'(?<!\w)Р-Н(?!\w)')
+_LOCALITY_RE = re.compile(
+    r'(?<!\w)(?:' + '|'.join(re.escape(t) for t in LOCALITY_TYPES) + r')(?=\s|$)'
+)
+_STREET_RE = re.compile(
+    r'^(?P<prefix>.*?)\s*(?P<street>(?<!\w)(?:' + _TYPE_ALTERNATION + r').*?)'
+    r'(?:\s+(?:БУД\.\s*)?(?P<number>\d+[А-ЯІЇЄҐ]?(?:/\d+[А-ЯІЇЄҐ]?)?))?$'
+)
+# Адреси без ком: 'КИЇВСЬКА ОБЛ. М. КИЇВ ...' розрізаються після регіону та району
+_PART_SPLIT_RE = re.compile(r', |(?:(?<=ОБЛ\.)|(?<=Р-Н))\s+(?=\S)')
+_NUMBER_RE = re.compile(r'^(?:БУД\.\s*)?(\d+[А-ЯІЇЄҐ]?(?:/\d+[А-ЯІЇЄҐ]?)?)$')
+
+
+def _canonical(match: 're.Match') -> str:
+    """Заміна знайденого варіанту на канонічне скорочення."""
+    variant = _SPACES_RE.sub(' ', match.group(0))
+    return _VARIANTS[variant] + ' '
+
+
+class AddressNormalizer:
+    """
+    Нормалізатор адрес з обмеженим LRU-кешем.
+
+    Одні й ті самі адреси БС повторюються в трафіку мільйони разів, тому
+    результати нормалізації та розбору запам'ятовуються.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        """
+        Ініціалізація нормалізатора.
+
+        Args:
+            maxsize: Максимальна кількість адрес у кожному з кешів
+        """
+        self.normalize = lru_cache(maxsize=maxsize)(self._normalize)
+        self.parse = lru_cache(maxsize=maxsize)(self._parse)
+
+    @staticmethod
+    def _normalize(address: str) -> str:
+        """
+        Нормалізація адреси.
+
+        Верхній регістр, канонічні скорочення (ВУЛИЦЯ -> ВУЛ., МІСТО -> М. тощо),
+        один пробіл між словами та ', ' між частинами.
+
+        Args:
+            address: Адреса у довільному вигляді
+
+        Returns:
+            str: Нормалізована адреса
+        """
+        text = _ABBREVIATION_RE.sub(_canonical, str(address).upper())
+        text = _BUILDING_RE.sub('БУД. ', text)
+        text = _COMMA_RE.sub(', ', _SPACES_RE.sub(' ', text))
+        return text.strip(' ,')
+
+    def _parse(self, address: str) -> AddressParts:
+        """
+        Розділяє адресу на компоненти.
+
+        Args:
+            address: Адреса (нормалізується за потреби)
+
+        Returns:
+            AddressParts: (регіон, район, населений пункт, вулиця, номер)
+        """
+        region = district = locality = street = number = None
+
+        for part in _PART_SPLIT_RE.split(self.normalize(address)):
+            if _REGION_RE.search(part):
+                region = part
+            elif _DISTRICT_RE.search(part):
+                district = part
+            elif street is None and (match := _STREET_RE.match(part)):
+                street = match.group('street')
+                number = match.group('number') or number
+                # 'М. КИЇВ ВУЛ. ХРЕЩАТИК 1' без коми між частинами
+                prefix = match.group('prefix')
+                if prefix and locality is None and _LOCALITY_RE.search(prefix):
+                    locality = prefix
+            elif _LOCALITY_RE.search(part):
+                locality = part
+            elif street is not None and number is None and (match := _NUMBER_RE.match(part)):
+                # 'ВУЛ. ШЕВЧЕНКА, БУД. 10'
+                number = match.group(1)
+
+        return region, district, locality, street, number
+
+    def normalize_series(self, addresses: pd.Series) -> pd.Series:
+        """
+        Пакетна нормалізація адрес векторними рядковими операціями pandas.
+
+        Args:
+            addresses: Адреси у довільному вигляді
+
+        Returns:
+            pd.Series: Нормалізовані адреси (пусті значення лишаються NaN)
+        """
+        text = addresses.astype('string').str.upper()
+        text = text.str.replace(_ABBREVIATION_RE, _canonical, regex=True)
+        text = text.str.replace(_BUILDING_RE, 'БУД. ', regex=True)
+        text = text.str.replace(_SPACES_RE, ' ', regex=True)
+        text = text.str.replace(_COMMA_RE, ', ', regex=True)
+        return text.str.strip(' ,').astype(object).where(addresses.notna())
+
+    def parse_series(self, addresses: pd.Series) -> pd.DataFrame:
+        """
+        Пакетний розбір адрес на компоненти.
+
+        Кожна унікальна адреса розбирається один раз.
+
+        Args:
+            addresses: Адреси у довільному вигляді
+
+        Returns:
+            pd.DataFrame: Колонки PART_COLUMNS з індексом вхідної серії
+        """
+        normalized = self.normalize_series(addresses)
+        unique = normalized.dropna().unique()
+        parts = pd.DataFrame(
+            [self.parse(a) for a in unique],
+            index=unique,
+            columns=PART_COLUMNS
+        )
+        result = parts.reindex(normalized.to_numpy())
+        result.index = addresses.index
+        return result
+
+
+# Спільний екземпляр для всіх модулів
+_normalizer = AddressNormalizer()
+
+
+def get_normalizer() -> AddressNormalizer:
+    """Отримання спільного нормалізатора адрес."""
+    return _normalizer
+
+
+def normalize_address(address: str) -> str:
+    """Нормалізація адреси спільним нормалізатором."""
+    return _normalizer.normalize(address)
+
+
+def parse_address(address: str) -> AddressParts:
+    """Розбір адреси на компоненти спільним нормалізатором."""
+    return _normalizer.parse(address)
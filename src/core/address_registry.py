@@ -0,0 +1,299 @@
+"""
+Модуль знімків реєстру адрес базових станцій.
+"""
+import os
+import logging
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from .address_normalizer import normalize_address
+from .database import Database
+
+
+class RegistrySnapshot(Mapping):
+    """
+    Знімок реєстру адрес у пам'яті: адреса -> (широта, довгота).
+
+    Координати зберігаються одним масивом NumPy, словник містить лише
+    індекси рядків, тому знімок великого реєстру займає мало пам'яті.
+    """
+
+    def __init__(self, addresses: np.ndarray, coords: np.ndarray, version: tuple):
+        """
+        Ініціалізація знімка.
+
+        Args:
+            addresses: Масив адрес
+            coords: Масив координат форми (N, 2)
+            version: Ознака версії файлу бази, з якої зроблено знімок
+        """
+        self.addresses = addresses
+        self.coords = coords
+        self.version = version
+        self._index: Dict[str, int] = {address: i for i, address in enumerate(addresses)}
+
+    def __getitem__(self, address: str) -> Tuple[float, float]:
+        i = self._index[address]
+        return float(self.coords[i, 0]), float(self.coords[i, 1])
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Перетворення знімка на DataFrame.
+
+        Returns:
+            pd.DataFrame: Колонки address, latitude, longitude
+        """
+        return pd.DataFrame({
+            'address': self.addresses,
+            'latitude': self.coords[:, 0],
+            'longitude': self.coords[:, 1]
+        })
+
+
+_snapshots: Dict[str, RegistrySnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _file_version(db_path: str) -> tuple:
+    """
+    Визначення версії файлу бази за часом зміни.
+
+    Враховується WAL-файл, бо в режимі WAL основний файл змінюється лише при checkpoint.
+    """
+    version = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+
+def load_registry_snapshot(database: Database) -> Optional[RegistrySnapshot]:
+    """
+    Завантаження знімка реєстру адрес одним запитом.
+
+    Знімок кешується для кожного файлу бази та перечитується лише після
+    зміни файлу, тому всі споживачі отримують один і той самий об'єкт.
+
+    Args:
+        database: Шар доступу до бази даних
+
+    Returns:
+        Optional[RegistrySnapshot]: Знімок реєстру або None, якщо бази немає
+    """
+    db_path = database.path
+    if not os.path.exists(db_path):
+        logging.error(f"База даних не знайдена: {db_path}")
+        return None
+
+    with _snapshots_lock:
+        version = _file_version(db_path)
+        snapshot = _snapshots.get(db_path)
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        rows = database.query(
+            "SELECT TRIM(address), latitude, longitude FROM addresses "
+            "WHERE address IS NOT NULL AND latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+
+        addresses = np.array([row[0] for row in rows], dtype=object)
+        coords = np.array([row[1:] for row in rows], dtype=float).reshape(-1, 2)
+
+        snapshot = RegistrySnapshot(addresses, coords, version)
+        _snapshots[db_path] = snapshot
+
+        logging.info(f"Завантажено знімок реєстру: {len(snapshot)} адрес з {db_path}")
+        return snapshot
+
+
+class RegistryPager:
+    """
+    Посторінкове читання реєстру адрес для перегляду.
+
+    Сторінки вибираються за ключем останнього показаного рядка (keyset),
+    тому вартість переходу не залежить від номера сторінки, а в пам'яті
+    тримається лише видима сторінка.
+    """
+
+    COLUMNS = ['address', 'original_address', 'locality', 'street', 'house_number', 'latitude', 'longitude']
+
+    # Колонки, за якими можна сортувати; address - унікальний ключ для рівних значень
+    SORT_COLUMNS = ('address', 'locality', 'street', 'latitude', 'longitude')
+
+    # Колонки, за значенням яких виконується пошук за префіксом
+    TEXT_COLUMNS = ('address', 'locality', 'street')
+
+    def __init__(self, database: Database, page_size: int = 200):
+        """
+        Ініціалізація читача сторінок.
+
+        Args:
+            database: Шар доступу до бази даних
+            page_size: Кількість рядків на сторінці
+        """
+        self.database = database
+        self.page_size = page_size
+
+    def count(self, prefix: str = '', sort: str = 'address') -> int:
+        """
+        Кількість записів, що відповідають префіксу.
+
+        Args:
+            prefix: Префікс для пошуку
+            sort: Колонка сортування (визначає колонку пошуку)
+
+        Returns:
+            int: Кількість записів
+        """
+        where, params = self._prefix_condition(prefix, sort)
+        sql = "SELECT COUNT(*) FROM addresses"
+        if where:
+            sql += f" WHERE {where}"
+        return self.database.query_one(sql, params)[0]
+
+    def page(
+            self,
+            prefix: str = '',
+            sort: str = 'address',
+            descending: bool = False,
+            after: Optional[tuple] = None,
+            limit: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Отримання однієї сторінки реєстру.
+
+        Args:
+            prefix: Префікс для пошуку (порожній - без фільтра)
+            sort: Колонка сортування з SORT_COLUMNS
+            descending: Сортування за спаданням
+            after: Ключ останнього рядка попередньої сторінки (див. page_key)
+            limit: Кількість рядків (None - page_size)
+
+        Returns:
+            List[tuple]: Рядки з колонками COLUMNS
+        """
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"Сортування за колонкою '{sort}' не підтримується")
+
+        conditions, params = [], []
+        where, prefix_params = self._prefix_condition(prefix, sort)
+        if where:
+            conditions.append(where)
+            params.extend(prefix_params)
+
+        if after is not None:
+            where, keyset_params = self._keyset_condition(sort, after, descending)
+            conditions.append(where)
+            params.extend(keyset_params)
+
+        order = 'DESC' if descending else 'ASC'
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM addresses"
+        if conditions:
+            sql += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        if sort == 'address':
+            sql += f" ORDER BY address {order} LIMIT ?"
+        else:
+            sql += f" ORDER BY {sort} {order}, address {order} LIMIT ?"
+        params.append(self.page_size if limit is None else limit)
+
+        return self.database.query(sql, params)
+
+    def page_key(self, row: tuple, sort: str = 'address') -> tuple:
+        """
+        Ключ рядка для переходу на наступну сторінку.
+
+        Args:
+            row: Рядок сторінки
+            sort: Колонка сортування
+
+        Returns:
+            tuple: (значення колонки сортування, адреса)
+        """
+        return row[self.COLUMNS.index(sort)], row[0]
+
+    def fuzzy(self, query: str, limit: Optional[int] = None) -> List[tuple]:
+        """
+        Нечіткий пошук за адресою у знімку реєстру.
+
+        Оцінюються рядки знімка в пам'яті, з бази читаються лише найкращі збіги.
+
+        Args:
+            query: Текст для пошуку
+            limit: Максимальна кількість результатів (за замовчуванням - розмір сторінки)
+
+        Returns:
+            List[tuple]: Рядки з колонками COLUMNS у порядку спадання схожості
+        """
+        snapshot = load_registry_snapshot(self.database)
+        if not snapshot or not query.strip():
+            return []
+
+        matches = process.extract(
+            normalize_address(query),
+            snapshot.addresses.tolist(),
+            scorer=fuzz.WRatio,
+            limit=limit or self.page_size,
+            score_cutoff=50
+        )
+        if not matches:
+            return []
+
+        addresses = [match[0] for match in matches]
+        placeholders = ', '.join('?' * len(addresses))
+        rows = self.database.query(
+            f"SELECT {', '.join(self.COLUMNS)} FROM addresses WHERE address IN ({placeholders})",
+            addresses
+        )
+        order = {address: i for i, address in enumerate(addresses)}
+        return sorted(rows, key=lambda row: order.get(row[0], len(order)))
+
+    def _prefix_condition(self, prefix: str, sort: str) -> Tuple[str, list]:
+        """
+        Умова пошуку за префіксом у вигляді діапазону, що використовує індекс.
+
+        Пошук ведеться за колонкою сортування, якщо вона текстова, інакше за адресою.
+        """
+        prefix = normalize_address(prefix) if prefix and prefix.strip() else ''
+        if not prefix:
+            return '', []
+
+        column = sort if sort in self.TEXT_COLUMNS else 'address'
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return f"{column} >= ? AND {column} < ?", [prefix, upper]
+
+    @staticmethod
+    def _keyset_condition(sort: str, after: tuple, descending: bool) -> Tuple[str, list]:
+        """Умова рядків, що йдуть після ключа (value, address) у порядку сортування."""
+        value, address = after
+        op = '<' if descending else '>'
+
+        if sort == 'address':
+            return f"address {op} ?", [address]
+
+        # NULL сортується першим: після NULL-групи йдуть усі непорожні значення
+        if value is None:
+            if descending:
+                return f"{sort} IS NULL AND address < ?", [address]
+            return f"({sort} IS NULL AND address > ?) OR {sort} IS NOT NULL", [address]
+
+        condition = f"({sort}, address) {op} (?, ?)"
+        if descending:
+            condition += f" OR {sort} IS NULL"
+        return condition, [value, address]
@@ -0,0 +1,254 @@
+"""
+Модуль пакетного зіставлення адрес БС з реєстром адрес.
+"""
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from .address_normalizer import get_normalizer
+from .address_registry import RegistrySnapshot
+from .database import Database
+from .resolution_cache import ResolutionCache
+
+
+class AddressResolver:
+    """Клас для пакетного пошуку координат адрес БС у реєстрі."""
+
+    # Максимальний розмір матриці оцінок одного виклику cdist (обмежує пам'ять)
+    MAX_MATRIX_CELLS = 20_000_000
+
+    def __init__(
+            self,
+            registry: pd.DataFrame,
+            threshold: int = 90,
+            workers: int = -1,
+            cache: Optional[ResolutionCache] = None
+    ):
+        """
+        Ініціалізація обробника адрес.
+
+        Args:
+            registry: DataFrame реєстру з колонками address, latitude, longitude
+            threshold: Поріг схожості (0-100)
+            workers: Кількість потоків rapidfuzz (-1 - всі ядра)
+            cache: Постійний кеш результатів зіставлення
+        """
+        self.threshold = threshold
+        self.workers = workers
+        self.cache = cache
+
+        registry = registry.dropna(subset=['address']).drop_duplicates(subset=['address'])
+        self._addresses = get_normalizer().normalize_series(registry['address']).to_numpy(dtype=object)
+        self._coords = registry[['latitude', 'longitude']].to_numpy(dtype=float)
+        self._parts = self._parts_frame(self._addresses)
+
+        # Блоки реєстру за вулицею: вулиця -> індекси рядків
+        self._street_blocks: Dict[str, np.ndarray] = {
+            street: idx.to_numpy()
+            for street, idx in self._parts.groupby('street').groups.items()
+        }
+
+        logging.info(
+            f"Реєстр адрес підготовлено: {len(self._addresses)} адрес, "
+            f"{len(self._street_blocks)} вулиць"
+        )
+
+    @classmethod
+    def from_database(
+            cls,
+            database: Database,
+            use_cache: bool = True,
+            **kwargs
+    ) -> 'AddressResolver':
+        """
+        Створення обробника з таблиці addresses бази даних.
+
+        Args:
+            database: Шар доступу до бази даних
+            use_cache: Зберігати результати в таблиці кешу тієї ж бази
+            **kwargs: Параметри конструктора
+
+        Returns:
+            AddressResolver: Обробник адрес
+        """
+        registry = database.query_df(
+            "SELECT address, latitude, longitude FROM addresses"
+        )
+        cache = ResolutionCache(database) if use_cache else None
+        return cls(registry, cache=cache, **kwargs)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: RegistrySnapshot, **kwargs) -> 'AddressResolver':
+        """
+        Створення обробника зі спільного знімка реєстру.
+
+        Args:
+            snapshot: Знімок реєстру адрес
+            **kwargs: Параметри конструктора
+
+        Returns:
+            AddressResolver: Обробник адрес
+        """
+        return cls(snapshot.to_frame(), **kwargs)
+
+    @staticmethod
+    def _parts_frame(addresses: np.ndarray) -> pd.DataFrame:
+        """
+        Розбір нормалізованих адрес на компоненти у вигляді DataFrame.
+
+        Пусті компоненти замінюються на '' для векторного порівняння.
+        """
+        parts = get_normalizer().parse_series(pd.Series(addresses, dtype=object))
+        return parts.reset_index(drop=True).fillna('')
+
+    def resolve(self, addresses: Iterable[str]) -> pd.DataFrame:
+        """
+        Пакетний пошук координат для унікальних адрес.
+
+        Адреси, вже збережені в кеші для поточної версії реєстру, не зіставляються повторно.
+
+        Args:
+            addresses: Адреси БС (дублікати та пусті значення ігноруються)
+
+        Returns:
+            pd.DataFrame: Колонки raw_address, matched_address, score, latitude, longitude
+        """
+        raw = pd.Series(list(addresses), dtype=object).dropna().astype(str).unique()
+        if self.cache is None:
+            return self._match(raw)
+
+        cached = self.cache.get_many(raw, self.threshold)
+        pending = raw[~np.isin(raw, cached['raw_address'].to_numpy())]
+        resolved = self._match(pending)
+        self.cache.put_many(resolved, self.threshold)
+
+        logging.info(f"Адрес з кешу: {len(cached)}, зіставлено заново: {len(pending)}")
+        return pd.concat([cached, resolved], ignore_index=True)
+
+    def _match(self, raw: np.ndarray) -> pd.DataFrame:
+        """
+        Зіставлення унікальних адрес з реєстром.
+
+        Args:
+            raw: Масив унікальних адрес у вихідному вигляді
+
+        Returns:
+            pd.DataFrame: Колонки raw_address, matched_address, score, latitude, longitude
+        """
+        result = pd.DataFrame({
+            'raw_address': raw,
+            'matched_address': None,
+            'score': np.nan,
+            'latitude': np.nan,
+            'longitude': np.nan
+        })
+
+        if len(raw) == 0 or len(self._addresses) == 0:
+            return result
+
+        queries = get_normalizer().normalize_series(pd.Series(raw, dtype=object)).to_numpy(dtype=object)
+        query_parts = self._parts_frame(queries)
+
+        best_idx = np.full(len(raw), -1, dtype=np.int64)
+        best_score = np.zeros(len(raw), dtype=float)
+
+        # Адреси з вулицею порівнюються лише з тією ж вулицею реєстру,
+        # решта - з усім реєстром
+        all_rows = np.arange(len(self._addresses))
+        for street, q_idx in query_parts.groupby('street').groups.items():
+            q_idx = q_idx.to_numpy()
+            c_idx = self._street_blocks.get(street) if street else all_rows
+            if c_idx is None:
+                continue
+            self._score_block(queries, query_parts, q_idx, c_idx, best_idx, best_score)
+
+        found = best_idx >= 0
+        result.loc[found, 'matched_address'] = self._addresses[best_idx[found]]
+        result.loc[found, 'score'] = best_score[found]
+        result.loc[found, 'latitude'] = self._coords[best_idx[found], 0]
+        result.loc[found, 'longitude'] = self._coords[best_idx[found], 1]
+
+        logging.info(
+            f"Зіставлено адрес: {int(found.sum())} з {len(raw)} "
+            f"(поріг {self.threshold})"
+        )
+        return result
+
+    def _score_block(
+            self,
+            queries: np.ndarray,
+            query_parts: pd.DataFrame,
+            q_idx: np.ndarray,
+            c_idx: np.ndarray,
+            best_idx: np.ndarray,
+            best_score: np.ndarray
+    ) -> None:
+        """
+        Оцінка блоку запитів проти блоку кандидатів реєстру.
+
+        Результати записуються у best_idx/best_score на місці.
+        """
+        choices = self._addresses[c_idx].tolist()
+        c_parts = self._parts.iloc[c_idx]
+
+        chunk_size = max(1, self.MAX_MATRIX_CELLS // len(c_idx))
+        for start in range(0, len(q_idx), chunk_size):
+            chunk = q_idx[start:start + chunk_size]
+            scores = process.cdist(
+                queries[chunk].tolist(),
+                choices,
+                scorer=fuzz.ratio,
+                score_cutoff=self.threshold,
+                workers=self.workers
+            )
+
+            # Номер будинку має збігатися (включно з відсутністю номера)
+            mask = (
+                query_parts['number'].to_numpy()[chunk][:, None]
+                == c_parts['number'].to_numpy()[None, :]
+            )
+            # Решта компонентів порівнюються, лише якщо вони є в обох адресах
+            for column in ('street', 'locality', 'region', 'district'):
+                q_val = query_parts[column].to_numpy()[chunk][:, None]
+                c_val = c_parts[column].to_numpy()[None, :]
+                mask &= (q_val == '') | (c_val == '') | (q_val == c_val)
+
+            scores = np.where(mask, scores, 0)
+            col = scores.argmax(axis=1)
+            top = scores[np.arange(len(chunk)), col]
+            matched = top >= self.threshold
+
+            best_idx[chunk[matched]] = c_idx[col[matched]]
+            best_score[chunk[matched]] = top[matched]
+
+    def resolve_dataframe(
+            self,
+            df: pd.DataFrame,
+            address_column: str = 'Адреса БС'
+    ) -> pd.DataFrame:
+        """
+        Додавання координат до всіх рядків DataFrame.
+
+        Унікальні адреси зіставляються один раз, після чого координати
+        переносяться на рядки через join.
+
+        Args:
+            df: DataFrame з трафіком
+            address_column: Назва колонки з адресою БС
+
+        Returns:
+            pd.DataFrame: Копія df з колонками 'Широта' та 'Долгота'
+        """
+        resolved = self.resolve(df[address_column]).set_index('raw_address')
+        coords = resolved[['latitude', 'longitude']].rename(
+            columns={'latitude': 'Широта', 'longitude': 'Долгота'}
+        )
+
+        result = df.drop(columns=['Широта', 'Долгота'], errors='ignore')
+        keys = result[address_column].astype(str)
+        result['Широта'] = keys.map(coords['Широта'])
+        result['Долгота'] = keys.map(coords['Долгота'])
+        return result
@@ -0,0 +1,237 @@
+"""
+Модуль реєстру сот базових станцій за ідентифікатором соти.
+"""
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .address_normalizer import normalize_address
+from .address_resolver import AddressResolver
+from .database import Database
+from .resolution_cache import get_registry_version
+
+
+# Можливі назви колонок ідентифікатора соти у файлах трафіку та реєстру
+CELL_COLUMN_ALIASES = {
+    'operator': ['оператор', 'operator', 'mnc'],
+    'lac': ['lac', 'tac', 'lac/tac'],
+    'ci': ['ci', 'cid', 'cell id', 'cellid', 'cell_id', 'eci'],
+    'azimuth': ['аз.', 'азимут', 'azimuth']
+}
+
+
+def create_cells_schema(database: Database) -> None:
+    """
+    Створення таблиці сот.
+
+    Args:
+        database: Шар доступу до бази даних
+    """
+    database.execute('''
+        CREATE TABLE IF NOT EXISTS cells (
+            cell_key TEXT PRIMARY KEY,
+            operator TEXT,
+            lac TEXT,
+            ci TEXT,
+            address TEXT,
+            latitude REAL,
+            longitude REAL,
+            azimuth REAL
+        )
+    ''')
+
+
+def address_key(address: str) -> str:
+    """
+    Ключ соти за хешем нормалізованої адреси БС.
+
+    Args:
+        address: Адреса БС у довільному вигляді
+
+    Returns:
+        str: Ключ виду 'A:<hex>'
+    """
+    digest = hashlib.blake2b(normalize_address(address).encode('utf-8'), digest_size=8).hexdigest()
+    return f"A:{digest}"
+
+
+def cell_id_key(operator: Optional[str], lac: Optional[str], ci: Optional[str]) -> Optional[str]:
+    """
+    Ключ соти за оператором, LAC та CI.
+
+    Returns:
+        Optional[str]: Ключ виду 'C:<оператор>:<lac>:<ci>' або None, якщо LAC/CI відсутні
+    """
+    lac, ci = _id_value(lac), _id_value(ci)
+    if not lac or not ci:
+        return None
+    return f"C:{_id_value(operator)}:{lac}:{ci}"
+
+
+def _id_value(value) -> str:
+    """Приведення частини ідентифікатора до рядка (12345.0 -> '12345')."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    text = str(value).strip()
+    try:
+        number = float(text)
+        if number.is_integer():
+            return str(int(number))
+    except ValueError:
+        pass
+    return text.upper()
+
+
+def find_cell_columns(columns) -> dict:
+    """
+    Пошук колонок ідентифікатора соти.
+
+    Args:
+        columns: Назви колонок
+
+    Returns:
+        dict: Ключ ('operator', 'lac', 'ci', 'azimuth') -> назва колонки
+    """
+    found = {}
+    for key, aliases in CELL_COLUMN_ALIASES.items():
+        for col in columns:
+            if str(col).strip().lower() in aliases:
+                found[key] = col
+                break
+    return found
+
+
+def cell_keys(df: pd.DataFrame, address_column: str = 'Адреса БС') -> Tuple[pd.Series, pd.Series]:
+    """
+    Обчислення ключів сот для всіх рядків DataFrame.
+
+    Хеші рахуються лише для унікальних значень і переносяться на рядки через map.
+
+    Args:
+        df: DataFrame з трафіком
+        address_column: Назва колонки з адресою БС
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: (ключі за LAC/CI або NaN, ключі за адресою або NaN)
+    """
+    columns = find_cell_columns(df.columns)
+
+    if 'lac' in columns and 'ci' in columns:
+        id_columns = [columns.get('operator'), columns['lac'], columns['ci']]
+        ids = pd.DataFrame({
+            'operator': df[id_columns[0]] if id_columns[0] else '',
+            'lac': df[id_columns[1]],
+            'ci': df[id_columns[2]]
+        })
+        unique_ids = ids.drop_duplicates()
+        unique_ids['key'] = [
+            cell_id_key(*row) for row in unique_ids.itertuples(index=False)
+        ]
+        id_keys = ids.merge(unique_ids, on=['operator', 'lac', 'ci'], how='left')['key']
+        id_keys.index = df.index
+    else:
+        id_keys = pd.Series(np.nan, index=df.index, dtype=object)
+
+    if address_column in df.columns:
+        addresses = df[address_column]
+        unique_addresses = addresses.dropna().unique()
+        address_keys = addresses.map(
+            dict(zip(unique_addresses, (address_key(a) for a in unique_addresses)))
+        )
+    else:
+        address_keys = pd.Series(np.nan, index=df.index, dtype=object)
+
+    return id_keys, address_keys
+
+
+class CellRegistry:
+    """Реєстр сот із координатами та азимутами для збагачення трафіку."""
+
+    def __init__(self, database: Database):
+        """
+        Ініціалізація реєстру сот.
+
+        Args:
+            database: Шар доступу до бази даних
+        """
+        self.database = database
+        self._cells: Optional[pd.DataFrame] = None
+        self._version: Optional[int] = None
+
+    def load(self) -> pd.DataFrame:
+        """
+        Завантаження таблиці сот, проіндексованої за ключем.
+
+        Таблиця перечитується лише після зміни версії реєстру.
+
+        Returns:
+            pd.DataFrame: Колонки latitude, longitude, azimuth з індексом cell_key
+        """
+        version = get_registry_version(self.database)
+        if self._cells is not None and version == self._version:
+            return self._cells
+
+        create_cells_schema(self.database)
+        self._cells = self.database.query_df(
+            "SELECT cell_key, latitude, longitude, azimuth FROM cells"
+        ).set_index('cell_key')
+        self._version = version
+
+        logging.info(f"Завантажено реєстр сот: {len(self._cells)} записів")
+        return self._cells
+
+    def enrich(
+            self,
+            df: pd.DataFrame,
+            address_column: str = 'Адреса БС',
+            resolver: Optional[AddressResolver] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Додавання координат до трафіку через join за ключем соти.
+
+        Спочатку використовується ключ LAC/CI, потім хеш адреси БС. Якщо задано
+        resolver, адреси, що лишились без координат, зіставляються нечітко.
+
+        Args:
+            df: DataFrame з трафіком
+            address_column: Назва колонки з адресою БС
+            resolver: Обробник нечіткого зіставлення адрес
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: (трафік з координатами, рядки без координат)
+        """
+        cells = self.load()
+        id_keys, address_keys = cell_keys(df, address_column)
+
+        result = df.drop(columns=['Широта', 'Долгота'], errors='ignore').copy()
+        latitude = id_keys.map(cells['latitude'])
+        longitude = id_keys.map(cells['longitude'])
+        azimuth = id_keys.map(cells['azimuth'])
+
+        missing = latitude.isna()
+        latitude[missing] = address_keys[missing].map(cells['latitude'])
+        longitude[missing] = address_keys[missing].map(cells['longitude'])
+        azimuth[missing] = address_keys[missing].map(cells['azimuth'])
+
+        missing = latitude.isna()
+        if resolver is not None and missing.any() and address_column in df.columns:
+            resolved = resolver.resolve_dataframe(df.loc[missing, [address_column]], address_column)
+            latitude[missing] = resolved['Широта']
+            longitude[missing] = resolved['Долгота']
+
+        result['Широта'] = latitude.astype(float)
+        result['Долгота'] = longitude.astype(float)
+
+        azimuth_column = find_cell_columns(df.columns).get('azimuth', 'Аз.')
+        if azimuth_column in result.columns:
+            result[azimuth_column] = result[azimuth_column].fillna(azimuth)
+        else:
+            result[azimuth_column] = azimuth
+
+        matched = result['Широта'].notna() & result['Долгота'].notna()
+        logging.info(f"Збагачено координатами {int(matched.sum())} з {len(result)} рядків")
+
+        return result[matched], result[~matched]
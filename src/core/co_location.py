@@ -0,0 +1,176 @@
+"""
+Модуль пошуку спільних переміщень (одночасного перебування поруч) абонентів.
+"""
+import time
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .geo_math import event_timestamps, haversine
+from .traffic_dataset import SUBSCRIBER_COLUMN
+
+
+MOVEMENT_COLUMNS = [
+    'Дата', 'Абонент2', 'Час1', 'Адреса1', 'Час2', 'Адреса2',
+    'Відстань', 'Часова_різниця', 'Координати1', 'Координати2'
+]
+
+SUMMARY_COLUMNS = ['Абонент', 'Спільних подій', 'Днів', 'Мін. відстань (м)', 'Перша дата', 'Остання дата']
+
+# Максимальна кількість пар-кандидатів в одній частині обробки
+_MAX_PAIRS = 5_000_000
+
+_NS_PER_DAY = 86_400 * 10 ** 9
+_NS_PER_MINUTE = 60 * 10 ** 9
+
+
+def _prepare(events: pd.DataFrame) -> pd.DataFrame:
+    """Події з валідними часом і координатами, впорядковані за часом (колонка _ts - наносекунди)."""
+    ts = event_timestamps(events['Дата'], events['Час'])
+    valid = ~np.isnat(ts) & events['Широта'].notna().to_numpy() & events['Довгота'].notna().to_numpy()
+    events = events[valid].assign(_ts=ts[valid].view(np.int64))
+    return events.sort_values('_ts', kind='stable')
+
+
+def find_co_locations(
+        target: pd.DataFrame,
+        others: pd.DataFrame,
+        max_distance: float,
+        time_window: float,
+        subscriber_column: str = SUBSCRIBER_COLUMN
+) -> pd.DataFrame:
+    """
+    Пари подій абонента та інших абонентів, близьких у часі та просторі.
+
+    Події інших абонентів впорядковуються за часом один раз; для кожної
+    події цільового абонента межі часового вікна знаходяться бінарним
+    пошуком, і відстані рахуються векторно лише для пар у вікні. Пари
+    шукаються в межах однієї календарної дати. others може містити будь-яку
+    кількість абонентів - порівняння "один з усіма" виконується тим самим
+    проходом.
+
+    Args:
+        target: Події цільового абонента (Дата, Час, Широта, Довгота, Адреса БС)
+        others: Події інших абонентів
+        max_distance: Максимальна відстань між точками (м)
+        time_window: Часове вікно (хв)
+        subscriber_column: Назва колонки абонента
+
+    Returns:
+        pd.DataFrame: Колонки MOVEMENT_COLUMNS, впорядковані за часом події цільового абонента
+    """
+    started = time.perf_counter()
+    target, others = _prepare(target), _prepare(others)
+    if target.empty or others.empty:
+        return pd.DataFrame(columns=MOVEMENT_COLUMNS)
+
+    ts1, ts2 = target['_ts'].to_numpy(), others['_ts'].to_numpy()
+    window = int(time_window * _NS_PER_MINUTE)
+
+    # Вікно [t - w, t + w], обмежене датою події
+    day_start = ts1 // _NS_PER_DAY * _NS_PER_DAY
+    low = np.searchsorted(ts2, np.maximum(ts1 - window, day_start), side='left')
+    high = np.searchsorted(ts2, np.minimum(ts1 + window, day_start + _NS_PER_DAY - 1), side='right')
+    counts = high - low
+
+    lat1, lon1 = target['Широта'].to_numpy(dtype=float), target['Довгота'].to_numpy(dtype=float)
+    lat2, lon2 = others['Широта'].to_numpy(dtype=float), others['Довгота'].to_numpy(dtype=float)
+
+    first, second, distances = [], [], []
+    bounds = np.searchsorted(np.cumsum(counts), np.arange(0, counts.sum() + _MAX_PAIRS, _MAX_PAIRS), side='right')
+    for start, stop in zip(np.r_[0, bounds[:-1]], bounds):
+        chunk = counts[start:stop]
+        total = int(chunk.sum())
+        if not total:
+            continue
+        # Розгортання діапазонів [low, high) в пари індексів
+        i = np.repeat(np.arange(start, stop), chunk)
+        j = np.repeat(low[start:stop], chunk) + np.arange(total) - np.repeat(np.cumsum(chunk) - chunk, chunk)
+        d = haversine(lat1[i], lon1[i], lat2[j], lon2[j])
+        near = d <= max_distance
+        first.append(i[near])
+        second.append(j[near])
+        distances.append(d[near])
+
+    if not first:
+        return pd.DataFrame(columns=MOVEMENT_COLUMNS)
+    i, j, d = np.concatenate(first), np.concatenate(second), np.concatenate(distances)
+
+    def column(frame: pd.DataFrame, name: str, index: np.ndarray) -> np.ndarray:
+        return frame[name].to_numpy()[index] if name in frame.columns else np.full(len(index), None, dtype=object)
+
+    result = pd.DataFrame({
+        'Дата': pd.to_datetime(ts1[i]).date,
+        'Абонент2': column(others, subscriber_column, j),
+        'Час1': column(target, 'Час', i),
+        'Адреса1': column(target, 'Адреса БС', i),
+        'Час2': column(others, 'Час', j),
+        'Адреса2': column(others, 'Адреса БС', j),
+        'Відстань': d.round(2),
+        'Часова_різниця': (np.abs(ts2[j] - ts1[i]) / _NS_PER_MINUTE).round(2),
+        'Координати1': list(zip(lat1[i], lon1[i])),
+        'Координати2': list(zip(lat2[j], lon2[j]))
+    })
+
+    logging.info(
+        f"Спільні переміщення: {len(result)} пар з {int(counts.sum())} перевірених у часовому вікні "
+        f"({len(target)} x {len(others)} подій) за {time.perf_counter() - started:.2f} с"
+    )
+    return result
+
+
+def co_location_summary(movements: pd.DataFrame) -> pd.DataFrame:
+    """
+    Зведення спільних переміщень по інших абонентах.
+
+    Args:
+        movements: Результат find_co_locations
+
+    Returns:
+        pd.DataFrame: Колонки SUMMARY_COLUMNS за спаданням кількості спільних подій
+    """
+    if movements.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    summary = movements.groupby('Абонент2').agg(
+        events=('Дата', 'size'),
+        days=('Дата', 'nunique'),
+        distance=('Відстань', 'min'),
+        first=('Дата', 'min'),
+        last=('Дата', 'max')
+    ).reset_index()
+    summary.columns = SUMMARY_COLUMNS
+    return summary.sort_values(['Спільних подій', 'Днів'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+def one_vs_all(
+        df: pd.DataFrame,
+        subscriber: str,
+        max_distance: float,
+        time_window: float,
+        subscriber_column: str = SUBSCRIBER_COLUMN,
+        min_events: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Спільні переміщення абонента з усіма іншими абонентами набору.
+
+    Args:
+        df: Набір даних з колонкою абонента
+        subscriber: Цільовий абонент
+        max_distance: Максимальна відстань між точками (м)
+        time_window: Часове вікно (хв)
+        subscriber_column: Назва колонки абонента
+        min_events: Мінімальна кількість спільних подій для включення абонента
+
+    Returns:
+        pd.DataFrame: Спільні переміщення (MOVEMENT_COLUMNS)
+    """
+    is_target = (df[subscriber_column] == subscriber).to_numpy()
+    if not is_target.any():
+        raise ValueError(f"Дані для номера {subscriber} відсутні")
+    movements = find_co_locations(df[is_target], df[~is_target], max_distance, time_window, subscriber_column)
+    if min_events:
+        counts = movements['Абонент2'].map(movements['Абонент2'].value_counts())
+        movements = movements[counts >= min_events]
+    return movements
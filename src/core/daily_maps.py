@@ -0,0 +1,245 @@
+"""
+Модуль побудови карт переміщень за кожен день, паралельно в робочих процесах.
+"""
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import HeatMap
+
+from .day_period import DAY
+from .geo_math import EARTH_RADIUS_M
+from .kinematics import JUMP_COLUMN, SPEED_COLUMN, STEP_COLUMN
+from .traffic_dataset import PERIOD_COLUMN
+
+
+# Кількість точок дуги сектора
+_ARC_POINTS = 16
+
+# Менша кількість днів будується в поточному процесі
+MIN_PARALLEL_DAYS = 4
+
+
+def day_payloads(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Розбиття набору даних на дні одним проходом.
+
+    Події впорядковуються за датою один раз, після чого кожен день - зріз
+    масивів між сусідніми межами дат. Дані дня - компактні масиви замість
+    DataFrame, тож передача в робочий процес дешева.
+
+    Args:
+        df: Події з колонками Дата, Час, Широта, Довгота, Адреса БС
+            (необов'язкові: Період, Полігон, Азимут, колонки кінематики)
+
+    Returns:
+        List[Dict[str, Any]]: Дані кожного дня за зростанням дати
+    """
+    df = df[df['Дата'].notna()]
+    if df.empty:
+        return []
+    days = df['Дата'].to_numpy().astype('datetime64[D]')
+    order = np.argsort(days, kind='stable')
+    days = days[order]
+    boundaries = np.flatnonzero(days[1:] != days[:-1]) + 1
+    starts, stops = np.r_[0, boundaries], np.r_[boundaries, len(days)]
+
+    def column(name: str, dtype=object) -> Optional[np.ndarray]:
+        return df[name].to_numpy(dtype=dtype)[order] if name in df.columns else None
+
+    lat, lon = column('Широта', float), column('Довгота', float)
+    times = df['Час'].astype(str).to_numpy()[order]
+    addresses = df['Адреса БС'].astype(str).to_numpy()[order]
+    periods = column(PERIOD_COLUMN)
+    polygons = column('Полігон')
+    steps, speeds, jumps = column(STEP_COLUMN, float), column(SPEED_COLUMN, float), column(JUMP_COLUMN, bool)
+    azimuths = (
+        pd.to_numeric(df['Азимут'], errors='coerce').to_numpy(dtype=float)[order]
+        if 'Азимут' in df.columns else None
+    )
+
+    payloads = []
+    for start, stop in zip(starts, stops):
+        part = slice(start, stop)
+        payloads.append({
+            'date': pd.Timestamp(days[start]).date(),
+            'lat': lat[part],
+            'lon': lon[part],
+            'time': times[part],
+            'address': addresses[part],
+            'period': periods[part] if periods is not None else None,
+            'polygon': polygons[part] if polygons is not None else None,
+            'azimuth': azimuths[part] if azimuths is not None else None,
+            'step': steps[part] if steps is not None else None,
+            'speed': speeds[part] if speeds is not None else None,
+            'jump': jumps[part] if jumps is not None else None
+        })
+    return payloads
+
+
+def sector_polygons(lat: np.ndarray, lon: np.ndarray, azimuth: np.ndarray, angle: float, radius: float) -> np.ndarray:
+    """
+    Контури секторів БС для всіх точок одразу.
+
+    Args:
+        lat: Широти БС
+        lon: Довготи БС
+        azimuth: Азимути (градуси)
+        angle: Кут розкриття сектора (градуси)
+        radius: Радіус сектора (м)
+
+    Returns:
+        np.ndarray: Замкнені контури n x (_ARC_POINTS + 3) x 2 у порядку (довгота, широта)
+    """
+    bearings = np.radians(
+        azimuth[:, None] + np.linspace(-angle / 2, angle / 2, _ARC_POINTS + 1)[None, :]
+    )
+    phi, lam = np.radians(lat)[:, None], np.radians(lon)[:, None]
+    delta = radius / EARTH_RADIUS_M
+    arc_phi = np.arcsin(np.sin(phi) * np.cos(delta) + np.cos(phi) * np.sin(delta) * np.cos(bearings))
+    arc_lam = lam + np.arctan2(
+        np.sin(bearings) * np.sin(delta) * np.cos(phi),
+        np.cos(delta) - np.sin(phi) * np.sin(arc_phi)
+    )
+    arc = np.stack((np.degrees(arc_lam), np.degrees(arc_phi)), axis=2)
+    center = np.stack((lon, lat), axis=1)[:, None, :]
+    return np.concatenate((center, arc, center), axis=1)
+
+
+def render_day_map(
+        payload: Dict[str, Any],
+        filename: str,
+        sector_angle: float = 120.0,
+        sector_radius: float = 500.0,
+        polygon_file: Optional[str] = None
+) -> str:
+    """
+    Побудова та збереження карти одного дня.
+
+    Args:
+        payload: Дані дня (результат day_payloads)
+        filename: Шлях до файлу карти
+        sector_angle: Кут сектора (градуси)
+        sector_radius: Радіус сектора (м)
+        polygon_file: Файл GeoJSON полігона для окремого шару
+
+    Returns:
+        str: Шлях до збереженого файлу
+    """
+    lat, lon = payload['lat'], payload['lon']
+    m = folium.Map(location=[float(lat.mean()), float(lon.mean())], zoom_start=12)
+
+    periods, polygons = payload['period'], payload['polygon']
+    steps, speeds, jumps = payload.get('step'), payload.get('speed'), payload.get('jump')
+    for i in range(len(lat)):
+        popup = f"Час: {payload['time'][i]}<br>Адреса: {payload['address'][i]}"
+        if periods is not None:
+            popup += f"<br>Період: {periods[i]}"
+        if polygons is not None and pd.notna(polygons[i]):
+            popup += f"<br>Полігон: {polygons[i]}"
+        if steps is not None and np.isfinite(steps[i]):
+            popup += f"<br>Крок: {steps[i]:.0f} м, швидкість: {speeds[i]:.1f} км/год"
+        # Подія після неправдоподібного стрибка - червоний маркер
+        if jumps is not None and jumps[i]:
+            color = 'red'
+        else:
+            color = 'orange' if periods is not None and periods[i] == DAY else 'darkblue'
+        folium.Marker([lat[i], lon[i]], popup=popup, icon=folium.Icon(color=color)).add_to(m)
+
+    # Сектори - один шар GeoJSON для всіх подій з азимутом
+    azimuth = payload['azimuth']
+    if azimuth is not None and np.isfinite(azimuth).any():
+        valid = np.isfinite(azimuth)
+        contours = sector_polygons(lat[valid], lon[valid], azimuth[valid], sector_angle, sector_radius)
+        folium.GeoJson(
+            {
+                'type': 'FeatureCollection',
+                'features': [
+                    {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Polygon', 'coordinates': [contour]}}
+                    for contour in contours.tolist()
+                ]
+            },
+            name='Сектори',
+            style_function=lambda x: {
+                'fillColor': '#3388ff',
+                'color': '#3388ff',
+                'fillOpacity': 0.2,
+                'weight': 1
+            }
+        ).add_to(m)
+
+    points = np.column_stack((lat, lon)).tolist()
+    if len(points) > 1:
+        folium.PolyLine(points, weight=2, color='blue', opacity=0.8).add_to(m)
+    HeatMap(points).add_to(m)
+
+    if polygon_file:
+        folium.GeoJson(polygon_file, name='Полігон').add_to(m)
+
+    folium.LayerControl().add_to(m)
+    m.save(filename)
+    return filename
+
+
+def render_daily_maps(
+        df: pd.DataFrame,
+        output_dir: str,
+        sector_angle: float = 120.0,
+        sector_radius: float = 500.0,
+        polygon_file: Optional[str] = None,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None
+) -> List[str]:
+    """
+    Карти за кожен день набору даних.
+
+    Дані групуються за датами один раз (day_payloads), після чого карти
+    будуються в робочих процесах; готові карти повідомляються через
+    progress у порядку завершення.
+
+    Args:
+        df: Події
+        output_dir: Директорія для карт (файли map_YYYYMMDD.html)
+        sector_angle: Кут сектора (градуси)
+        sector_radius: Радіус сектора (м)
+        polygon_file: Файл GeoJSON полігона
+        workers: Кількість процесів (None - кількість ядер)
+        progress: Функція progress(готово, усього)
+
+    Returns:
+        List[str]: Шляхи до файлів карт за зростанням дати
+    """
+    started = time.perf_counter()
+    payloads = day_payloads(df)
+    os.makedirs(output_dir, exist_ok=True)
+    filenames = [os.path.join(output_dir, f"map_{p['date'].strftime('%Y%m%d')}.html") for p in payloads]
+    workers = min(workers or os.cpu_count() or 1, len(payloads))
+    args = (sector_angle, sector_radius, polygon_file)
+
+    if workers > 1 and len(payloads) >= MIN_PARALLEL_DAYS:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(render_day_map, payload, filename, *args)
+                for payload, filename in zip(payloads, filenames)
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if progress:
+                    progress(done, len(futures))
+    else:
+        for done, (payload, filename) in enumerate(zip(payloads, filenames), 1):
+            render_day_map(payload, filename, *args)
+            if progress:
+                progress(done, len(payloads))
+
+    logging.info(
+        f"Створено {len(filenames)} денних карт ({len(df)} подій, процесів: {max(workers, 1)}) "
+        f"за {time.perf_counter() - started:.1f} с"
+    )
+    return filenames
+
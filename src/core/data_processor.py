@@ -12,6 +12,9 @@ import os
 from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
+from .database import Database
+from .registry_importer import RegistryImporter
+
 
 class DataProcessor:
     """Клас для обробки даних трафіку."""
@@ -24,6 +27,7 @@ class DataProcessor:
             config: Об'єкт конфігурації
         """
         self.config = config
+        self.database = Database(config)
         self._lock = False
         self.current_time = datetime.strptime(
             "2025-07-21 15:21:03",
@@ -32,6 +36,24 @@ class DataProcessor:
         self.current_user = "McNeal1994"
         logging.info(f"Запуск програми користувачем {self.current_user}")
 
+    def import_addresses_to_sqlite(self, file_path: str) -> Dict[str, Any]:
+        """
+        Імпорт реєстру базових станцій у базу адрес.
+
+        Args:
+            file_path: Шлях до файлу реєстру (.xlsx або .csv)
+
+        Returns:
+            Dict[str, Any]: Статистика імпорту (rows, skipped, total, seconds, rows_per_second)
+        """
+        try:
+            importer = RegistryImporter(self.database)
+            return importer.import_file(file_path)
+
+        except Exception as e:
+            logging.error(f"Помилка імпорту реєстру {file_path}: {str(e)}")
+            raise
+
     def merge_traffic_files(self) -> Tuple[bool, str]:
         """
         Об'єднання файлів трафіку.
@@ -0,0 +1,214 @@
+"""
+Модуль доступу до бази адрес SQLite.
+"""
+import os
+import time
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from ..utils.config import Config
+
+
+class Database:
+    """
+    Єдиний шар доступу до бази адрес.
+
+    Кожен потік отримує власне з'єднання, яке перевикористовується між
+    запитами; підготовлені оператори кешуються з'єднанням за текстом SQL,
+    тому запити з однаковим текстом не компілюються повторно.
+    """
+
+    # Запити, довші за цей поріг (мс), логуються як попередження
+    SLOW_QUERY_MS = 200
+
+    PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,
+        'cache_size': -65536,
+        'busy_timeout': 5000
+    }
+
+    def __init__(self, config: Config):
+        """
+        Ініціалізація шару доступу до бази.
+
+        Args:
+            config: Об'єкт конфігурації
+        """
+        self.path = os.path.abspath(config.get('database.path', 'addresses.db'))
+        self.backup_path = os.path.abspath(config.get('database.backup_path', 'backups/'))
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Отримання з'єднання поточного потоку.
+
+        Returns:
+            sqlite3.Connection: З'єднання з налаштованими параметрами
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                cached_statements=256,
+                check_same_thread=False
+            )
+            for name, value in self.PRAGMAS.items():
+                conn.execute(f"PRAGMA {name}={value}")
+
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+            logging.info(f"Відкрито з'єднання з базою {self.path} (потік {threading.get_ident()})")
+        return conn
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """
+        Виконання запиту з логуванням часу.
+
+        Args:
+            sql: Текст запиту
+            params: Параметри запиту
+
+        Returns:
+            sqlite3.Cursor: Курсор з результатом
+        """
+        started = time.perf_counter()
+        cursor = self.connection().execute(sql, params)
+        self._log_timing(sql, started)
+        return cursor
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> sqlite3.Cursor:
+        """
+        Пакетне виконання запиту з логуванням часу.
+
+        Args:
+            sql: Текст запиту
+            seq_of_params: Набори параметрів
+
+        Returns:
+            sqlite3.Cursor: Курсор
+        """
+        started = time.perf_counter()
+        cursor = self.connection().executemany(sql, seq_of_params)
+        self._log_timing(sql, started)
+        return cursor
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """
+        Виконання запиту на читання.
+
+        Args:
+            sql: Текст запиту
+            params: Параметри запиту
+
+        Returns:
+            List[tuple]: Усі рядки результату
+        """
+        started = time.perf_counter()
+        rows = self.connection().execute(sql, params).fetchall()
+        self._log_timing(sql, started)
+        return rows
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        """
+        Виконання запиту, що повертає один рядок.
+
+        Args:
+            sql: Текст запиту
+            params: Параметри запиту
+
+        Returns:
+            Optional[tuple]: Перший рядок або None
+        """
+        started = time.perf_counter()
+        row = self.connection().execute(sql, params).fetchone()
+        self._log_timing(sql, started)
+        return row
+
+    def query_df(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """
+        Виконання запиту з результатом у вигляді DataFrame.
+
+        Args:
+            sql: Текст запиту
+            params: Параметри запиту
+
+        Returns:
+            pd.DataFrame: Результат запиту
+        """
+        started = time.perf_counter()
+        df = pd.read_sql_query(sql, self.connection(), params=params)
+        self._log_timing(sql, started)
+        return df
+
+    def table_exists(self, table: str) -> bool:
+        """Перевірка наявності таблиці в базі даних."""
+        return self.query_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,)
+        ) is not None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Контекст транзакції: фіксація при успіху, відкат при помилці.
+
+        Вкладені виклики виконуються в межах зовнішньої транзакції.
+
+        Yields:
+            sqlite3.Connection: З'єднання поточного потоку
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        self.execute("BEGIN")
+        try:
+            yield conn
+        except Exception:
+            self.execute("ROLLBACK")
+            raise
+        self.execute("COMMIT")
+
+    def close(self) -> None:
+        """Закриття з'єднання поточного потоку."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with self._lock:
+                self._connections.remove(conn)
+            conn.close()
+            self._local.conn = None
+
+    def close_all(self) -> None:
+        """
+        Закриття з'єднань усіх потоків.
+
+        Використовується перед видаленням або заміною файлу бази.
+        """
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _log_timing(self, sql: str, started: float) -> None:
+        """Логування часу виконання запиту."""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        statement = ' '.join(sql.split())[:120]
+        if elapsed_ms >= self.SLOW_QUERY_MS:
+            logging.warning(f"Повільний запит ({elapsed_ms:.1f} мс): {statement}")
+        else:
+            logging.debug(f"Запит ({elapsed_ms:.1f} мс): {statement}")
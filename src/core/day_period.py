@@ -0,0 +1,140 @@
+"""
+Модуль поділу доби на денний та нічний періоди.
+"""
+import logging
+from datetime import datetime, time
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Значення колонки періоду
+DAY = 'День'
+NIGHT = 'Ніч'
+
+DEFAULT_DAY_START = '07:00'
+DEFAULT_DAY_END = '20:00'
+
+
+def _minutes(value: str) -> int:
+    """Хвилина доби з рядка 'HH:MM'."""
+    parsed = datetime.strptime(str(value).strip(), '%H:%M')
+    return parsed.hour * 60 + parsed.minute
+
+
+class DayWindow:
+    """
+    Денне вікно доби [початок, кінець); решта доби - ніч.
+
+    Вікно може переходити через північ (наприклад, 20:00-07:00 для нічної зміни).
+    """
+
+    def __init__(self, day_start: str = DEFAULT_DAY_START, day_end: str = DEFAULT_DAY_END):
+        """
+        Ініціалізація вікна.
+
+        Args:
+            day_start: Початок дня 'HH:MM'
+            day_end: Кінець дня 'HH:MM'
+        """
+        self.start = _minutes(day_start)
+        self.end = _minutes(day_end)
+        if self.start == self.end:
+            raise ValueError(f"Початок і кінець дня збігаються: {day_start}")
+
+    @classmethod
+    def from_config(cls, config: Any) -> 'DayWindow':
+        """
+        Вікно з налаштувань filters.day_start / filters.day_end.
+
+        Некоректні значення замінюються типовими з записом у лог.
+        """
+        day_start = config.get('filters.day_start', DEFAULT_DAY_START)
+        day_end = config.get('filters.day_end', DEFAULT_DAY_END)
+        try:
+            return cls(day_start, day_end)
+        except (ValueError, TypeError) as e:
+            logging.error(f"Некоректне денне вікно {day_start}-{day_end}: {e}")
+            return cls()
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        """Ключ вікна для кешування: (хвилина початку, хвилина кінця)."""
+        return self.start, self.end
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DayWindow) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"DayWindow({self.format(self.start)}-{self.format(self.end)})"
+
+    @staticmethod
+    def format(minutes: int) -> str:
+        """Хвилина доби як 'HH:MM'."""
+        return time(minutes // 60, minutes % 60).strftime('%H:%M')
+
+    def is_day_minutes(self, minutes) -> np.ndarray:
+        """
+        Денні позиції для хвилин доби.
+
+        Args:
+            minutes: Хвилини доби (0-1439), масив або скаляр
+
+        Returns:
+            np.ndarray: True - день, False - ніч
+        """
+        minutes = np.asarray(minutes)
+        if self.start < self.end:
+            return (minutes >= self.start) & (minutes < self.end)
+        return (minutes >= self.start) | ((minutes >= 0) & (minutes < self.end))
+
+    def is_day(self, timestamps) -> np.ndarray:
+        """
+        Денні позиції для міток часу.
+
+        Args:
+            timestamps: Мітки часу (datetime64); NaT вважається ніччю
+
+        Returns:
+            np.ndarray: True - день, False - ніч
+        """
+        return self.is_day_minutes(minutes_of_day(timestamps))
+
+    def labels(self, is_day: np.ndarray) -> np.ndarray:
+        """Підписи періоду (DAY / NIGHT) для маски денних позицій."""
+        return np.where(is_day, DAY, NIGHT)
+
+    def night_dates(self, timestamps) -> pd.Series:
+        """
+        Дата ночі для міток часу.
+
+        Ніч відноситься до дати свого початку (кінця денного вікна):
+        подія о 02:00 належить ночі попередньої дати.
+
+        Args:
+            timestamps: Мітки часу (datetime64)
+
+        Returns:
+            pd.Series: Дати ночей
+        """
+        shifted = pd.to_datetime(pd.Series(timestamps)) - pd.Timedelta(minutes=self.end)
+        return shifted.dt.date
+
+
+def minutes_of_day(timestamps) -> np.ndarray:
+    """
+    Хвилина доби для міток часу.
+
+    Args:
+        timestamps: Мітки часу (datetime64)
+
+    Returns:
+        np.ndarray: Хвилини 0-1439 (-1 для NaT)
+    """
+    values = np.asarray(timestamps, dtype='datetime64[ns]')
+    minutes = values.view(np.int64) // 60_000_000_000 % 1440
+    return np.where(np.isnat(values), -1, minutes).astype(np.int16)
@@ -0,0 +1,163 @@
+"""
+Модуль визначення районів для подій трафіку за шаром адміністративних полігонів.
+"""
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .polygon_index import PolygonIndex
+
+
+UNKNOWN_DISTRICT = 'Неизвестный'
+OUTSIDE_DISTRICT = 'Поза районами'
+
+# Точність ключа кешу координат БС (знаків після коми, ~0.1 м)
+_KEY_DECIMALS = 6
+
+
+def zone_labels(lat: pd.Series, lon: pd.Series) -> pd.Series:
+    """
+    Умовні зони 0.1° x 0.1° ('Зона_50.4_30.5') для подій без шару районів.
+
+    Args:
+        lat: Широти
+        lon: Довготи
+
+    Returns:
+        pd.Series: Назви зон (UNKNOWN_DISTRICT для подій без координат)
+    """
+    lat = pd.to_numeric(lat, errors='coerce')
+    lon = pd.to_numeric(lon, errors='coerce')
+    valid = lat.notna() & lon.notna()
+    labels = pd.Series(UNKNOWN_DISTRICT, index=lat.index, dtype=object)
+    lat_zone = (np.trunc(lat[valid] * 10) / 10).astype(str)
+    lon_zone = (np.trunc(lon[valid] * 10) / 10).astype(str)
+    labels[valid] = 'Зона_' + lat_zone + '_' + lon_zone
+    return labels
+
+
+class DistrictAssigner:
+    """
+    Визначення району за координатами БС.
+
+    Кожна унікальна позиція БС шукається в індексі полігонів один раз;
+    результат кешується між викликами, а події отримують район
+    приєднанням за координатами.
+    """
+
+    def __init__(self, polygons: PolygonIndex):
+        """
+        Ініціалізація.
+
+        Args:
+            polygons: Індекс полігонів районів
+        """
+        self.polygons = polygons
+        self._cache: Dict[Tuple[float, float], str] = {}
+
+    @classmethod
+    def from_file(cls, file_path: str) -> 'DistrictAssigner':
+        """
+        Завантаження шару районів з GeoJSON або GeoPackage.
+
+        Args:
+            file_path: Шлях до файлу .geojson/.json або .gpkg
+
+        Returns:
+            DistrictAssigner: Об'єкт визначення районів
+        """
+        return cls(PolygonIndex.from_geojson(file_path))
+
+    def assign(
+            self,
+            df: pd.DataFrame,
+            lat_column: str = 'Широта',
+            lon_column: str = 'Долгота'
+    ) -> pd.Series:
+        """
+        Район для кожної події.
+
+        Args:
+            df: Події з координатами
+            lat_column: Назва колонки широти
+            lon_column: Назва колонки довготи
+
+        Returns:
+            pd.Series: Назви районів (OUTSIDE_DISTRICT - поза шаром,
+                UNKNOWN_DISTRICT - без координат)
+        """
+        coords = pd.DataFrame({
+            'lat': pd.to_numeric(df[lat_column], errors='coerce').round(_KEY_DECIMALS),
+            'lon': pd.to_numeric(df[lon_column], errors='coerce').round(_KEY_DECIMALS)
+        }, index=df.index)
+        stations = coords.dropna().drop_duplicates()
+
+        # Пошук лише позицій БС, яких ще немає в кеші
+        keys = list(zip(stations['lat'], stations['lon']))
+        new = [key for key in keys if key not in self._cache]
+        if new:
+            new_lat, new_lon = np.array(new).T
+            located = self.polygons.locate(new_lon, new_lat)
+            names = np.asarray(self.polygons.names + [OUTSIDE_DISTRICT], dtype=object)
+            self._cache.update(zip(new, names[located]))
+
+        lookup = pd.DataFrame(
+            [(lat, lon, self._cache[(lat, lon)]) for lat, lon in keys],
+            columns=['lat', 'lon', 'district']
+        )
+        districts = coords.merge(lookup, on=['lat', 'lon'], how='left')['district']
+        districts.index = df.index
+
+        logging.info(
+            f"Визначено райони для {len(df)} подій: {len(keys)} позицій БС, "
+            f"з них нових {len(new)}, у кеші {len(self._cache)}"
+        )
+        return districts.fillna(UNKNOWN_DISTRICT)
+
+    def clear_cache(self) -> None:
+        """Очищення кешу районів позицій БС."""
+        self._cache.clear()
+
+
+def assign_districts(
+        df: pd.DataFrame,
+        assigner: Optional[DistrictAssigner] = None,
+        lat_column: str = 'Широта',
+        lon_column: str = 'Долгота'
+) -> pd.Series:
+    """
+    Райони подій за шаром полігонів або умовними зонами, якщо шар не завантажено.
+
+    Args:
+        df: Події з координатами
+        assigner: Об'єкт визначення районів (None - зони 0.1°)
+        lat_column: Назва колонки широти
+        lon_column: Назва колонки довготи
+
+    Returns:
+        pd.Series: Назви районів або зон
+    """
+    if assigner is None:
+        return zone_labels(df[lat_column], df[lon_column])
+    return assigner.assign(df, lat_column, lon_column)
+
+
+def daily_trajectories(df: pd.DataFrame, district_column: str = 'district') -> Dict:
+    """
+    Послідовності районів за кожну дату без повторів підряд.
+
+    Args:
+        df: Події з колонками Дата, Час та районом
+        district_column: Назва колонки району
+
+    Returns:
+        Dict: Дата -> список районів у порядку часу
+    """
+    ordered = df.sort_values(['Дата', 'Час'], kind='stable')
+    dates = ordered['Дата']
+    districts = ordered[district_column]
+    changed = (districts != districts.shift()) | (dates != dates.shift())
+    kept = ordered.loc[changed.to_numpy(), ['Дата', district_column]]
+    return {date: group.tolist() for date, group in kept.groupby('Дата', sort=True)[district_column]}
@@ -0,0 +1,290 @@
+"""
+Модуль офлайн-геокодування адрес БС за локальним газетиром.
+"""
+import os
+import csv
+import time
+import logging
+import sqlite3
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .address_normalizer import LOCALITY_TYPES, STREET_TYPES, get_normalizer
+from .database import Database
+from .polygon_index import geopackage_geometry
+from .registry_importer import RegistryImporter
+
+
+# Можливі назви колонок у файлі газетира (OSM-вивантаження або власний CSV)
+GAZETTEER_COLUMN_ALIASES = {
+    'locality': ['addr:city', 'city', 'locality', 'addr:place', 'place', 'населений пункт', 'місто'],
+    'street': ['addr:street', 'street', 'вулиця'],
+    'number': ['addr:housenumber', 'housenumber', 'house_number', 'номер', 'будинок'],
+    'latitude': ['lat', 'latitude', 'широта', 'y'],
+    'longitude': ['lon', 'lng', 'longitude', 'довгота', 'долгота', 'x']
+}
+
+_STREET_TYPE_RE = r'(?<!\w)(' + '|'.join(t.replace('.', r'\.') for t in STREET_TYPES) + r')\s*'
+_LOCALITY_TYPE_RE = r'(?<!\w)(?:' + '|'.join(t.replace('.', r'\.') for t in LOCALITY_TYPES) + r')(?:\s+|$)'
+
+
+def _locality_names(localities: pd.Series) -> pd.Series:
+    """Назва населеного пункту без позначки типу ('М. БІЛА ЦЕРКВА' -> 'БІЛА ЦЕРКВА')."""
+    return localities.fillna('').str.replace(_LOCALITY_TYPE_RE, '', regex=True).str.strip()
+
+
+def _street_keys(streets: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Розділення нормалізованої вулиці на тип і назву.
+
+    Тип може стояти перед назвою або після неї ('ШЕВЧЕНКА ВУЛ.').
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: (тип вулиці або '', назва без типу)
+    """
+    streets = streets.fillna('')
+    street_types = streets.str.extract(_STREET_TYPE_RE, expand=False).fillna('')
+    names = streets.str.replace(_STREET_TYPE_RE, '', regex=True).str.strip()
+    return street_types, names
+
+
+def _house_numbers(numbers: pd.Series) -> pd.Series:
+    """Нормалізація номера будинку ('10 а' -> '10А', '5-Б' -> '5Б')."""
+    return numbers.fillna('').astype(str).str.upper().str.replace(r'[\s\-]+', '', regex=True)
+
+
+def _join_keys(*parts: pd.Series) -> pd.Series:
+    """Склеювання компонентів ключа в один рядок."""
+    key = parts[0]
+    for part in parts[1:]:
+        key = key.str.cat(part, sep='|')
+    return key
+
+
+class Gazetteer:
+    """
+    Локальний газетир: індекс координат за нормалізованими
+    населеним пунктом, вулицею та номером будинку.
+    """
+
+    LEVEL_HOUSE = 'house'
+    LEVEL_STREET = 'street'
+
+    def __init__(self, entries: pd.DataFrame):
+        """
+        Побудова індексу газетира.
+
+        Args:
+            entries: DataFrame з колонками locality, street, number, latitude, longitude
+        """
+        normalizer = get_normalizer()
+        entries = entries.dropna(subset=['latitude', 'longitude'])
+
+        locality = _locality_names(normalizer.normalize_series(entries['locality']))
+        street_type, street_name = _street_keys(normalizer.normalize_series(entries['street']))
+        number = _house_numbers(entries['number'])
+
+        frame = pd.DataFrame({
+            'street_key': _join_keys(locality, street_type, street_name),
+            'number': number,
+            'latitude': entries['latitude'].astype(float),
+            'longitude': entries['longitude'].astype(float)
+        })
+        frame = frame[street_name != '']
+
+        # Будинки: ключ вулиці + номер -> координати
+        houses = frame[frame['number'] != ''].drop_duplicates(subset=['street_key', 'number'])
+        house_keys = _join_keys(houses['street_key'], houses['number'])
+        self._houses: Dict[str, Tuple[float, float]] = dict(
+            zip(house_keys, zip(houses['latitude'], houses['longitude']))
+        )
+
+        # Вулиці: центр усіх точок вулиці для адрес без точного номера
+        streets = frame.groupby('street_key')[['latitude', 'longitude']].mean()
+        self._streets: Dict[str, Tuple[float, float]] = dict(
+            zip(streets.index, zip(streets['latitude'], streets['longitude']))
+        )
+
+        logging.info(
+            f"Газетир проіндексовано: {len(self._houses)} будинків, {len(self._streets)} вулиць"
+        )
+
+    @classmethod
+    def from_file(cls, file_path: str) -> 'Gazetteer':
+        """
+        Завантаження газетира з CSV або GeoPackage файлу.
+
+        Args:
+            file_path: Шлях до файлу (.csv, .txt або .gpkg)
+
+        Returns:
+            Gazetteer: Проіндексований газетир
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == '.gpkg':
+            entries = cls._read_geopackage(file_path)
+        elif extension in ('.csv', '.txt'):
+            entries = cls._read_csv(file_path)
+        else:
+            raise ValueError(f"Непідтримуваний формат газетира: {extension}")
+
+        logging.info(f"Завантажено газетир {file_path}: {len(entries)} записів")
+        return cls(entries)
+
+    @staticmethod
+    def _map_columns(columns: Iterable[str], required: Iterable[str]) -> Dict[str, str]:
+        """
+        Пошук колонок газетира за можливими назвами.
+
+        Returns:
+            Dict[str, str]: Назва поля -> назва колонки у файлі
+        """
+        columns = list(columns)
+        found = {}
+        for key, aliases in GAZETTEER_COLUMN_ALIASES.items():
+            column = next((c for c in columns if str(c).strip().lower() in aliases), None)
+            if column is not None:
+                found[key] = column
+
+        missing = [key for key in required if key not in found]
+        if missing:
+            raise ValueError(
+                f"У файлі газетира відсутні колонки: {', '.join(missing)}. "
+                f"Наявні колонки: {', '.join(str(c) for c in columns)}"
+            )
+        return found
+
+    @classmethod
+    def _read_csv(cls, file_path: str) -> pd.DataFrame:
+        """Читання газетира з CSV лише потрібних колонок."""
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            sample = f.read(65536)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=';,\t').delimiter
+        except csv.Error:
+            delimiter = ','
+
+        header = pd.read_csv(file_path, sep=delimiter, nrows=0, encoding='utf-8-sig').columns
+        columns = cls._map_columns(header, GAZETTEER_COLUMN_ALIASES)
+
+        df = pd.read_csv(
+            file_path,
+            sep=delimiter,
+            usecols=list(columns.values()),
+            dtype=str,
+            encoding='utf-8-sig'
+        )
+        df = df.rename(columns={v: k for k, v in columns.items()})
+        for key in ('latitude', 'longitude'):
+            df[key] = pd.to_numeric(df[key].str.replace(',', '.'), errors='coerce')
+        return df
+
+    @classmethod
+    def _read_geopackage(cls, file_path: str) -> pd.DataFrame:
+        """
+        Читання газетира з першої таблиці об'єктів GeoPackage.
+
+        Координати беруться з геометрії (центр для не точкових об'єктів), CRS - WGS84.
+        """
+        conn = sqlite3.connect(file_path)
+        try:
+            row = conn.execute(
+                "SELECT c.table_name, g.column_name FROM gpkg_contents c "
+                "JOIN gpkg_geometry_columns g ON g.table_name = c.table_name "
+                "WHERE c.data_type = 'features' LIMIT 1"
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"У файлі {file_path} немає таблиць об'єктів")
+            table, geometry_column = row
+
+            header = [r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')]
+            columns = cls._map_columns(header, ('locality', 'street', 'number'))
+            select = ', '.join(f'"{columns[key]}"' for key in ('locality', 'street', 'number'))
+            rows = conn.execute(f'SELECT {select}, "{geometry_column}" FROM "{table}"').fetchall()
+        finally:
+            conn.close()
+
+        coords = np.array([cls._geometry_point(r[3]) for r in rows], dtype=float).reshape(-1, 2)
+        return pd.DataFrame({
+            'locality': [r[0] for r in rows],
+            'street': [r[1] for r in rows],
+            'number': [r[2] for r in rows],
+            'latitude': coords[:, 0],
+            'longitude': coords[:, 1]
+        })
+
+    @staticmethod
+    def _geometry_point(blob: Optional[bytes]) -> Tuple[float, float]:
+        """Координати (широта, довгота) з геометрії GeoPackage (центр для не точкових об'єктів)."""
+        geometry = geopackage_geometry(blob)
+        if geometry is None or geometry.is_empty:
+            return np.nan, np.nan
+        point = geometry if geometry.geom_type == 'Point' else geometry.representative_point()
+        return point.y, point.x
+
+    def resolve(self, addresses: Iterable[str], accept_street: bool = False) -> pd.DataFrame:
+        """
+        Пакетне геокодування адрес.
+
+        Args:
+            addresses: Адреси БС (дублікати та пусті значення ігноруються)
+            accept_street: Приймати центр вулиці, якщо номер будинку не знайдено
+
+        Returns:
+            pd.DataFrame: Колонки raw_address, latitude, longitude, level ('house', 'street' або None)
+        """
+        started = time.perf_counter()
+        raw = pd.Series(list(addresses), dtype=object).dropna().astype(str).drop_duplicates()
+        raw = raw.reset_index(drop=True)
+
+        parts = get_normalizer().parse_series(raw)
+        street_type, street_name = _street_keys(parts['street'])
+        street_key = _join_keys(_locality_names(parts['locality']), street_type, street_name)
+        house_key = _join_keys(street_key, _house_numbers(parts['number']))
+
+        house = house_key.map(self._houses)
+        street = street_key.map(self._streets) if accept_street else pd.Series(np.nan, index=raw.index)
+
+        level = pd.Series(None, index=raw.index, dtype=object)
+        level[house.notna()] = self.LEVEL_HOUSE
+        level[house.isna() & street.notna()] = self.LEVEL_STREET
+        coords = house.fillna(street)
+
+        found = coords.notna()
+        latitude = pd.Series(np.nan, index=raw.index)
+        longitude = pd.Series(np.nan, index=raw.index)
+        if found.any():
+            latitude[found] = [c[0] for c in coords[found]]
+            longitude[found] = [c[1] for c in coords[found]]
+
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Геокодовано газетиром {int(found.sum())} з {len(raw)} адрес за {elapsed:.2f} с "
+            f"(будинків: {int((level == self.LEVEL_HOUSE).sum())}, "
+            f"вулиць: {int((level == self.LEVEL_STREET).sum())})"
+        )
+
+        return pd.DataFrame({
+            'raw_address': raw,
+            'latitude': latitude,
+            'longitude': longitude,
+            'level': level
+        })
+
+    @staticmethod
+    def write_to_registry(database: Database, resolved: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Запис знайдених координат у реєстр адрес.
+
+        Args:
+            database: Шар доступу до бази даних
+            resolved: Результат resolve (записуються рядки з координатами)
+
+        Returns:
+            Dict[str, Any]: Статистика імпорту
+        """
+        accepted = resolved.dropna(subset=['latitude', 'longitude'])
+        records = accepted[['raw_address', 'latitude', 'longitude']].itertuples(index=False, name=None)
+        return RegistryImporter(database).import_records(records, source='газетир')
@@ -0,0 +1,135 @@
+"""
+Модуль векторних геодезичних обчислень.
+"""
+import numpy as np
+import pandas as pd
+
+# Радіус Землі в метрах
+EARTH_RADIUS_M = 6371000.0
+
+
+def haversine(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Відстань за формулою гаверсинусів для масивів координат.
+
+    Аргументи транслюються за правилами NumPy, тому можна рахувати
+    відстані від однієї точки до масиву точок або матрицю відстаней.
+
+    Args:
+        lat1: Широта першої точки (градуси)
+        lon1: Довгота першої точки (градуси)
+        lat2: Широта другої точки (градуси)
+        lon2: Довгота другої точки (градуси)
+
+    Returns:
+        np.ndarray: Відстані в метрах
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bearing(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Початковий азимут напрямку з першої точки на другу для масивів координат.
+
+    Args:
+        lat1: Широта першої точки (градуси)
+        lon1: Довгота першої точки (градуси)
+        lat2: Широта другої точки (градуси)
+        lon2: Довгота другої точки (градуси)
+
+    Returns:
+        np.ndarray: Азимут у градусах від півночі за годинниковою стрілкою (0-360)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2))
+    y = np.sin(lon2 - lon1) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+def event_timestamps(dates, times) -> np.ndarray:
+    """
+    Об'єднання колонок дати та часу в мітки часу.
+
+    Args:
+        dates: Серія дат (datetime64)
+        times: Серія часу доби (datetime.time або рядки 'HH:MM[:SS]')
+
+    Returns:
+        np.ndarray: Мітки часу datetime64[ns] (NaT, якщо час не розпізнано)
+    """
+    unique = pd.unique(times)
+    offsets = pd.to_timedelta(
+        pd.Series([str(t) if t is not None else None for t in unique], dtype=object)
+        .str.replace(r'^(\d{1,2}:\d{2})$', r'\1:00', regex=True),
+        errors='coerce'
+    )
+    offset = pd.Series(times).map(dict(zip(unique, offsets)))
+    dates = pd.to_datetime(pd.Series(dates)).dt.normalize()
+    return (dates.to_numpy() + pd.to_timedelta(offset).to_numpy()).astype('datetime64[ns]')
+
+
+def neighbor_pairs(lat1, lon1, lat2, lon2, radius: float):
+    """
+    Пари точок двох наборів на відстані не більше radius.
+
+    Точки розкладаються по сітці з кроком radius, і точні відстані
+    рахуються лише для точок сусідніх клітинок, без повної матриці.
+
+    Args:
+        lat1: Широти першого набору
+        lon1: Довготи першого набору
+        lat2: Широти другого набору
+        lon2: Довготи другого набору
+        radius: Максимальна відстань (м)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (індекси першого набору,
+            індекси другого набору, відстані в метрах)
+    """
+    if radius <= 0:
+        raise ValueError("Радіус пошуку сусідніх точок має бути більше 0")
+    lat1, lon1, lat2, lon2 = (np.asarray(x, dtype=float).reshape(-1) for x in (lat1, lon1, lat2, lon2))
+    empty = np.empty(0, dtype=np.int64)
+    if not len(lat1) or not len(lat2):
+        return empty, empty, np.empty(0)
+
+    # Крок сітки в градусах; по довготі - для найпівнічнішої точки, щоб сусідні клітинки покривали радіус
+    max_lat = min(np.abs(np.concatenate((lat1, lat2))).max(), 89.0)
+    lat_step = np.degrees(radius / EARTH_RADIUS_M)
+    lon_step = lat_step / np.cos(np.radians(max_lat))
+
+    row1, col1 = np.floor(lat1 / lat_step).astype(np.int64), np.floor(lon1 / lon_step).astype(np.int64)
+    row2, col2 = np.floor(lat2 / lat_step).astype(np.int64), np.floor(lon2 / lon_step).astype(np.int64)
+    width = int(max(col1.max(), col2.max()) - min(col1.min(), col2.min())) + 3
+    col_base = min(col1.min(), col2.min()) - 1
+
+    keys2 = row2 * width + (col2 - col_base)
+    order2 = np.argsort(keys2, kind='stable')
+    sorted_keys2 = keys2[order2]
+
+    first, second = [], []
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            keys = (row1 + d_row) * width + (col1 + d_col - col_base)
+            starts = np.searchsorted(sorted_keys2, keys, side='left')
+            counts = np.searchsorted(sorted_keys2, keys, side='right') - starts
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Розгортання діапазонів [start, start + count) в індекси кандидатів
+            owners = np.repeat(np.arange(len(keys)), counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            first.append(owners)
+            second.append(order2[np.repeat(starts, counts) + offsets])
+
+    if not first:
+        return empty, empty, np.empty(0)
+    first, second = np.concatenate(first), np.concatenate(second)
+    distances = haversine(lat1[first], lon1[first], lat2[second], lon2[second])
+    near = distances <= radius
+    return first[near], second[near], distances[near]
@@ -6,6 +6,7 @@ from pathlib import Path
 import logging
 from datetime import datetime
 from ..utils.config import Config
+from .kinematics import JUMP_COLUMN, SPEED_COLUMN, STEP_COLUMN
 
 
 class GeoProcessor:
@@ -149,11 +150,17 @@ class GeoProcessor:
                         f"Адреса: {row['Адреса БС']}<br>"
                         f"Абонент: {row['Абонент А']}"
                     )
+                    # Колонки кінематики, якщо їх уже обчислено для набору
+                    if pd.notna(row.get(STEP_COLUMN)):
+                        popup_text += (
+                            f"<br>Крок: {row[STEP_COLUMN]:.0f} м, "
+                            f"швидкість: {row[SPEED_COLUMN]:.1f} км/год"
+                        )
 
                     folium.Marker(
                         [row['Широта'], row['Долгота']],
                         popup=popup_text,
-                        icon=folium.Icon(color='red')
+                        icon=folium.Icon(color='black' if bool(row.get(JUMP_COLUMN, False)) else 'red')
                     ).add_to(m)
 
                     coordinates.append([row['Широта'], row['Долгота']])
@@ -0,0 +1,209 @@
+"""
+Модуль пакетного визначення дому та роботи для всіх абонентів набору даних.
+"""
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .day_period import DayWindow
+from .stay_detection import StayPointDetector, select_home_work, summarize_places
+from .traffic_dataset import SUBSCRIBER_COLUMN
+
+
+SUMMARY_COLUMNS = [
+    'subscriber', 'events', 'days', 'stays',
+    'home_latitude', 'home_longitude', 'home_address', 'home_nights', 'nights_observed', 'home_confidence',
+    'work_latitude', 'work_longitude', 'work_address', 'work_days', 'workdays_observed', 'work_confidence'
+]
+
+
+def subscriber_home_work(
+        df: pd.DataFrame,
+        detector: StayPointDetector,
+        window: Optional[DayWindow] = None
+) -> Dict[str, Any]:
+    """
+    Дім, робота та показники впевненості для одного абонента.
+
+    Впевненість дому - частка ночей з нічними перебуваннями, коли абонент
+    перебував вдома; впевненість роботи - частка днів з денними
+    перебуваннями, коли абонент був на роботі.
+
+    Args:
+        df: Події одного абонента
+        detector: Детектор перебувань
+        window: Денне вікно (None - типове DayWindow)
+
+    Returns:
+        Dict[str, Any]: Рядок зведення з колонками SUMMARY_COLUMNS (крім subscriber)
+    """
+    window = window or DayWindow()
+    stays = detector.detect(df)
+    places = summarize_places(stays, window)
+    home, work = select_home_work(places)
+
+    result: Dict[str, Any] = {
+        'events': len(df),
+        'days': int(df['Дата'].dt.date.nunique()),
+        'stays': len(stays)
+    }
+
+    if stays.empty:
+        return result
+
+    starts = stays['start'].to_numpy()
+    day = window.is_day(starts)
+    night = ~day
+    place = stays['place'].to_numpy()
+
+    night_dates = window.night_dates(starts)
+    day_dates = pd.to_datetime(pd.Series(starts)).dt.date
+
+    nights_observed = night_dates[night].nunique()
+    workdays_observed = day_dates[day].nunique()
+
+    if home is not None:
+        home_nights = night_dates[night & (place == home)].nunique()
+        result.update({
+            'home_latitude': places.at[home, 'latitude'],
+            'home_longitude': places.at[home, 'longitude'],
+            'home_address': places.at[home, 'address'],
+            'home_nights': home_nights,
+            'nights_observed': nights_observed,
+            'home_confidence': home_nights / nights_observed if nights_observed else 0.0
+        })
+
+    if work is not None:
+        work_days = day_dates[day & (place == work)].nunique()
+        result.update({
+            'work_latitude': places.at[work, 'latitude'],
+            'work_longitude': places.at[work, 'longitude'],
+            'work_address': places.at[work, 'address'],
+            'work_days': work_days,
+            'workdays_observed': workdays_observed,
+            'work_confidence': work_days / workdays_observed if workdays_observed else 0.0
+        })
+
+    return result
+
+
+def _process_shard(
+        shard: pd.DataFrame,
+        subscriber_column: str,
+        params: Dict[str, Any],
+        window: DayWindow
+) -> List[Dict[str, Any]]:
+    """
+    Обробка частини абонентів у робочому процесі.
+
+    Args:
+        shard: Події абонентів частини
+        subscriber_column: Назва колонки абонента
+        params: Параметри StayPointDetector (крім денного вікна)
+        window: Денне вікно
+
+    Returns:
+        List[Dict[str, Any]]: Рядки зведення
+    """
+    detector = StayPointDetector(**params, window=window)
+    rows = []
+    for subscriber, events in shard.groupby(subscriber_column, sort=False):
+        row = subscriber_home_work(events, detector, window)
+        row['subscriber'] = subscriber
+        rows.append(row)
+    return rows
+
+
+class BatchHomeWork:
+    """Визначення дому та роботи для всіх абонентів, паралельно за частинами абонентів."""
+
+    # Частин на один процес: дрібніші частини рівномірніше розподіляють навантаження
+    SHARDS_PER_WORKER = 4
+
+    # Менші набори обробляються в поточному процесі
+    MIN_PARALLEL_EVENTS = 50000
+
+    def __init__(
+            self,
+            radius: float = 500.0,
+            min_dwell: float = 30.0,
+            max_gap: Optional[float] = None,
+            min_night_dwell: Optional[float] = None,
+            workers: Optional[int] = None,
+            window: Optional[DayWindow] = None
+    ):
+        """
+        Ініціалізація пакетної обробки.
+
+        Args:
+            radius: Радіус місця перебування (м)
+            min_dwell: Мінімальна тривалість (денного) перебування (хв)
+            max_gap: Максимальна перерва між подіями перебування (хв)
+            min_night_dwell: Мінімальна тривалість нічного перебування (хв), None - як min_dwell
+            workers: Кількість процесів (None - кількість ядер)
+            window: Денне вікно (None - типове DayWindow)
+        """
+        self.params = {
+            'radius': radius,
+            'min_dwell': min_dwell,
+            'max_gap': max_gap,
+            'min_night_dwell': min_night_dwell
+        }
+        self.window = window or DayWindow()
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, df: pd.DataFrame, subscriber_column: str = SUBSCRIBER_COLUMN) -> pd.DataFrame:
+        """
+        Обчислення зведення для всіх абонентів.
+
+        Args:
+            df: Підготовлений набір даних з колонкою абонента
+            subscriber_column: Назва колонки абонента
+
+        Returns:
+            pd.DataFrame: Колонки SUMMARY_COLUMNS, рядок на абонента
+        """
+        if subscriber_column not in df.columns:
+            raise ValueError(f"У наборі даних відсутня колонка '{subscriber_column}'")
+
+        started = time.perf_counter()
+        df = df[df[subscriber_column].notna()]
+
+        # Абоненти розподіляються по частинах за кількістю подій (жадібно, від найбільших)
+        sizes = df[subscriber_column].value_counts()
+        n_shards = max(1, min(len(sizes), self.workers * self.SHARDS_PER_WORKER))
+        loads = np.zeros(n_shards, dtype=np.int64)
+        assignment = {}
+        for subscriber, size in sizes.items():
+            shard = int(np.argmin(loads))
+            assignment[subscriber] = shard
+            loads[shard] += size
+        shard_ids = df[subscriber_column].map(assignment).to_numpy()
+        shards = [df[shard_ids == i] for i in range(n_shards)]
+
+        rows: List[Dict[str, Any]] = []
+        if self.workers > 1 and len(df) >= self.MIN_PARALLEL_EVENTS and n_shards > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(_process_shard, shard, subscriber_column, self.params, self.window)
+                    for shard in shards
+                ]
+                for future in futures:
+                    rows.extend(future.result())
+        else:
+            for shard in shards:
+                rows.extend(_process_shard(shard, subscriber_column, self.params, self.window))
+
+        summary = pd.DataFrame(rows).reindex(columns=SUMMARY_COLUMNS)
+        summary = summary.sort_values('subscriber').reset_index(drop=True)
+
+        logging.info(
+            f"Визначено дім/роботу для {len(summary)} абонентів "
+            f"({len(df)} подій) за {time.perf_counter() - started:.1f} с"
+        )
+        return summary
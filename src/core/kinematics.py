@@ -0,0 +1,113 @@
+"""
+Модуль кінематики переміщень: крок, інтервал, швидкість і зміна напрямку між подіями абонента.
+"""
+import time
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .geo_math import bearing, event_timestamps, haversine
+
+
+STEP_COLUMN = 'Крок (м)'
+ELAPSED_COLUMN = 'Інтервал (хв)'
+SPEED_COLUMN = 'Швидкість (км/год)'
+TURN_COLUMN = 'Зміна напрямку (°)'
+JUMP_COLUMN = 'Неправдоподібний стрибок'
+KINEMATIC_COLUMNS = [STEP_COLUMN, ELAPSED_COLUMN, SPEED_COLUMN, TURN_COLUMN, JUMP_COLUMN]
+
+# Максимальна правдоподібна швидкість (км/год)
+DEFAULT_MAX_SPEED = 200.0
+
+# Допуск на зону покриття БС (м): перехід між сусідніми БС за секунди не вважається стрибком
+DEFAULT_JUMP_TOLERANCE = 1000.0
+
+
+def kinematics(
+        df: pd.DataFrame,
+        max_speed: float = DEFAULT_MAX_SPEED,
+        tolerance: float = DEFAULT_JUMP_TOLERANCE,
+        subscriber_column: Optional[str] = None,
+        lat_column: str = 'Широта',
+        lon_column: str = 'Довгота'
+) -> pd.DataFrame:
+    """
+    Показники кроку від попередньої події того самого абонента.
+
+    Події впорядковуються за абонентом і часом один раз, і всі показники
+    рахуються різницями сусідніх елементів масивів. Перша подія абонента
+    (та події без часу або координат) кроку не має - значення порожні.
+
+    Стрибок неправдоподібний, якщо відстань більша, ніж можна подолати з
+    швидкістю max_speed за інтервал, з допуском tolerance на зону покриття БС.
+
+    Args:
+        df: Події з колонками Дата, Час, координат та (необов'язково) абонента
+        max_speed: Максимальна правдоподібна швидкість (км/год)
+        tolerance: Допуск відстані (м)
+        subscriber_column: Назва колонки абонента (None - один потік подій)
+        lat_column: Назва колонки широти
+        lon_column: Назва колонки довготи
+
+    Returns:
+        pd.DataFrame: Колонки KINEMATIC_COLUMNS з індексом df
+    """
+    started = time.perf_counter()
+    timestamps = event_timestamps(df['Дата'], df['Час'])
+    lat = df[lat_column].to_numpy(dtype=float)
+    lon = df[lon_column].to_numpy(dtype=float)
+    subscribers = (
+        pd.factorize(df[subscriber_column])[0] if subscriber_column and subscriber_column in df.columns
+        else np.zeros(len(df), dtype=np.int64)
+    )
+    valid = ~np.isnat(timestamps) & ~np.isnan(lat) & ~np.isnan(lon) & (subscribers >= 0)
+
+    # Потік подій кожного абонента за часом; події без часу чи координат - в кінці та без кроків
+    order = np.lexsort((timestamps.view(np.int64), subscribers, ~valid))
+    order = order[valid[order]]
+    subscribers, lat, lon = subscribers[order], lat[order], lon[order]
+    seconds = timestamps[order].view(np.int64) / 1e9
+
+    has_step = np.zeros(len(order), dtype=bool)
+    has_step[1:] = subscribers[1:] == subscribers[:-1]
+
+    step = np.full(len(order), np.nan)
+    elapsed = np.full(len(order), np.nan)
+    step[1:] = haversine(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    elapsed[1:] = (seconds[1:] - seconds[:-1]) / 60
+    step[~has_step], elapsed[~has_step] = np.nan, np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.where(elapsed > 0, step / 1000 / (elapsed / 60), np.where(step > 0, np.inf, 0.0))
+    speed[~has_step] = np.nan
+
+    # Зміна напрямку між двома послідовними ненульовими кроками
+    heading = np.full(len(order), np.nan)
+    heading[1:] = bearing(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    heading[~has_step | (step == 0)] = np.nan
+    turn = np.full(len(order), np.nan)
+    turn[1:] = np.abs((heading[1:] - heading[:-1] + 180) % 360 - 180)
+
+    jump = has_step & (step > max_speed / 3.6 * elapsed * 60 + tolerance)
+
+    # Повернення до вихідного порядку рядків (позиційно - індекс df може повторюватися)
+    def restore(values: np.ndarray, fill) -> np.ndarray:
+        restored = np.full(len(df), fill, dtype=values.dtype)
+        restored[order] = values
+        return restored
+
+    result = pd.DataFrame({
+        STEP_COLUMN: restore(step.round(1), np.nan),
+        ELAPSED_COLUMN: restore(elapsed.round(2), np.nan),
+        SPEED_COLUMN: restore(speed.round(1), np.nan),
+        TURN_COLUMN: restore(turn.round(1), np.nan),
+        JUMP_COLUMN: restore(jump, False)
+    }, index=df.index)
+
+    logging.info(
+        f"Кінематика переміщень: {int(has_step.sum())} кроків, {int(jump.sum())} неправдоподібних стрибків "
+        f"за {time.perf_counter() - started:.2f} с"
+    )
+    return result
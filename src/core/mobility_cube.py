@@ -0,0 +1,170 @@
+"""
+Модуль показників мобільності абонентів за кожен день (куб "абонент x день").
+"""
+import time
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .geo_math import EARTH_RADIUS_M, event_timestamps, haversine
+from .subscriber_index import subscriber_codes
+
+
+CUBE_COLUMNS = [
+    'subscriber', 'date', 'events', 'first_seen', 'last_seen',
+    'min_latitude', 'max_latitude', 'min_longitude', 'max_longitude', 'bbox_diagonal',
+    'cells', 'radius_of_gyration', 'displacement'
+]
+
+# Назви колонок куба для звітів
+CUBE_LABELS = {
+    'subscriber': 'Абонент',
+    'date': 'Дата',
+    'events': 'Подій',
+    'first_seen': 'Перша подія',
+    'last_seen': 'Остання подія',
+    'min_latitude': 'Мін. широта',
+    'max_latitude': 'Макс. широта',
+    'min_longitude': 'Мін. довгота',
+    'max_longitude': 'Макс. довгота',
+    'bbox_diagonal': 'Діагональ області (м)',
+    'cells': 'Різних БС',
+    'radius_of_gyration': 'Радіус гірації (м)',
+    'displacement': 'Сумарне переміщення (м)'
+}
+
+
+def mobility_cube(
+        df: pd.DataFrame,
+        subscriber_column: Optional[str] = None,
+        lat_column: str = 'Широта',
+        lon_column: str = 'Довгота'
+) -> pd.DataFrame:
+    """
+    Показники мобільності для кожної пари (абонент, день) одним проходом.
+
+    Події впорядковуються за групою (абонент, день) і часом один раз; усі
+    показники - групові редукції NumPy (reduceat/bincount) по межах груп:
+    межі координат, кількість різних БС (координати та азимут), перша та
+    остання подія, радіус гірації (середньоквадратична відстань від
+    центру мас, у локальній проекції) та сумарне переміщення (сума
+    відстаней між послідовними подіями).
+
+    Args:
+        df: Події з колонками Дата, Час, координат та (необов'язково) абонента
+        subscriber_column: Назва колонки абонента (None - усі події одного абонента)
+        lat_column: Назва колонки широти
+        lon_column: Назва колонки довготи
+
+    Returns:
+        pd.DataFrame: Колонки CUBE_COLUMNS, рядок на абонент-день
+    """
+    started = time.perf_counter()
+    lat = df[lat_column].to_numpy(dtype=float)
+    lon = df[lon_column].to_numpy(dtype=float)
+    if subscriber_column and subscriber_column in df.columns:
+        subscriber_ids, subscribers = subscriber_codes(df[subscriber_column])
+    else:
+        subscriber_ids, subscribers = np.zeros(len(df), dtype=np.int64), pd.Index([''])
+    valid = (subscriber_ids >= 0) & df['Дата'].notna().to_numpy() & ~np.isnan(lat) & ~np.isnan(lon)
+    if not valid.any():
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+
+    df, subscriber_ids, lat, lon = df[valid], subscriber_ids[valid], lat[valid], lon[valid]
+    timestamps = event_timestamps(df['Дата'], df['Час']).view(np.int64)
+    missing_time = timestamps == np.iinfo(np.int64).min
+
+    # Група - пара (абонент, день); події групи - неперервний діапазон за часом
+    day_codes, days = pd.factorize(df['Дата'].dt.normalize(), sort=True)
+    groups, group_keys = pd.factorize(subscriber_ids.astype(np.int64) * len(days) + day_codes, sort=True)
+    order = np.lexsort((timestamps, missing_time, groups))
+    groups, lat, lon = groups[order], lat[order], lon[order]
+    timestamps, missing_time = timestamps[order], missing_time[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    n_groups = len(group_keys)
+    counts = np.diff(np.r_[starts, len(groups)])
+
+    # Межі координат
+    min_lat, max_lat = np.minimum.reduceat(lat, starts), np.maximum.reduceat(lat, starts)
+    min_lon, max_lon = np.minimum.reduceat(lon, starts), np.maximum.reduceat(lon, starts)
+
+    # Перша та остання подія (події без часу не враховуються)
+    timed = np.where(missing_time, np.iinfo(np.int64).max, timestamps)
+    first_seen = np.minimum.reduceat(timed, starts)
+    last_seen = np.maximum.reduceat(np.where(missing_time, np.iinfo(np.int64).min, timestamps), starts)
+    first_seen = np.where(first_seen == np.iinfo(np.int64).max, np.iinfo(np.int64).min, first_seen)
+
+    # Різні БС: координати (та азимут, якщо є) як один код, унікальні пари (група, БС)
+    cell_codes = pd.factorize(lat + 1j * lon)[0].astype(np.int64)
+    if 'Азимут' in df.columns:
+        azimuths = pd.to_numeric(df['Азимут'], errors='coerce').to_numpy(dtype=float)[order]
+        azimuth_codes = pd.factorize(azimuths, use_na_sentinel=False)[0]
+        cell_codes = cell_codes * (int(azimuth_codes.max()) + 1) + azimuth_codes
+    n_cells = int(cell_codes.max()) + 1
+    cells = np.bincount(pd.unique(groups.astype(np.int64) * n_cells + cell_codes) // n_cells, minlength=n_groups)
+
+    # Радіус гірації в локальній рівнопроміжній проекції навколо центру мас групи
+    center_lat = np.bincount(groups, weights=lat, minlength=n_groups) / counts
+    center_lon = np.bincount(groups, weights=lon, minlength=n_groups) / counts
+    meters = np.radians(1.0) * EARTH_RADIUS_M
+    dy = (lat - center_lat[groups]) * meters
+    dx = (lon - center_lon[groups]) * meters * np.cos(np.radians(center_lat[groups]))
+    gyration = np.sqrt(np.bincount(groups, weights=dx ** 2 + dy ** 2, minlength=n_groups) / counts)
+
+    # Сумарне переміщення: кроки між сусідніми подіями однієї групи
+    same = groups[1:] == groups[:-1]
+    steps = haversine(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    displacement = np.bincount(groups[1:][same], weights=steps[same], minlength=n_groups)
+
+    cube = pd.DataFrame({
+        'subscriber': np.asarray(subscribers, dtype=object)[group_keys // len(days)],
+        'date': pd.DatetimeIndex(days)[group_keys % len(days)].date,
+        'events': counts,
+        'first_seen': first_seen.view('datetime64[ns]'),
+        'last_seen': last_seen.view('datetime64[ns]'),
+        'min_latitude': min_lat,
+        'max_latitude': max_lat,
+        'min_longitude': min_lon,
+        'max_longitude': max_lon,
+        'bbox_diagonal': haversine(min_lat, min_lon, max_lat, max_lon).round(1),
+        'cells': cells,
+        'radius_of_gyration': gyration.round(1),
+        'displacement': displacement.round(1)
+    })
+
+    logging.info(
+        f"Куб мобільності: {len(cube)} абонент-днів ({cube['subscriber'].nunique()} абонентів, {len(df)} подій) "
+        f"за {time.perf_counter() - started:.2f} с"
+    )
+    return cube
+
+
+def subscriber_mobility(cube: pd.DataFrame) -> pd.DataFrame:
+    """
+    Зведення куба мобільності по абонентах для ранжування.
+
+    Args:
+        cube: Результат mobility_cube
+
+    Returns:
+        pd.DataFrame: Рядок на абонента за спаданням максимального радіуса гірації
+    """
+    if cube.empty:
+        return pd.DataFrame(columns=[
+            'subscriber', 'days', 'events', 'first_seen', 'last_seen',
+            'max_cells', 'mean_radius_of_gyration', 'max_radius_of_gyration', 'displacement'
+        ])
+    summary = cube.groupby('subscriber', sort=False).agg(
+        days=('date', 'size'),
+        events=('events', 'sum'),
+        first_seen=('first_seen', 'min'),
+        last_seen=('last_seen', 'max'),
+        max_cells=('cells', 'max'),
+        mean_radius_of_gyration=('radius_of_gyration', 'mean'),
+        max_radius_of_gyration=('radius_of_gyration', 'max'),
+        displacement=('displacement', 'sum')
+    ).reset_index()
+    summary['mean_radius_of_gyration'] = summary['mean_radius_of_gyration'].round(1)
+    return summary.sort_values('max_radius_of_gyration', ascending=False, kind='stable').reset_index(drop=True)
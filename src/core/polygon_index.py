@@ -0,0 +1,216 @@
+"""
+Модуль просторового індексу полігонів GeoJSON для векторної перевірки належності точок.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree, wkb
+from shapely.geometry import shape
+
+
+# Властивості GeoJSON, з яких береться назва об'єкта (у порядку пріоритету)
+NAME_PROPERTIES = ['name', 'NAME', 'Name', 'назва', 'Назва', 'district', 'District', 'район', 'title']
+
+
+def geopackage_geometry(blob: Optional[bytes]):
+    """
+    Геометрія з бінарного поля GeoPackage.
+
+    Заголовок GPKG: 'GP', версія, прапорці (біти 1-3 - тип обвідного прямокутника),
+    srs_id, прямокутник, далі WKB.
+
+    Returns:
+        Геометрія shapely або None для порожнього поля
+    """
+    if not blob:
+        return None
+    envelope_sizes = (0, 32, 48, 48, 64)
+    envelope = (blob[3] >> 1) & 0x07
+    offset = 8 + (envelope_sizes[envelope] if envelope < len(envelope_sizes) else 0)
+    return wkb.loads(bytes(blob[offset:]))
+
+
+class PolygonIndex:
+    """
+    Набір полігонів з R-деревом (STRtree) обвідних прямокутників.
+
+    Точки спочатку зіставляються з прямокутниками полігонів через дерево,
+    після чого належність перевіряється векторно shapely.contains_xy
+    для кожного полігона з підготовленою (prepared) геометрією. Однакові
+    координати (події на одній БС) перевіряються один раз.
+    """
+
+    def __init__(self, geometries: Sequence, names: Optional[Sequence[str]] = None):
+        """
+        Побудова індексу.
+
+        Args:
+            geometries: Полігони (shapely)
+            names: Назви полігонів (за замовчуванням 'Полігон N')
+        """
+        self.geometries = np.asarray(list(geometries), dtype=object)
+        self.names: List[str] = (
+            list(names) if names is not None
+            else [f"Полігон {i + 1}" for i in range(len(self.geometries))]
+        )
+        shapely.prepare(self.geometries)
+        self.tree = STRtree(self.geometries)
+
+    def __len__(self) -> int:
+        return len(self.geometries)
+
+    @classmethod
+    def from_geojson(cls, file_path: str) -> 'PolygonIndex':
+        """
+        Завантаження всіх полігонів з файлу GeoJSON.
+
+        Об'єкти без геометрії або з не площинною геометрією пропускаються.
+
+        Args:
+            file_path: Шлях до файлу GeoJSON (FeatureCollection, Feature або геометрія);
+                файли .gpkg передаються в from_geopackage
+
+        Returns:
+            PolygonIndex: Індекс полігонів
+        """
+        if os.path.splitext(file_path)[1].lower() == '.gpkg':
+            return cls.from_geopackage(file_path)
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            geojson = json.load(f)
+
+        if geojson.get('type') == 'FeatureCollection':
+            features = geojson.get('features', [])
+        elif geojson.get('type') == 'Feature':
+            features = [geojson]
+        else:
+            features = [{'type': 'Feature', 'geometry': geojson, 'properties': {}}]
+
+        geometries, names = [], []
+        for number, feature in enumerate(features, 1):
+            if not feature.get('geometry'):
+                continue
+            geometry = shape(feature['geometry'])
+            if geometry.is_empty or geometry.geom_type not in ('Polygon', 'MultiPolygon'):
+                continue
+            properties = feature.get('properties') or {}
+            name = next((properties[key] for key in NAME_PROPERTIES if properties.get(key)), None)
+            geometries.append(geometry)
+            names.append(str(name) if name is not None else f"Полігон {number}")
+
+        if not geometries:
+            raise ValueError(f"У файлі {file_path} немає полігонів")
+
+        logging.info(f"Завантажено {len(geometries)} полігонів з {file_path}")
+        return cls(geometries, names)
+
+    @classmethod
+    def from_geopackage(cls, file_path: str) -> 'PolygonIndex':
+        """
+        Завантаження полігонів з першої таблиці об'єктів GeoPackage (CRS - WGS84).
+
+        Args:
+            file_path: Шлях до файлу .gpkg
+
+        Returns:
+            PolygonIndex: Індекс полігонів
+        """
+        conn = sqlite3.connect(file_path)
+        try:
+            row = conn.execute(
+                "SELECT c.table_name, g.column_name FROM gpkg_contents c "
+                "JOIN gpkg_geometry_columns g ON g.table_name = c.table_name "
+                "WHERE c.data_type = 'features' "
+                "ORDER BY g.geometry_type_name NOT LIKE '%POLYGON%' LIMIT 1"
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"У файлі {file_path} немає таблиць об'єктів")
+            table, geometry_column = row
+
+            header = [r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')]
+            name_column = next((name for name in NAME_PROPERTIES if name in header), None)
+            select = f'"{name_column}"' if name_column else 'NULL'
+            rows = conn.execute(f'SELECT {select}, "{geometry_column}" FROM "{table}"').fetchall()
+        finally:
+            conn.close()
+
+        geometries, names = [], []
+        for number, (name, blob) in enumerate(rows, 1):
+            geometry = geopackage_geometry(blob)
+            if geometry is None or geometry.is_empty or geometry.geom_type not in ('Polygon', 'MultiPolygon'):
+                continue
+            geometries.append(geometry)
+            names.append(str(name) if name is not None else f"Полігон {number}")
+
+        if not geometries:
+            raise ValueError(f"У файлі {file_path} немає полігонів")
+
+        logging.info(f"Завантажено {len(geometries)} полігонів з {file_path} (таблиця {table})")
+        return cls(geometries, names)
+
+    def locate(self, lon, lat) -> np.ndarray:
+        """
+        Номер полігона, що містить кожну точку.
+
+        Args:
+            lon: Довготи точок
+            lat: Широти точок
+
+        Returns:
+            np.ndarray: Номер полігона (-1 - поза всіма полігонами; при
+                перетині полігонів - перший за порядком у файлі)
+        """
+        started = time.perf_counter()
+        coords = np.column_stack((np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)))
+        valid = ~np.isnan(coords).any(axis=1)
+        result = np.full(len(coords), -1, dtype=np.int64)
+        if not valid.any():
+            return result
+
+        # Унікальні координати: пара (довгота, широта) як одне комплексне число сортується швидше за рядки
+        packed, inverse = np.unique(coords[valid, 0] + 1j * coords[valid, 1], return_inverse=True)
+        unique = np.column_stack((packed.real, packed.imag))
+        inverse = inverse.reshape(-1)
+        labels = np.full(len(unique), len(self.geometries), dtype=np.int64)
+
+        # Кандидати за обвідними прямокутниками, далі точна перевірка по кожному полігону
+        points, polygons = self.tree.query(shapely.points(unique))
+        order = np.argsort(polygons, kind='stable')
+        points, polygons = points[order], polygons[order]
+        bounds = np.flatnonzero(np.diff(polygons)) + 1
+        for group_points, polygon in zip(np.split(points, bounds), polygons[np.r_[0, bounds]] if len(polygons) else []):
+            inside = shapely.contains_xy(self.geometries[polygon], unique[group_points, 0], unique[group_points, 1])
+            hits = group_points[inside]
+            labels[hits] = np.minimum(labels[hits], polygon)
+
+        labels[labels == len(self.geometries)] = -1
+        result[valid] = labels[inverse]
+
+        logging.info(
+            f"Перевірено належність {len(coords)} точок ({len(unique)} унікальних) "
+            f"до {len(self.geometries)} полігонів за {time.perf_counter() - started:.2f} с"
+        )
+        return result
+
+    def label(self, df: pd.DataFrame, lat_column: str = 'Широта', lon_column: str = 'Довгота') -> pd.Series:
+        """
+        Назва полігона для кожної події.
+
+        Args:
+            df: Події з координатами
+            lat_column: Назва колонки широти
+            lon_column: Назва колонки довготи
+
+        Returns:
+            pd.Series: Назва полігона (порожнє значення для подій поза полігонами)
+        """
+        located = self.locate(df[lon_column].to_numpy(), df[lat_column].to_numpy())
+        names = np.asarray(self.names + [None], dtype=object)
+        return pd.Series(names[located], index=df.index)
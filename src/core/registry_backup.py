@@ -0,0 +1,159 @@
+"""
+Модуль знімків бази адрес через онлайн-резервування SQLite.
+"""
+import os
+import glob
+import gzip
+import time
+import shutil
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List
+
+from .database import Database
+from .resolution_cache import bump_registry_version, get_registry_version
+
+
+class RegistryBackup:
+    """
+    Стиснені знімки бази адрес з ротацією та відновленням.
+
+    Знімок робиться через онлайн-резервування SQLite порціями сторінок,
+    тому читачі бази не блокуються на весь час копіювання.
+    """
+
+    # Кількість сторінок, що копіюються за один крок резервування
+    PAGES_PER_STEP = 4096
+
+    # Рівень стиснення gzip (компроміс швидкості та розміру)
+    COMPRESS_LEVEL = 3
+
+    SUFFIX = '.db.gz'
+
+    def __init__(self, database: Database, keep: int = 10):
+        """
+        Ініціалізація резервування.
+
+        Args:
+            database: Шар доступу до бази даних
+            keep: Кількість знімків, що зберігаються (старіші видаляються)
+        """
+        self.database = database
+        self.keep = keep
+        self.backup_dir = database.backup_path
+        self._prefix = os.path.splitext(os.path.basename(database.path))[0]
+
+    def create(self) -> Dict[str, Any]:
+        """
+        Створення знімка бази.
+
+        Returns:
+            Dict[str, Any]: Статистика (path, size, seconds)
+        """
+        started = time.perf_counter()
+        os.makedirs(self.backup_dir, exist_ok=True)
+
+        name = f"{self._prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        raw_path = os.path.join(self.backup_dir, f"{name}.db")
+        path = raw_path + '.gz'
+
+        try:
+            target = sqlite3.connect(raw_path)
+            try:
+                self.database.connection().backup(target, pages=self.PAGES_PER_STEP)
+            finally:
+                target.close()
+
+            with open(raw_path, 'rb') as src, gzip.open(path, 'wb', compresslevel=self.COMPRESS_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, length=1024 * 1024)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        self._rotate()
+
+        stats = {
+            'path': path,
+            'size': os.path.getsize(path),
+            'seconds': time.perf_counter() - started
+        }
+        logging.info(
+            f"Створено знімок бази {path}: {stats['size'] / 1024 / 1024:.1f} МБ, "
+            f"{stats['seconds']:.2f} с"
+        )
+        return stats
+
+    def list(self) -> List[str]:
+        """
+        Перелік знімків бази.
+
+        Returns:
+            List[str]: Шляхи до знімків, від найновішого
+        """
+        pattern = os.path.join(self.backup_dir, f"{self._prefix}_*{self.SUFFIX}")
+        return sorted(glob.glob(pattern), reverse=True)
+
+    def restore(self, path: str) -> Dict[str, Any]:
+        """
+        Відновлення бази зі знімка.
+
+        Знімок розпаковується поруч з базою, перевіряється та копіюється в
+        робочу базу через онлайн-резервування, тому відкриті з'єднання
+        лишаються дійсними.
+
+        Args:
+            path: Шлях до знімка (.db.gz)
+
+        Returns:
+            Dict[str, Any]: Статистика (path, rows, seconds)
+        """
+        started = time.perf_counter()
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Знімок не знайдено: {path}")
+
+        # Версія до відновлення: кеші в пам'яті могли завантажити саме її
+        live_version = get_registry_version(self.database)
+
+        raw_path = f"{self.database.path}.restore"
+        try:
+            with gzip.open(path, 'rb') as src, open(raw_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, length=1024 * 1024)
+
+            source = sqlite3.connect(raw_path)
+            try:
+                check = source.execute("PRAGMA quick_check").fetchone()[0]
+                if check != 'ok':
+                    raise ValueError(f"Знімок {path} пошкоджено: {check}")
+                source.backup(self.database.connection(), pages=self.PAGES_PER_STEP)
+            finally:
+                source.close()
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        # Кеші в пам'яті прив'язані до версії реєстру: нова версія має бути більшою і за
+        # версію знімка, і за версію до відновлення, інакше кеші не перечитаються
+        with self.database.transaction():
+            bump_registry_version(self.database, minimum=live_version)
+
+        stats = {
+            'path': path,
+            'rows': self.database.query_one("SELECT COUNT(*) FROM addresses")[0]
+            if self.database.table_exists('addresses') else 0,
+            'seconds': time.perf_counter() - started
+        }
+        logging.info(
+            f"Базу відновлено зі знімка {path}: {stats['rows']} записів, "
+            f"{stats['seconds']:.2f} с"
+        )
+        return stats
+
+    def _rotate(self) -> None:
+        """Видалення знімків, старших за останні keep."""
+        for path in self.list()[self.keep:]:
+            try:
+                os.remove(path)
+                logging.info(f"Видалено старий знімок бази: {path}")
+            except OSError as e:
+                logging.error(f"Помилка видалення знімка {path}: {e}")
@@ -0,0 +1,320 @@
+"""
+Модуль імпорту реєстру базових станцій у SQLite.
+"""
+import os
+import csv
+import time
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .address_normalizer import normalize_address, parse_address
+from .cell_registry import (
+    CELL_COLUMN_ALIASES, address_key, cell_id_key, create_cells_schema, _id_value
+)
+from .database import Database
+from .resolution_cache import bump_registry_version
+
+
+# Можливі назви колонок у файлах реєстру
+COLUMN_ALIASES = {
+    'address': ['адреса', 'адреса бс', 'адрес', 'address', 'bs address', 'bs_address'],
+    'latitude': ['широта', 'latitude', 'lat'],
+    'longitude': ['довгота', 'долгота', 'longitude', 'lon', 'lng', 'long']
+}
+
+ADDRESS_COLUMNS = [
+    'address', 'original_address', 'latitude', 'longitude',
+    'region', 'district', 'locality', 'street', 'house_number'
+]
+
+# Вторинні індекси будуються після завантаження; індекси (колонка, address)
+# потрібні для посторінкового перегляду з сортуванням
+SECONDARY_INDEXES = {
+    'idx_addresses_street': 'CREATE INDEX IF NOT EXISTS idx_addresses_street ON addresses (street, house_number)',
+    'idx_addresses_locality': 'CREATE INDEX IF NOT EXISTS idx_addresses_locality ON addresses (locality, address)',
+    'idx_addresses_latitude': 'CREATE INDEX IF NOT EXISTS idx_addresses_latitude ON addresses (latitude, address)',
+    'idx_addresses_longitude': 'CREATE INDEX IF NOT EXISTS idx_addresses_longitude ON addresses (longitude, address)'
+}
+
+
+def create_registry_schema(database: Database) -> None:
+    """
+    Створення таблиці реєстру адрес та її індексів.
+
+    Для баз, створених раніше, додаються відсутні колонки розібраної адреси.
+
+    Args:
+        database: Шар доступу до бази даних
+    """
+    database.execute('''
+        CREATE TABLE IF NOT EXISTS addresses (
+            address TEXT PRIMARY KEY,
+            original_address TEXT,
+            latitude REAL,
+            longitude REAL,
+            region TEXT,
+            district TEXT,
+            locality TEXT,
+            street TEXT,
+            house_number TEXT
+        )
+    ''')
+
+    existing = {row[1] for row in database.query("PRAGMA table_info(addresses)")}
+    for column in ADDRESS_COLUMNS:
+        if column not in existing:
+            database.execute(f"ALTER TABLE addresses ADD COLUMN {column} TEXT")
+
+    for statement in SECONDARY_INDEXES.values():
+        database.execute(statement)
+
+    create_cells_schema(database)
+
+
+class RegistryImporter:
+    """Клас для пакетного імпорту реєстру БС з Excel/CSV у базу даних."""
+
+    def __init__(self, database: Database, batch_size: int = 50000):
+        """
+        Ініціалізація імпортера.
+
+        Args:
+            database: Шар доступу до бази даних
+            batch_size: Кількість рядків в одному пакеті вставки
+        """
+        self.database = database
+        self.batch_size = batch_size
+
+    def import_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Імпорт файлу реєстру в одній транзакції.
+
+        Args:
+            file_path: Шлях до файлу .xlsx або .csv
+
+        Returns:
+            Dict[str, Any]: Статистика імпорту (rows, cells, skipped, total, seconds, rows_per_second)
+        """
+        rows = self._iter_rows(file_path)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"Файл {file_path} порожній")
+
+        return self._import(rows, self._map_columns(header), file_path)
+
+    def import_records(self, records: Iterable[Sequence], source: str = 'records') -> Dict[str, Any]:
+        """
+        Імпорт записів (адреса, широта, довгота) в одній транзакції.
+
+        Args:
+            records: Записи реєстру
+            source: Назва джерела для логу
+
+        Returns:
+            Dict[str, Any]: Статистика імпорту, як у import_file
+        """
+        return self._import(iter(records), {'address': 0, 'latitude': 1, 'longitude': 2}, source)
+
+    def _import(self, rows: Iterator[Sequence], columns: Dict[str, int], source: str) -> Dict[str, Any]:
+        """
+        Запис рядків реєстру в базу пакетами.
+
+        Args:
+            rows: Рядки без заголовка
+            columns: Назва поля -> індекс колонки
+            source: Назва джерела для логу
+
+        Returns:
+            Dict[str, Any]: Статистика імпорту
+        """
+        started = time.perf_counter()
+        stats = {'rows': 0, 'cells': 0, 'skipped': 0}
+
+        with self.database.transaction():
+            create_registry_schema(self.database)
+
+            # Індекси простіше перебудувати один раз, ніж оновлювати на кожній вставці
+            for name in SECONDARY_INDEXES:
+                self.database.execute(f"DROP INDEX IF EXISTS {name}")
+
+            for batch, cells_batch in self._iter_batches(rows, columns, stats):
+                self.database.executemany(
+                    '''
+                    INSERT INTO addresses (
+                        address, original_address, latitude, longitude,
+                        region, district, locality, street, house_number
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(address) DO UPDATE SET
+                        original_address = excluded.original_address,
+                        latitude = excluded.latitude,
+                        longitude = excluded.longitude,
+                        region = excluded.region,
+                        district = excluded.district,
+                        locality = excluded.locality,
+                        street = excluded.street,
+                        house_number = excluded.house_number
+                    ''',
+                    batch
+                )
+                self.database.executemany(
+                    '''
+                    INSERT OR REPLACE INTO cells (
+                        cell_key, operator, lac, ci, address, latitude, longitude, azimuth
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''',
+                    cells_batch
+                )
+                stats['rows'] += len(batch)
+                stats['cells'] += len(cells_batch)
+
+            for statement in SECONDARY_INDEXES.values():
+                self.database.execute(statement)
+
+            bump_registry_version(self.database)
+
+        self.database.execute("ANALYZE addresses")
+        stats['total'] = self.database.query_one("SELECT COUNT(*) FROM addresses")[0]
+
+        stats['seconds'] = time.perf_counter() - started
+        stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+
+        logging.info(
+            f"Імпортовано реєстр {source}: {stats['rows']} рядків, "
+            f"пропущено {stats['skipped']}, {stats['seconds']:.2f} с "
+            f"({stats['rows_per_second']:.0f} рядків/с)"
+        )
+        return stats
+
+    def _iter_batches(
+            self,
+            rows: Iterator[Sequence],
+            columns: Dict[str, int],
+            stats: Dict[str, Any]
+    ) -> Iterator[Tuple[List[tuple], List[tuple]]]:
+        """
+        Потокова нормалізація рядків реєстру пакетами.
+
+        Args:
+            rows: Рядки без заголовка
+            columns: Назва поля -> індекс колонки
+            stats: Словник статистики (оновлюється лічильник пропущених рядків)
+
+        Yields:
+            Tuple[List[tuple], List[tuple]]: Пакети записів адрес та сот для вставки
+        """
+        batch, cells_batch = [], []
+        for row in rows:
+            prepared = self._prepare_row(row, columns)
+            if prepared is None:
+                stats['skipped'] += 1
+                continue
+
+            batch.append(prepared[0])
+            cells_batch.extend(prepared[1])
+            if len(batch) >= self.batch_size:
+                yield batch, cells_batch
+                batch, cells_batch = [], []
+
+        if batch:
+            yield batch, cells_batch
+
+    @staticmethod
+    def _iter_rows(file_path: str) -> Iterator[Sequence]:
+        """Потокове читання рядків Excel або CSV файлу."""
+        extension = os.path.splitext(file_path)[1].lower()
+
+        if extension in ('.csv', '.txt'):
+            with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+                sample = f.read(65536)
+                f.seek(0)
+                try:
+                    dialect = csv.Sniffer().sniff(sample, delimiters=';,\t')
+                except csv.Error:
+                    dialect = csv.excel
+                yield from csv.reader(f, dialect)
+            return
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _map_columns(header: Sequence) -> Dict[str, int]:
+        """
+        Пошук індексів колонок у заголовку.
+
+        Колонки адреси та координат обов'язкові, колонки ідентифікатора соти - ні.
+
+        Returns:
+            Dict[str, int]: Назва поля -> індекс колонки
+        """
+        names = [str(col).strip().lower() if col is not None else '' for col in header]
+        aliases = {**COLUMN_ALIASES, **CELL_COLUMN_ALIASES}
+
+        columns = {}
+        for key, key_aliases in aliases.items():
+            idx = next((i for i, name in enumerate(names) if name in key_aliases), None)
+            if idx is not None:
+                columns[key] = idx
+            elif key in COLUMN_ALIASES:
+                raise ValueError(
+                    f"У файлі реєстру відсутня колонка '{key}'. "
+                    f"Наявні колонки: {', '.join(str(col) for col in header)}"
+                )
+        return columns
+
+    @staticmethod
+    def _prepare_row(row: Sequence, columns: Dict[str, int]) -> Optional[Tuple[tuple, List[tuple]]]:
+        """
+        Нормалізація та розбір одного рядка реєстру.
+
+        Returns:
+            Optional[Tuple[tuple, List[tuple]]]: Запис адреси та записи сот
+                (за хешем адреси і, якщо є, за LAC/CI) або None для невалідного рядка
+        """
+        try:
+            original = row[columns['address']]
+            if original is None or not str(original).strip():
+                return None
+
+            latitude = float(str(row[columns['latitude']]).replace(',', '.'))
+            longitude = float(str(row[columns['longitude']]).replace(',', '.'))
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                return None
+
+        except (IndexError, TypeError, ValueError):
+            return None
+
+        def optional(key):
+            idx = columns.get(key)
+            return row[idx] if idx is not None and idx < len(row) else None
+
+        try:
+            azimuth = float(str(optional('azimuth')).replace(',', '.'))
+        except (TypeError, ValueError):
+            azimuth = None
+        if azimuth is not None and azimuth != azimuth:
+            azimuth = None
+
+        original = str(original).strip()
+        address = normalize_address(original)
+        record = (address, original, latitude, longitude) + parse_address(address)
+
+        cells = [(address_key(address), None, None, None, address, latitude, longitude, azimuth)]
+        key = cell_id_key(optional('operator'), optional('lac'), optional('ci'))
+        if key:
+            cells.append((
+                key,
+                _id_value(optional('operator')),
+                _id_value(optional('lac')),
+                _id_value(optional('ci')),
+                address, latitude, longitude, azimuth
+            ))
+
+        return record, cells
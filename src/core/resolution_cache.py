@@ -0,0 +1,202 @@
+"""
+Модуль постійного кешу зіставлення адрес БС з реєстром.
+"""
+import logging
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from .database import Database
+
+
+def get_registry_version(database: Database) -> int:
+    """
+    Отримання поточної версії реєстру адрес.
+
+    Args:
+        database: Шар доступу до бази даних
+
+    Returns:
+        int: Версія реєстру (0, якщо реєстр ще не імпортувався)
+    """
+    _create_meta_table(database)
+    row = database.query_one(
+        "SELECT value FROM registry_meta WHERE key = 'version'"
+    )
+    return int(row[0]) if row else 0
+
+
+def bump_registry_version(database: Database, minimum: int = 0) -> int:
+    """
+    Збільшення версії реєстру після імпорту.
+
+    Усі записи кешу зіставлення попередніх версій стають недійсними.
+    Виконується в межах транзакції, відкритої кодом, що викликає функцію.
+
+    Args:
+        database: Шар доступу до бази даних
+        minimum: Версія, яку нова версія має перевищити (наприклад, версія
+            до відновлення знімка, вже завантажена кешами в пам'яті)
+
+    Returns:
+        int: Нова версія реєстру
+    """
+    version = max(get_registry_version(database), minimum) + 1
+    database.execute(
+        "INSERT OR REPLACE INTO registry_meta (key, value) VALUES ('version', ?)",
+        (version,)
+    )
+    if database.table_exists('address_resolutions'):
+        database.execute(
+            "DELETE FROM address_resolutions WHERE registry_version < ?",
+            (version,)
+        )
+    logging.info(f"Версію реєстру адрес оновлено до {version}")
+    return version
+
+
+def _create_meta_table(database: Database) -> None:
+    """Створення таблиці метаданих реєстру."""
+    database.execute('''
+        CREATE TABLE IF NOT EXISTS registry_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        )
+    ''')
+
+
+class ResolutionCache:
+    """Кеш результатів зіставлення сирих адрес БС у таблиці addresses.db."""
+
+    COLUMNS = ['raw_address', 'matched_address', 'score', 'latitude', 'longitude']
+
+    def __init__(self, database: Database):
+        """
+        Ініціалізація кешу.
+
+        Args:
+            database: Шар доступу до бази даних реєстру
+        """
+        self.database = database
+        self._create_table()
+        self._version: Optional[int] = None
+        self._entries: Dict[float, Dict[str, tuple]] = {}
+
+    def _create_table(self) -> None:
+        """Створення таблиці кешу та індексів."""
+        # Таблиця попереднього формату (ключ лише за адресою) - кеш, тож перестворюється
+        columns = self.database.query("PRAGMA table_info(address_resolutions)")
+        if columns and sum(column[5] > 0 for column in columns) < 2:
+            self.database.execute("DROP TABLE address_resolutions")
+            logging.info("Кеш зіставлення адрес перестворено з ключем (адреса, поріг)")
+
+        self.database.execute('''
+            CREATE TABLE IF NOT EXISTS address_resolutions (
+                raw_address TEXT NOT NULL,
+                matched_address TEXT,
+                score REAL,
+                latitude REAL,
+                longitude REAL,
+                threshold REAL NOT NULL,
+                registry_version INTEGER NOT NULL,
+                PRIMARY KEY (raw_address, threshold)
+            )
+        ''')
+        self.database.execute(
+            'CREATE INDEX IF NOT EXISTS idx_resolutions_version '
+            'ON address_resolutions (registry_version)'
+        )
+
+    def _load(self, threshold: float) -> Dict[str, tuple]:
+        """
+        Завантаження дійсних записів кешу для порогу в пам'ять.
+
+        Записи кожного порогу читаються один раз; усі пороги скидаються
+        лише при зміні версії реєстру.
+
+        Returns:
+            Dict[str, tuple]: Записи порогу за сирою адресою
+        """
+        version = get_registry_version(self.database)
+        if version != self._version:
+            # Нова версія може бути відновленим знімком без таблиці кешу
+            if self._version is not None:
+                self._create_table()
+            self._entries = {}
+            self._version = version
+        if threshold in self._entries:
+            return self._entries[threshold]
+
+        rows = self.database.query(
+            "SELECT raw_address, matched_address, score, latitude, longitude "
+            "FROM address_resolutions WHERE registry_version = ? AND threshold = ?",
+            (version, threshold)
+        )
+
+        entries = self._entries[threshold] = {row[0]: row for row in rows}
+        logging.info(
+            f"Завантажено кеш зіставлення адрес: {len(rows)} записів (версія {version}, поріг {threshold})"
+        )
+        return entries
+
+    def get(self, raw_address: str, threshold: float) -> Optional[tuple]:
+        """
+        Пошук збереженого результату для сирої адреси.
+
+        Args:
+            raw_address: Адреса БС у вихідному вигляді
+            threshold: Поріг схожості, з яким виконувалось зіставлення
+
+        Returns:
+            Optional[tuple]: (raw_address, matched_address, score, latitude, longitude) або None
+        """
+        return self._load(threshold).get(raw_address)
+
+    def get_many(self, raw_addresses: Iterable[str], threshold: float) -> pd.DataFrame:
+        """
+        Пошук збережених результатів для набору адрес.
+
+        Args:
+            raw_addresses: Адреси БС у вихідному вигляді
+            threshold: Поріг схожості
+
+        Returns:
+            pd.DataFrame: Знайдені записи з колонками COLUMNS
+        """
+        entries = self._load(threshold)
+        hits = [entries[a] for a in raw_addresses if a in entries]
+        return pd.DataFrame(hits, columns=self.COLUMNS)
+
+    def put_many(self, resolved: pd.DataFrame, threshold: float) -> None:
+        """
+        Збереження результатів зіставлення (включно з незнайденими адресами).
+
+        Args:
+            resolved: DataFrame з колонками COLUMNS
+            threshold: Поріг схожості, з яким виконувалось зіставлення
+        """
+        if resolved.empty:
+            return
+
+        entries = self._load(threshold)
+        records = [
+            (
+                row.raw_address,
+                row.matched_address,
+                None if pd.isna(row.score) else float(row.score),
+                None if pd.isna(row.latitude) else float(row.latitude),
+                None if pd.isna(row.longitude) else float(row.longitude)
+            )
+            for row in resolved[self.COLUMNS].itertuples(index=False)
+        ]
+
+        with self.database.transaction():
+            self.database.executemany(
+                "INSERT OR REPLACE INTO address_resolutions "
+                "(raw_address, matched_address, score, latitude, longitude, threshold, registry_version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [record + (threshold, self._version) for record in records]
+            )
+
+        entries.update((record[0], record) for record in records)
+        logging.info(f"Збережено в кеш зіставлення адрес: {len(records)} записів")
@@ -0,0 +1,225 @@
+"""
+Модуль індексу відбитків денних маршрутів (MinHash LSH) для пошуку схожих днів усіх абонентів.
+"""
+import time
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .geo_math import EARTH_RADIUS_M
+from .route_similarity import route_similarity
+from .traffic_dataset import SUBSCRIBER_COLUMN
+
+
+# Просте число Мерсенна для універсального хешування: добуток a * x вміщується в int64
+_PRIME = (1 << 31) - 1
+
+# Множник для згортки рядків смуги в один 64-бітний ключ
+_BAND_MULTIPLIER = np.uint64(1000003)
+
+RESULT_COLUMNS = ['subscriber', 'date', 'points', 'jaccard', 'similarity']
+
+
+class RouteIndex:
+    """
+    Індекс відбитків маршрутів "абонент-день".
+
+    Маршрут кодується множиною клітинок сітки, які він відвідав. MinHash
+    підпис множини розбивається на смуги; дні з однаковим ключем хоча б
+    однієї смуги стають кандидатами. Пошук кандидатів - бінарний пошук по
+    відсортованих ключах смуг, тобто не залежить лінійно від кількості днів.
+    Кандидати переранжуються точною метрикою route_similarity.
+    """
+
+    def __init__(
+            self,
+            df: pd.DataFrame,
+            cell_size: float = 500.0,
+            num_perm: int = 64,
+            bands: int = 16,
+            subscriber_column: str = SUBSCRIBER_COLUMN,
+            seed: int = 1
+    ):
+        """
+        Побудова індексу.
+
+        Args:
+            df: Події з колонками абонента, Дата, Широта, Довгота
+            cell_size: Розмір клітинки сітки (м)
+            num_perm: Кількість хеш-функцій MinHash
+            bands: Кількість смуг LSH (num_perm має ділитися на bands)
+            subscriber_column: Назва колонки абонента
+            seed: Зерно генератора хеш-функцій
+        """
+        if num_perm % bands:
+            raise ValueError(f"Кількість хеш-функцій ({num_perm}) має ділитися на кількість смуг ({bands})")
+        if subscriber_column not in df.columns:
+            raise ValueError(f"У наборі даних відсутня колонка '{subscriber_column}'")
+
+        started = time.perf_counter()
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.int64)
+
+        df = df[df[subscriber_column].notna() & df['Дата'].notna() & df['Широта'].notna() & df['Довгота'].notna()]
+        self._lat_step = np.degrees(cell_size / EARTH_RADIUS_M)
+        self._lon_step = self._lat_step / np.cos(np.radians(float(df['Широта'].mean()) if len(df) else 0.0))
+
+        # Документ - пара (абонент, дата); події впорядковуються за документами
+        subscriber_codes, subscribers = pd.factorize(df[subscriber_column].astype(str), sort=True)
+        date_codes, dates = pd.factorize(df['Дата'].dt.normalize(), sort=True)
+        doc_keys, doc_ids = np.unique(
+            subscriber_codes.astype(np.int64) * max(len(dates), 1) + date_codes,
+            return_inverse=True
+        )
+        doc_ids = doc_ids.reshape(-1)
+        order = np.argsort(doc_ids, kind='stable')
+        self._frame = df.iloc[order].reset_index(drop=True)
+        doc_ids = doc_ids[order]
+        self._offsets = np.searchsorted(doc_ids, np.arange(len(doc_keys) + 1))
+
+        self.docs = pd.DataFrame({
+            'subscriber': np.asarray(subscribers)[doc_keys // max(len(dates), 1)],
+            'date': pd.DatetimeIndex(dates)[doc_keys % max(len(dates), 1)].date,
+            'points': np.diff(self._offsets)
+        })
+
+        tokens = self._tokens(self._frame['Широта'].to_numpy(dtype=float), self._frame['Довгота'].to_numpy(dtype=float))
+        self._signatures = self._minhash(doc_ids, tokens, len(doc_keys))
+
+        # Ключі смуг: для кожної смуги - відсортовані ключі та відповідні документи
+        band_keys = self._band_keys(self._signatures)
+        self._band_order = np.argsort(band_keys, axis=0, kind='stable')
+        self._band_sorted = np.take_along_axis(band_keys, self._band_order, axis=0)
+
+        logging.info(
+            f"Побудовано індекс маршрутів: {len(self.docs)} абонент-днів, {len(df)} подій "
+            f"({num_perm} хешів, {bands} смуг) за {time.perf_counter() - started:.2f} с"
+        )
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _tokens(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Номери клітинок сітки для координат, зведені до діапазону хешування."""
+        rows = np.floor(lat / self._lat_step).astype(np.int64)
+        cols = np.floor(lon / self._lon_step).astype(np.int64)
+        return ((rows << 32) ^ (cols & 0xFFFFFFFF)) % _PRIME
+
+    def _minhash(self, doc_ids: np.ndarray, tokens: np.ndarray, n_docs: int) -> np.ndarray:
+        """
+        MinHash підписи множин клітинок.
+
+        Args:
+            doc_ids: Номер документа кожної події (впорядковані)
+            tokens: Клітинка кожної події
+            n_docs: Кількість документів
+
+        Returns:
+            np.ndarray: Підписи n_docs x num_perm
+        """
+        # Унікальні пари (документ, клітинка) одним ключем: клітинка < _PRIME
+        pairs = np.unique(doc_ids.astype(np.int64) * _PRIME + tokens)
+        pair_docs, pair_tokens = pairs // _PRIME, pairs % _PRIME
+        starts = np.searchsorted(pair_docs, np.arange(n_docs))
+        signatures = np.full((n_docs, len(self._a)), _PRIME, dtype=np.int64)
+        if not len(pairs):
+            return signatures
+
+        # Хеш-функції обробляються частинами, щоб не тримати всю матрицю хешів у пам'яті
+        chunk = max(1, 4_000_000 // len(pairs))
+        for first in range(0, len(self._a), chunk):
+            a, b = self._a[first:first + chunk, None], self._b[first:first + chunk, None]
+            hashes = (a * pair_tokens[None, :] + b) % _PRIME
+            signatures[:, first:first + chunk] = np.minimum.reduceat(hashes, starts, axis=1).T
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Згортка кожної смуги підпису в 64-бітний ключ: docs x bands."""
+        values = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        for row in range(self.rows):
+            keys = keys * _BAND_MULTIPLIER + values[:, :, row]
+        return keys
+
+    def route(self, doc: int) -> pd.DataFrame:
+        """Події документа (маршрут абонента за день)."""
+        return self._frame.iloc[self._offsets[doc]:self._offsets[doc + 1]]
+
+    def find(self, subscriber: str, date) -> Optional[int]:
+        """Номер документа для абонента та дати або None."""
+        match = np.flatnonzero(
+            (self.docs['subscriber'].to_numpy() == str(subscriber)) & (self.docs['date'].to_numpy() == date)
+        )
+        return int(match[0]) if len(match) else None
+
+    def candidates(self, route: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Кандидати LSH для маршруту.
+
+        Args:
+            route: Події маршруту (Широта, Довгота)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (номери документів, оцінка подібності Жаккара)
+        """
+        tokens = np.unique(self._tokens(route['Широта'].to_numpy(dtype=float), route['Довгота'].to_numpy(dtype=float)))
+        if not len(tokens):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        signature = ((self._a[:, None] * tokens[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+        keys = self._band_keys(signature[None, :])[0]
+
+        found = []
+        for band in range(self.bands):
+            column = self._band_sorted[:, band]
+            left = np.searchsorted(column, keys[band], side='left')
+            right = np.searchsorted(column, keys[band], side='right')
+            found.append(self._band_order[left:right, band])
+        docs = np.unique(np.concatenate(found))
+        jaccard = (self._signatures[docs] == signature[None, :]).mean(axis=1)
+        return docs, jaccard
+
+    def query(
+            self,
+            route: pd.DataFrame,
+            max_distance: float,
+            threshold: float = 0.0,
+            limit: Optional[int] = None,
+            exclude: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Схожі абонент-дні для маршруту.
+
+        Args:
+            route: Події маршруту (Широта, Довгота)
+            max_distance: Максимальна відстань між точками для route_similarity (м)
+            threshold: Мінімальна схожість (%)
+            limit: Максимальна кількість результатів (None - усі)
+            exclude: Номер документа, який не включається в результат (сам маршрут)
+
+        Returns:
+            pd.DataFrame: Колонки RESULT_COLUMNS за спаданням схожості
+        """
+        started = time.perf_counter()
+        docs, jaccard = self.candidates(route)
+        keep = docs != exclude
+        docs, jaccard = docs[keep], jaccard[keep]
+
+        # Точне переранжування кандидатів
+        similarity = np.array([route_similarity(route, self.route(doc), max_distance) for doc in docs])
+
+        result = self.docs.iloc[docs].assign(jaccard=jaccard, similarity=similarity)
+        result = result[result['similarity'] >= threshold]
+        result = result.sort_values(['similarity', 'jaccard'], ascending=False, kind='stable')
+        if limit is not None:
+            result = result.head(limit)
+
+        logging.info(
+            f"Пошук у індексі маршрутів: {len(docs)} кандидатів з {len(self.docs)} абонент-днів, "
+            f"{len(result)} схожих за {time.perf_counter() - started:.3f} с"
+        )
+        return result.reset_index(drop=True)[RESULT_COLUMNS]
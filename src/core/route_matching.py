@@ -0,0 +1,219 @@
+"""
+Модуль порівняння денних маршрутів з урахуванням порядку точок (DTW, дискретна відстань Фреше).
+"""
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .geo_math import EARTH_RADIUS_M, event_timestamps
+
+
+METHOD_DTW = 'dtw'
+METHOD_FRECHET = 'frechet'
+METHODS = (METHOD_DTW, METHOD_FRECHET)
+
+
+def _project(lat: np.ndarray, lon: np.ndarray, lat0: float) -> np.ndarray:
+    """Рівнопроміжна проекція навколо широти lat0: координати в метрах."""
+    return np.column_stack((
+        np.radians(lon) * EARTH_RADIUS_M * np.cos(np.radians(lat0)),
+        np.radians(lat) * EARTH_RADIUS_M
+    ))
+
+
+def _cost_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Матриця відстаней між точками двох маршрутів (м)."""
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+
+
+def _box_distance(points: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """Відстані від точок до прямокутника (min_x, min_y, max_x, max_y), 0 - всередині."""
+    dx = np.maximum(np.maximum(box[0] - points[:, 0], points[:, 0] - box[2]), 0.0)
+    dy = np.maximum(np.maximum(box[1] - points[:, 1], points[:, 1] - box[3]), 0.0)
+    return np.hypot(dx, dy)
+
+
+def warping_distance(cost: np.ndarray, method: str = METHOD_DTW, abandon: float = np.inf) -> float:
+    """
+    DTW або дискретна відстань Фреше за матрицею відстаней.
+
+    Динамічне програмування йде по антидіагоналях: клітинки однієї
+    антидіагоналі незалежні й обчислюються одною векторною операцією.
+    Будь-який шлях вирівнювання проходить через одну з двох сусідніх
+    антидіагоналей, тому їх мінімум - нижня межа результату, і обчислення
+    припиняється, щойно вона перевищує abandon.
+
+    Args:
+        cost: Матриця відстаней n x m
+        method: METHOD_DTW (сума відстаней шляху) або METHOD_FRECHET (максимум)
+        abandon: Поріг дострокового припинення
+
+    Returns:
+        float: Відстань (np.inf, якщо обчислення припинено)
+    """
+    n, m = cost.shape
+    combine = np.add if method == METHOD_DTW else np.maximum
+    table = np.full((n + 1, m + 1), np.inf)
+    table[0, 0] = 0.0
+    previous_min = np.inf
+
+    for k in range(2, n + m + 1):
+        i = np.arange(max(1, k - m), min(n, k - 1) + 1)
+        j = k - i
+        best = np.minimum(np.minimum(table[i - 1, j - 1], table[i - 1, j]), table[i, j - 1])
+        values = combine(cost[i - 1, j - 1], best)
+        table[i, j] = values
+
+        current_min = values.min()
+        if min(previous_min, current_min) > abandon:
+            return np.inf
+        previous_min = current_min
+
+    return float(table[n, m])
+
+
+class RouteMatcher:
+    """
+    Пошук схожих денних маршрутів за DTW або дискретною відстанню Фреше.
+
+    Маршрут дня - точки в порядку часу, спроектовані в метри. Для DTW
+    відстань нормується на довжину довшого маршруту (середнє відхилення
+    точки), для Фреше - максимальне відхилення при найкращому вирівнюванні.
+
+    Більшість порівнянь відкидається нижніми межами, від найдешевшої:
+    відстань між обвідними прямокутниками (одразу для всіх днів), відстань
+    точок одного маршруту до прямокутника іншого (межа типу LB_Keogh) та
+    відстань кожної точки до найближчої точки іншого маршруту.
+    """
+
+    def __init__(
+            self,
+            df: pd.DataFrame,
+            method: str = METHOD_DTW,
+            lat_column: str = 'Широта',
+            lon_column: str = 'Довгота'
+    ):
+        """
+        Побудова маршрутів усіх днів.
+
+        Args:
+            df: Події з колонками Дата, Час та координатами
+            method: METHOD_DTW або METHOD_FRECHET
+            lat_column: Назва колонки широти
+            lon_column: Назва колонки довготи
+        """
+        if method not in METHODS:
+            raise ValueError(f"Невідомий метод порівняння маршрутів: {method}")
+        self.method = method
+
+        timestamps = event_timestamps(df['Дата'], df['Час'])
+        valid = ~np.isnat(timestamps) & df[lat_column].notna().to_numpy() & df[lon_column].notna().to_numpy()
+        timestamps = timestamps[valid]
+        lat = df[lat_column].to_numpy(dtype=float)[valid]
+        lon = df[lon_column].to_numpy(dtype=float)[valid]
+
+        order = np.argsort(timestamps, kind='stable')
+        points = _project(lat[order], lon[order], float(lat.mean()) if len(lat) else 0.0)
+        days = timestamps[order].astype('datetime64[D]')
+
+        self.dates: List = []
+        self.routes: List[np.ndarray] = []
+        boundaries = np.flatnonzero(days[1:] != days[:-1]) + 1
+        for route, day in zip(np.split(points, boundaries), days[np.r_[0, boundaries]] if len(days) else []):
+            self.dates.append(pd.Timestamp(day).date())
+            self.routes.append(route)
+
+        self._index: Dict = {date: i for i, date in enumerate(self.dates)}
+        self._boxes = np.array(
+            [np.r_[route.min(axis=0), route.max(axis=0)] for route in self.routes]
+        ).reshape(-1, 4)
+        self._lengths = np.array([len(route) for route in self.routes])
+
+    def distance(self, date1, date2) -> float:
+        """Точна відстань між маршрутами двох дат (м)."""
+        a, b = self.routes[self._index[date1]], self.routes[self._index[date2]]
+        return self._normalize(warping_distance(_cost_matrix(a, b), self.method), len(a), len(b))
+
+    def _normalize(self, value: float, n: int, m: int) -> float:
+        """Нормування DTW на довжину довшого маршруту."""
+        return value / max(n, m) if self.method == METHOD_DTW else value
+
+    def query(
+            self,
+            date,
+            max_distance: float,
+            limit: Optional[int] = None
+    ) -> Tuple[List[Tuple[object, float]], Dict[str, int]]:
+        """
+        Дні з маршрутом, відстань до якого не перевищує max_distance.
+
+        Args:
+            date: Базова дата
+            max_distance: Максимальна відстань між маршрутами (м)
+            limit: Максимальна кількість днів (None - усі)
+
+        Returns:
+            Tuple[List[Tuple[object, float]], Dict[str, int]]: (дата, відстань)
+                за зростанням відстані та статистика відкинутих порівнянь
+        """
+        started = time.perf_counter()
+        if date not in self._index:
+            return [], {}
+        base = self._index[date]
+        route = self.routes[base]
+        box = self._boxes[base]
+        stats = {'candidates': len(self.routes) - 1, 'box': 0, 'envelope': 0, 'nearest': 0, 'abandoned': 0}
+
+        # 1. Відстань між прямокутниками - одна векторна операція для всіх днів
+        gap_x = np.maximum(np.maximum(self._boxes[:, 0] - box[2], box[0] - self._boxes[:, 2]), 0.0)
+        gap_y = np.maximum(np.maximum(self._boxes[:, 1] - box[3], box[1] - self._boxes[:, 3]), 0.0)
+        candidates = np.flatnonzero(np.hypot(gap_x, gap_y) <= max_distance)
+        candidates = candidates[candidates != base]
+        stats['box'] = stats['candidates'] - len(candidates)
+
+        results = []
+        for other in candidates:
+            other_route = self.routes[other]
+            n, m = len(route), len(other_route)
+            scale = max(n, m) if self.method == METHOD_DTW else 1
+            reduce = np.sum if self.method == METHOD_DTW else np.max
+
+            # 2. Кожна точка має бути зіставлена хоча б раз - не ближче, ніж до прямокутника іншого маршруту
+            envelope = max(
+                reduce(_box_distance(route, self._boxes[other])),
+                reduce(_box_distance(other_route, box))
+            )
+            if envelope > max_distance * scale:
+                stats['envelope'] += 1
+                continue
+
+            # 3. Те саме з відстанню до найближчої точки замість прямокутника
+            cost = _cost_matrix(route, other_route)
+            nearest = max(reduce(cost.min(axis=1)), reduce(cost.min(axis=0)))
+            if nearest > max_distance * scale:
+                stats['nearest'] += 1
+                continue
+
+            value = warping_distance(cost, self.method, abandon=max_distance * scale)
+            if not np.isfinite(value):
+                stats['abandoned'] += 1
+                continue
+
+            value = self._normalize(value, n, m)
+            if value <= max_distance:
+                results.append((self.dates[other], value))
+
+        results.sort(key=lambda item: item[1])
+        if limit is not None:
+            results = results[:limit]
+
+        logging.info(
+            f"Пошук маршрутів ({self.method}) для {date}: {len(results)} з {stats['candidates']} днів, "
+            f"відкинуто межами: прямокутник {stats['box']}, обвідна {stats['envelope']}, "
+            f"найближчі точки {stats['nearest']}, достроково {stats['abandoned']} "
+            f"за {time.perf_counter() - started:.2f} с"
+        )
+        return results, stats
@@ -0,0 +1,114 @@
+"""
+Модуль порівняння денних маршрутів абонента.
+"""
+import time
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .geo_math import neighbor_pairs
+
+
+def route_similarity(route1: pd.DataFrame, route2: pd.DataFrame, max_distance: float) -> float:
+    """
+    Схожість маршруту route1 на маршрут route2.
+
+    Args:
+        route1: Перший маршрут (колонки Широта, Довгота)
+        route2: Другий маршрут (колонки Широта, Довгота)
+        max_distance: Максимальна відстань між точками (в метрах)
+
+    Returns:
+        float: Відсоток точок route1, поруч з якими є точка route2 (0-100)
+    """
+    if route1.empty:
+        return 0.0
+    first, _, _ = neighbor_pairs(
+        route1['Широта'], route1['Довгота'],
+        route2['Широта'], route2['Довгота'],
+        max_distance
+    )
+    return len(np.unique(first)) / len(route1) * 100
+
+
+def similarity_matrix(
+        df: pd.DataFrame,
+        max_distance: float,
+        lat_column: str = 'Широта',
+        lon_column: str = 'Довгота'
+) -> pd.DataFrame:
+    """
+    Матриця схожості всіх денних маршрутів між собою.
+
+    Значення [i, j] - відсоток точок маршруту дня i, поруч з якими (не далі
+    max_distance) є хоча б одна точка маршруту дня j; матриця несиметрична.
+
+    Точки рахуються по унікальних координатах: пари близьких координат
+    знаходяться один раз для всього набору, після чого матриця - це
+    добуток "кількість точок дня в координаті" на "координата поруч з днем".
+
+    Args:
+        df: Події з колонками Дата та координатами
+        max_distance: Максимальна відстань між точками (в метрах)
+        lat_column: Назва колонки широти
+        lon_column: Назва колонки довготи
+
+    Returns:
+        pd.DataFrame: Квадратна матриця (0-100), індекс і колонки - дати
+    """
+    started = time.perf_counter()
+    df = df[df['Дата'].notna() & df[lat_column].notna() & df[lon_column].notna()]
+    days, dates = pd.factorize(df['Дата'].dt.date, sort=True)
+    if not len(dates):
+        return pd.DataFrame(dtype=float)
+
+    coords = np.column_stack((df[lat_column].to_numpy(dtype=float), df[lon_column].to_numpy(dtype=float)))
+    unique, inverse = np.unique(coords, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # Кількість точок кожного дня в кожній унікальній координаті
+    counts = np.zeros((len(dates), len(unique)))
+    np.add.at(counts, (days, inverse), 1)
+    present = counts > 0
+
+    # Координата u "поруч з днем j", якщо день j має точку в межах max_distance від u
+    near_u, near_v, _ = neighbor_pairs(unique[:, 0], unique[:, 1], unique[:, 0], unique[:, 1], max_distance)
+    reach = np.zeros((len(unique), len(dates)))
+    np.add.at(reach, near_u, present[:, near_v].T)
+
+    matrix = counts @ (reach > 0) / counts.sum(axis=1, keepdims=True) * 100
+
+    logging.info(
+        f"Матриця схожості маршрутів: {len(dates)} днів, {len(unique)} унікальних точок "
+        f"за {time.perf_counter() - started:.2f} с"
+    )
+    return pd.DataFrame(matrix, index=list(dates), columns=list(dates))
+
+
+def most_similar_days(
+        matrix: pd.DataFrame,
+        date,
+        threshold: float = 0.0,
+        limit: Optional[int] = None
+) -> List[Tuple[object, float]]:
+    """
+    Дні, найбільш схожі на заданий, за матрицею similarity_matrix.
+
+    Args:
+        matrix: Матриця схожості
+        date: Базова дата
+        threshold: Мінімальна схожість (%)
+        limit: Максимальна кількість днів (None - усі)
+
+    Returns:
+        List[Tuple[object, float]]: (дата, схожість) за спаданням схожості
+    """
+    if date not in matrix.index:
+        return []
+    row = matrix.loc[date].drop(date)
+    row = row[row >= threshold].sort_values(ascending=False, kind='stable')
+    if limit is not None:
+        row = row.head(limit)
+    return list(row.items())
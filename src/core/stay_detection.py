@@ -0,0 +1,261 @@
+"""
+Модуль виявлення місць перебування (stay points) за траєкторією абонента.
+"""
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .day_period import DayWindow
+from .geo_math import event_timestamps, haversine
+
+
+STAY_COLUMNS = ['start', 'end', 'latitude', 'longitude', 'dwell', 'events', 'place', 'bs']
+
+
+class StayPointDetector:
+    """
+    Виявлення перебувань за порогом відстані та мінімальною тривалістю.
+
+    Унікальні позиції БС спочатку об'єднуються в місця: кожне місце - це
+    найчастіша ще не розподілена БС і всі БС у радіусі від неї. Тому
+    перемикання телефону між сусідніми вежами не розриває перебування.
+    Далі серії подій з одним місцем виділяються одним векторним проходом.
+    Денні та нічні перебування (за часом початку) можуть мати окремі
+    мінімальні тривалості.
+    """
+
+    def __init__(
+            self,
+            radius: float = 500.0,
+            min_dwell: float = 30.0,
+            max_gap: Optional[float] = None,
+            min_night_dwell: Optional[float] = None,
+            window: Optional[DayWindow] = None
+    ):
+        """
+        Ініціалізація детектора.
+
+        Args:
+            radius: Поріг відстані між БС одного місця (м)
+            min_dwell: Мінімальна тривалість (денного) перебування (хв)
+            max_gap: Максимальна перерва між подіями в межах перебування (хв),
+                None - без обмеження
+            min_night_dwell: Мінімальна тривалість нічного перебування (хв),
+                None - як min_dwell
+            window: Денне вікно для поділу перебувань на денні та нічні
+                (None - типове DayWindow)
+        """
+        self.radius = radius
+        self.min_dwell = min_dwell
+        self.max_gap = max_gap
+        self.min_night_dwell = min_night_dwell
+        self.window = window or DayWindow()
+
+    def detect(
+            self,
+            df: pd.DataFrame,
+            lat_column: str = 'Широта',
+            lon_column: str = 'Довгота',
+            address_column: str = 'Адреса БС'
+    ) -> pd.DataFrame:
+        """
+        Побудова таблиці перебувань для однієї траєкторії.
+
+        Args:
+            df: DataFrame з колонками Дата, Час, координатами та адресою БС
+            lat_column: Назва колонки широти
+            lon_column: Назва колонки довготи
+            address_column: Назва колонки адреси БС
+
+        Returns:
+            pd.DataFrame: Колонки STAY_COLUMNS (start, end - мітки часу, dwell - хв,
+                bs - кортеж адрес БС перебування), впорядковані за часом
+        """
+        timestamps = event_timestamps(df['Дата'], df['Час'])
+        valid = ~np.isnat(timestamps) & df[lat_column].notna().to_numpy() & df[lon_column].notna().to_numpy()
+        if not valid.any():
+            return pd.DataFrame(columns=STAY_COLUMNS)
+
+        order = np.argsort(timestamps[valid], kind='stable')
+        timestamps = timestamps[valid][order]
+        lat = df[lat_column].to_numpy(dtype=float)[valid][order]
+        lon = df[lon_column].to_numpy(dtype=float)[valid][order]
+        addresses = (
+            df[address_column].to_numpy()[valid][order]
+            if address_column in df.columns else np.full(len(order), None, dtype=object)
+        )
+
+        places = self._places(lat, lon)
+
+        # Нове перебування - при зміні місця або завеликій перерві між подіями
+        new_run = np.ones(len(places), dtype=bool)
+        new_run[1:] = places[1:] != places[:-1]
+        if self.max_gap is not None:
+            gaps = np.diff(timestamps) / np.timedelta64(1, 'm')
+            new_run[1:] |= gaps > self.max_gap
+
+        run = np.cumsum(new_run) - 1
+        starts = np.flatnonzero(new_run)
+        ends = np.append(starts[1:], len(run))[:len(starts)] - 1
+
+        dwell = (timestamps[ends] - timestamps[starts]) / np.timedelta64(1, 'm')
+        events = ends - starts + 1
+        if self.min_night_dwell is None:
+            keep = dwell >= self.min_dwell
+        else:
+            is_day = self.window.is_day(timestamps[starts])
+            keep = dwell >= np.where(is_day, self.min_dwell, self.min_night_dwell)
+
+        stays = pd.DataFrame({
+            'start': timestamps[starts],
+            'end': timestamps[ends],
+            'latitude': np.bincount(run, weights=lat) / events,
+            'longitude': np.bincount(run, weights=lon) / events,
+            'dwell': dwell,
+            'events': events,
+            'place': places[starts]
+        })[keep]
+
+        kept = np.flatnonzero(keep)
+        in_kept = np.isin(run, kept)
+        bs = (
+            pd.Series(addresses[in_kept])
+            .groupby(run[in_kept])
+            .agg(lambda values: tuple(sorted(set(v for v in values if isinstance(v, str)))))
+        )
+        stays['bs'] = bs.reindex(kept).to_numpy() if len(kept) else []
+
+        logging.info(
+            f"Виявлено перебувань: {len(stays)} з {len(starts)} серій "
+            f"(радіус {self.radius} м, мін. {self.min_dwell} хв"
+            f"{'' if self.min_night_dwell is None else f', вночі {self.min_night_dwell} хв'})"
+        )
+        return stays.reset_index(drop=True)
+
+    def _places(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """
+        Розподіл подій по місцях.
+
+        Args:
+            lat: Широти подій
+            lon: Довготи подій
+
+        Returns:
+            np.ndarray: Номер місця для кожної події
+        """
+        coords = np.column_stack((lat, lon))
+        unique, inverse, counts = np.unique(coords, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+
+        labels = np.full(len(unique), -1, dtype=np.int64)
+        label = 0
+        for leader in np.argsort(-counts, kind='stable'):
+            if labels[leader] >= 0:
+                continue
+            free = labels < 0
+            near = haversine(unique[leader, 0], unique[leader, 1], unique[free, 0], unique[free, 1]) <= self.radius
+            labels[np.flatnonzero(free)[near]] = label
+            label += 1
+
+        return labels[inverse]
+
+
+def summarize_places(stays: pd.DataFrame, window: Optional[DayWindow] = None) -> pd.DataFrame:
+    """
+    Зведення перебувань по місцях.
+
+    Кожне місце характеризується центром своїх подій, кількістю денних
+    і нічних перебувань (за часом початку), сумарною тривалістю та
+    найчастішою БС.
+
+    Args:
+        stays: Таблиця перебувань StayPointDetector.detect
+        window: Денне вікно (None - типове DayWindow)
+
+    Returns:
+        pd.DataFrame: Індекс place (у порядку першого перебування), колонки
+            latitude, longitude, day_count, night_count, total_duration, address
+    """
+    columns = ['latitude', 'longitude', 'day_count', 'night_count', 'total_duration', 'address']
+    if stays.empty:
+        return pd.DataFrame(columns=columns)
+
+    is_day = (window or DayWindow()).is_day(stays['start'].to_numpy())
+    places = pd.DataFrame({
+        'place': stays['place'],
+        'latitude': stays['latitude'] * stays['events'],
+        'longitude': stays['longitude'] * stays['events'],
+        'weight': stays['events'],
+        'day_count': is_day.astype(int),
+        'night_count': (~is_day).astype(int),
+        'total_duration': stays['dwell']
+    }).groupby('place', sort=False).sum()
+
+    places['latitude'] = (places['latitude'] / places['weight']).round(6)
+    places['longitude'] = (places['longitude'] / places['weight']).round(6)
+
+    # Адреса місця - БС, що найчастіше входить до його перебувань
+    addresses = stays[['place', 'bs']].explode('bs').dropna().groupby('place')['bs'].agg(
+        lambda values: values.value_counts().index[0]
+    )
+    places['address'] = addresses.reindex(places.index)
+
+    return places[columns]
+
+
+def select_home_work(places: pd.DataFrame) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Вибір місць дому та роботи.
+
+    Дім - місце з найбільшою кількістю нічних перебувань (за рівності - з більшою
+    тривалістю), робота - серед решти місць за кількістю денних перебувань.
+
+    Args:
+        places: Зведення summarize_places
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: (місце дому, місце роботи) або None
+    """
+    home = max(
+        places.index,
+        key=lambda p: (places.at[p, 'night_count'], places.at[p, 'total_duration']),
+        default=None
+    )
+    work = max(
+        (p for p in places.index if p != home),
+        key=lambda p: (places.at[p, 'day_count'], places.at[p, 'total_duration']),
+        default=None
+    )
+    return home, work
+
+
+def infer_home_work(stays: pd.DataFrame, window: Optional[DayWindow] = None) -> Tuple[Tuple, Tuple]:
+    """
+    Визначення дому та роботи за таблицею перебувань.
+
+    Результат має ту саму форму, що й MovementTab.analyze_locations.
+
+    Args:
+        stays: Таблиця перебувань StayPointDetector.detect
+        window: Денне вікно (None - типове DayWindow)
+
+    Returns:
+        Tuple[Tuple, Tuple]: (дім, робота) як ((широта, довгота), характеристики)
+    """
+    places = summarize_places(stays, window)
+    home, work = select_home_work(places)
+
+    def location(place, count_key):
+        if place is None:
+            return None, {'address': None, count_key: 0, 'total_duration': 0}
+        row = places.loc[place]
+        return (float(row['latitude']), float(row['longitude'])), {
+            'day_count': int(row['day_count']),
+            'night_count': int(row['night_count']),
+            'total_duration': float(row['total_duration']),
+            'address': row['address'] if isinstance(row['address'], str) else None
+        }
+
+    return location(home, 'night_count'), location(work, 'day_count')
@@ -0,0 +1,147 @@
+"""
+Модуль індексу абонентів набору даних трафіку.
+"""
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+SUMMARY_COLUMNS = ['subscriber', 'events', 'first_date', 'last_date', 'days', 'files']
+
+
+def subscriber_codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Коди абонентів за відсортованим переліком номерів.
+
+    Номери нормалізуються (рядок без пробілів по краях) по унікальних
+    значеннях колонки, а не по кожному рядку.
+
+    Args:
+        values: Колонка абонента
+
+    Returns:
+        Tuple[np.ndarray, pd.Index]: (код кожного рядка, -1 для порожніх номерів;
+            відсортовані номери)
+    """
+    raw_codes, raw_numbers = pd.factorize(values)
+    numbers = pd.Index(raw_numbers.astype(str)).str.strip()
+    usable = (numbers != '') & (numbers.str.lower() != 'nan')
+    number_codes, subscribers = pd.factorize(numbers.where(usable), sort=True)
+    return np.append(number_codes, -1)[raw_codes], subscribers
+
+
+class SubscriberIndex:
+    """
+    Індекс "абонент -> події" для об'єднаного набору даних.
+
+    Номери рядків набору впорядковуються за абонентом один раз (стабільно,
+    тобто зі збереженням вихідного порядку подій абонента), і події
+    абонента займають неперервний діапазон [offsets[k], offsets[k + 1])
+    цього впорядкування. Пошук абонента - словник, вибірка його подій -
+    O(k) від кількості подій абонента без проходу по всьому набору.
+    """
+
+    def __init__(
+            self,
+            frame: pd.DataFrame,
+            subscriber_column: str,
+            source_column: Optional[str] = None
+    ):
+        """
+        Побудова індексу.
+
+        Args:
+            frame: Набір даних з колонками абонента та Дата
+            subscriber_column: Назва колонки абонента
+            source_column: Назва колонки файлу-джерела (None - без переліку файлів)
+        """
+        started = time.perf_counter()
+        all_codes, subscribers = subscriber_codes(
+            frame[subscriber_column] if subscriber_column in frame.columns else pd.Series(np.nan, index=frame.index)
+        )
+        valid = all_codes >= 0
+        codes = all_codes[valid]
+
+        order = np.argsort(codes, kind='stable')
+        self._rows = np.flatnonzero(valid)[order]
+        self._offsets = np.searchsorted(codes[order], np.arange(len(subscribers) + 1))
+        self._positions: Dict[str, int] = {number: k for k, number in enumerate(subscribers)}
+
+        # Зведення по абонентах: межі дат - групуванням за кодом абонента, кількість днів -
+        # за унікальними парами (абонент, дата), зведеними в один ключ
+        dates = frame['Дата'].to_numpy()[valid]
+        span = pd.DataFrame({'code': codes, 'date': dates}).groupby('code')['date'].agg(['min', 'max'])
+        span = span.reindex(range(len(subscribers)))
+        day_codes, day_values = pd.factorize(dates.astype('datetime64[D]'))
+        n_days = max(len(day_values), 1)
+        seen = day_codes >= 0
+        days = np.bincount(
+            pd.unique(codes[seen].astype(np.int64) * n_days + day_codes[seen]) // n_days,
+            minlength=len(subscribers)
+        )
+        self.summary = pd.DataFrame({
+            'subscriber': np.asarray(subscribers, dtype=object),
+            'events': np.diff(self._offsets),
+            'first_date': span['min'].to_numpy(),
+            'last_date': span['max'].to_numpy(),
+            'days': days,
+            'files': self._files(frame, source_column, codes, valid, len(subscribers))
+        })
+
+        logging.info(
+            f"Побудовано індекс абонентів: {len(subscribers)} абонентів, {int(valid.sum())} подій "
+            f"за {time.perf_counter() - started:.2f} с"
+        )
+
+    @staticmethod
+    def _files(
+            frame: pd.DataFrame,
+            source_column: Optional[str],
+            codes: np.ndarray,
+            valid: np.ndarray,
+            n_subscribers: int
+    ) -> List[List[str]]:
+        """Файли-джерела кожного абонента (унікальні пари абонент-файл)."""
+        files: List[List[str]] = [[] for _ in range(n_subscribers)]
+        if not source_column or source_column not in frame.columns:
+            return files
+        file_codes, file_names = pd.factorize(frame[source_column].astype(str).to_numpy()[valid], sort=True)
+        n_files = max(len(file_names), 1)
+        pairs = np.sort(pd.unique(codes.astype(np.int64) * n_files + file_codes))
+        for code, file in zip(pairs // n_files, pairs % n_files):
+            files[code].append(file_names[file])
+        return files
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, subscriber) -> bool:
+        return str(subscriber).strip() in self._positions
+
+    @property
+    def subscribers(self) -> List[str]:
+        """Відсортовані номери абонентів."""
+        return self.summary['subscriber'].tolist()
+
+    def rows(self, subscriber) -> np.ndarray:
+        """
+        Номери рядків набору з подіями абонента.
+
+        Args:
+            subscriber: Номер абонента
+
+        Returns:
+            np.ndarray: Позиції рядків у вихідному порядку (порожній масив для невідомого абонента)
+        """
+        k = self._positions.get(str(subscriber).strip())
+        if k is None:
+            return np.empty(0, dtype=np.int64)
+        return self._rows[self._offsets[k]:self._offsets[k + 1]]
+
+    def info(self, subscriber) -> Optional[Dict[str, Any]]:
+        """Рядок зведення SUMMARY_COLUMNS для абонента або None."""
+        k = self._positions.get(str(subscriber).strip())
+        return None if k is None else self.summary.iloc[k].to_dict()
@@ -0,0 +1,330 @@
+"""
+Модуль набору даних трафіку для аналізу переміщень.
+"""
+import os
+import logging
+from datetime import datetime, time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .day_period import DayWindow, minutes_of_day
+from .geo_math import event_timestamps
+from .kinematics import DEFAULT_JUMP_TOLERANCE, DEFAULT_MAX_SPEED, KINEMATIC_COLUMNS, kinematics
+from .mobility_cube import mobility_cube
+from .subscriber_index import SubscriberIndex, subscriber_codes
+
+
+# Можливі назви колонок файлів трафіку -> назви, з якими працює аналіз переміщень
+COLUMN_MAPPING = {
+    # Широта
+    'Latitude': 'Широта',
+    'lat': 'Широта',
+    'latitude': 'Широта',
+    'LAT': 'Широта',
+    'широта': 'Широта',
+    'Lat': 'Широта',
+    'latitude_degrees': 'Широта',
+
+    # Довгота
+    'Longitude': 'Довгота',
+    'lon': 'Довгота',
+    'longitude': 'Довгота',
+    'LON': 'Довгота',
+    'довгота': 'Довгота',
+    'Long': 'Довгота',
+    'lng': 'Довгота',
+    'Долгота': 'Довгота',
+    'longitude_degrees': 'Довгота',
+
+    # Дата
+    'Date': 'Дата',
+    'date': 'Дата',
+    'DATE': 'Дата',
+    'дата': 'Дата',
+
+    # Час
+    'Time': 'Час',
+    'time': 'Час',
+    'TIME': 'Час',
+    'час': 'Час',
+
+    # Адреса
+    'BS Address': 'Адреса БС',
+    'Address': 'Адреса БС',
+    'address': 'Адреса БС',
+    'BS_Address': 'Адреса БС',
+    'адреса': 'Адреса БС',
+    'адреса бс': 'Адреса БС',
+
+    # Азимут
+    'Azimuth': 'Азимут',
+    'azimuth': 'Азимут',
+    'AZIMUTH': 'Азимут',
+    'азимут': 'Азимут',
+    'Аз.': 'Азимут',
+
+    # Абонент
+    'Абонент': 'Абонент А',
+    'Subscriber': 'Абонент А',
+    'MSISDN': 'Абонент А'
+}
+
+REQUIRED_COLUMNS = ['Дата', 'Час', 'Широта', 'Довгота', 'Адреса БС']
+
+SUBSCRIBER_COLUMN = 'Абонент А'
+SOURCE_COLUMN = 'Файл'
+PERIOD_COLUMN = 'Період'
+
+
+def parse_time(value) -> Optional[time]:
+    """
+    Перетворення часу з рядка в об'єкт time.
+
+    Args:
+        value: Час у форматі рядка 'HH:MM:SS' або 'HH:MM' (або вже time)
+
+    Returns:
+        Optional[time]: Об'єкт time або None при помилці
+    """
+    if isinstance(value, time):
+        return value
+    try:
+        return datetime.strptime(str(value), '%H:%M:%S').time()
+    except ValueError:
+        try:
+            return datetime.strptime(str(value), '%H:%M').time()
+        except ValueError:
+            logging.error(f"Неможливо розпізнати формат часу: {value}")
+            return None
+
+
+def parse_times(values: pd.Series) -> pd.Series:
+    """Розбір колонки часу: кожне унікальне значення розбирається один раз."""
+    unique = pd.unique(values)
+    return values.map({value: parse_time(value) for value in unique})
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Перейменування колонок файлу трафіку на єдині назви (COLUMN_MAPPING).
+
+    Args:
+        df: Сирий DataFrame з файлу трафіку
+
+    Returns:
+        pd.DataFrame: DataFrame з перейменованими колонками
+    """
+    # Створюємо словник для перейменування, враховуючи тільки існуючі колонки
+    rename_dict = {}
+    for old_name, new_name in COLUMN_MAPPING.items():
+        if new_name in df.columns or new_name in rename_dict.values():
+            continue
+        matching_cols = [col for col in df.columns if str(col).strip().lower() == old_name.strip().lower()]
+        if matching_cols:
+            rename_dict[matching_cols[0]] = new_name
+    return df.rename(columns=rename_dict)
+
+
+def prepare_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """
+    Приведення колонок файлу трафіку до єдиних назв і типів.
+
+    Args:
+        df: Сирий DataFrame з файлу трафіку
+
+    Returns:
+        Tuple[pd.DataFrame, int]: (підготовлений DataFrame, кількість відкинутих
+            рядків з невалідними координатами)
+    """
+    df = normalize_columns(df)
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(
+            f"У файлі відсутні необхідні колонки: {', '.join(missing_columns)}\n"
+            f"Наявні колонки: {', '.join(map(str, df.columns))}\n"
+            f"Очікувані назви колонок: {', '.join(REQUIRED_COLUMNS)}"
+        )
+
+    try:
+        df['Дата'] = pd.to_datetime(df['Дата'], format='%d.%m.%Y', dayfirst=True)
+    except Exception as e:
+        logging.error(f"Помилка конвертації дати: {e}")
+        df['Дата'] = pd.to_datetime(df['Дата'], errors='coerce', dayfirst=True)
+
+    df['Час'] = parse_times(df['Час'])
+
+    for column in ('Широта', 'Довгота', 'Азимут'):
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    if SUBSCRIBER_COLUMN in df.columns:
+        df[SUBSCRIBER_COLUMN] = df[SUBSCRIBER_COLUMN].astype(str).str.strip()
+
+    invalid = df['Широта'].isna() | df['Довгота'].isna()
+    return df[~invalid], int(invalid.sum())
+
+
+class TrafficDataset:
+    """Об'єднаний набір даних трафіку з кількох файлів."""
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Ініціалізація набору даних.
+
+        Args:
+            frame: Підготовлений DataFrame (див. prepare_frame)
+        """
+        self.frame = frame.reset_index(drop=True)
+        self._minutes: Optional[np.ndarray] = None
+        self._window: Optional[DayWindow] = None
+        self._index: Optional[SubscriberIndex] = None
+        self._kinematics: Optional[Tuple[float, float]] = None
+        self._mobility: Optional[pd.DataFrame] = None
+        self.listed_subscribers: List[str] = []
+
+    @classmethod
+    def from_files(cls, files: Iterable[str]) -> 'TrafficDataset':
+        """
+        Завантаження та об'єднання файлів трафіку.
+
+        Файли, які не вдалося прочитати, пропускаються з записом у лог.
+        Перелік номерів (listed_subscribers) збирається з колонки абонента
+        всіх прочитаних файлів до відкидання рядків без координат, тож
+        включає і номери, для яких немає жодної події з координатами.
+
+        Args:
+            files: Шляхи до файлів Excel
+
+        Returns:
+            TrafficDataset: Набір даних з колонкою джерела SOURCE_COLUMN
+        """
+        frames: List[pd.DataFrame] = []
+        listed: List[pd.Series] = []
+        for file in files:
+            try:
+                raw = normalize_columns(pd.read_excel(file))
+                if SUBSCRIBER_COLUMN in raw.columns:
+                    listed.append(raw[SUBSCRIBER_COLUMN])
+                else:
+                    logging.warning(f"Не знайдено колонку '{SUBSCRIBER_COLUMN}' у файлі {file}")
+                df, dropped = prepare_frame(raw)
+                df[SOURCE_COLUMN] = os.path.basename(file)
+                frames.append(df)
+                if dropped:
+                    logging.warning(f"У файлі {file} відкинуто {dropped} рядків з невалідними координатами")
+            except Exception as e:
+                logging.error(f"Помилка читання файлу {file}: {e}")
+
+        if not frames:
+            raise ValueError("Не вдалося прочитати жодного файлу трафіку")
+
+        dataset = cls(pd.concat(frames, ignore_index=True))
+        if listed:
+            dataset.listed_subscribers = subscriber_codes(pd.concat(listed, ignore_index=True))[1].tolist()
+
+        # Індекс абонентів будується одразу під час завантаження, а не при першому запиті
+        index = dataset.index
+        logging.info(
+            f"Завантажено набір даних: {len(dataset.frame)} подій з {len(frames)} файлів, "
+            f"{len(index)} абонентів з подіями, {len(dataset.listed_subscribers)} номерів у файлах"
+        )
+        return dataset
+
+    @property
+    def index(self) -> SubscriberIndex:
+        """Індекс абонентів (будується один раз на набір; для from_files - під час завантаження)."""
+        if self._index is None:
+            self._index = SubscriberIndex(self.frame, SUBSCRIBER_COLUMN, SOURCE_COLUMN)
+        return self._index
+
+    def events(self, subscriber: str) -> pd.DataFrame:
+        """
+        Події одного абонента.
+
+        Args:
+            subscriber: Номер абонента
+
+        Returns:
+            pd.DataFrame: Рядки набору абонента у вихідному порядку (порожній для невідомого абонента)
+        """
+        return self.frame.iloc[self.index.rows(subscriber)]
+
+    def subscribers(self) -> List[str]:
+        """
+        Перелік абонентів набору.
+
+        Returns:
+            List[str]: Відсортовані номери абонентів
+        """
+        return self.index.subscribers
+
+    def stats(self) -> Dict[str, int]:
+        """Основні розміри набору: кількість подій, абонентів та днів."""
+        return {
+            'events': len(self.frame),
+            'subscribers': len(self.subscribers()),
+            'days': int(self.frame['Дата'].dt.date.nunique())
+        }
+
+    def minutes(self) -> np.ndarray:
+        """Хвилина доби кожної події (обчислюється один раз на набір)."""
+        if self._minutes is None:
+            self._minutes = minutes_of_day(event_timestamps(self.frame['Дата'], self.frame['Час']))
+        return self._minutes
+
+    def apply_window(self, window: DayWindow) -> pd.DataFrame:
+        """
+        Колонка періоду доби (PERIOD_COLUMN) для денного вікна.
+
+        Колонка перераховується лише при зміні вікна, і лише з кешованих
+        хвилин доби - без повторного читання та розбору файлів.
+
+        Args:
+            window: Денне вікно
+
+        Returns:
+            pd.DataFrame: Набір даних з колонкою PERIOD_COLUMN
+        """
+        if window != self._window or PERIOD_COLUMN not in self.frame.columns:
+            self.frame[PERIOD_COLUMN] = window.labels(window.is_day_minutes(self.minutes()))
+            self._window = window
+        return self.frame
+
+    def apply_kinematics(
+            self,
+            max_speed: float = DEFAULT_MAX_SPEED,
+            tolerance: float = DEFAULT_JUMP_TOLERANCE
+    ) -> pd.DataFrame:
+        """
+        Колонки кінематики переміщень (KINEMATIC_COLUMNS) для потоку подій кожного абонента.
+
+        Колонки обчислюються один раз і перераховуються лише при зміні порогів.
+
+        Args:
+            max_speed: Максимальна правдоподібна швидкість (км/год)
+            tolerance: Допуск відстані для стрибків (м)
+
+        Returns:
+            pd.DataFrame: Набір даних з колонками KINEMATIC_COLUMNS
+        """
+        if (max_speed, tolerance) != self._kinematics or KINEMATIC_COLUMNS[0] not in self.frame.columns:
+            self.frame[KINEMATIC_COLUMNS] = kinematics(self.frame, max_speed, tolerance, SUBSCRIBER_COLUMN)
+            self._kinematics = (max_speed, tolerance)
+        return self.frame
+
+    def mobility(self) -> pd.DataFrame:
+        """
+        Куб мобільності "абонент x день" (див. mobility_cube).
+
+        Обчислюється один раз на набір; подальше ранжування та фільтрація
+        абонентів - операції над готовою таблицею.
+
+        Returns:
+            pd.DataFrame: Колонки CUBE_COLUMNS
+        """
+        if self._mobility is None:
+            self._mobility = mobility_cube(self.frame, SUBSCRIBER_COLUMN)
+        return self._mobility
@@ -0,0 +1,238 @@
+"""
+Модуль індексу послідовностей районів (траєкторій) абонент-днів.
+"""
+import time
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .traffic_dataset import SUBSCRIBER_COLUMN
+
+
+DOC_COLUMNS = ['subscriber', 'date', 'length']
+FOLLOWER_COLUMNS = ['subscriber', 'days', 'first_date', 'last_date']
+SUBPATH_COLUMNS = ['path', 'subscribers', 'days']
+
+
+class TrajectoryIndex:
+    """
+    Інвертований індекс траєкторій "абонент-день".
+
+    Траєкторія дня - послідовність районів у порядку часу без повторів
+    підряд. Усі траєкторії зберігаються одним масивом кодів районів з
+    межами документів, а для кожного району - відсортований список позицій
+    (posting list), у яких він зустрічається. Пошук шляху A→B→C торкається
+    лише позицій районів шляху: кандидати - перетин документів, що містять
+    усі райони (від найрідшого), далі жадібне зіставлення найближчих
+    наступних позицій бінарним пошуком одночасно для всіх кандидатів.
+    """
+
+    def __init__(
+            self,
+            df: pd.DataFrame,
+            district_column: str = 'district',
+            subscriber_column: str = SUBSCRIBER_COLUMN
+    ):
+        """
+        Побудова індексу.
+
+        Args:
+            df: Події з колонками Дата, Час, району та (необов'язково) абонента
+            district_column: Назва колонки району
+            subscriber_column: Назва колонки абонента (без неї всі події - одного абонента)
+        """
+        started = time.perf_counter()
+        df = df[df['Дата'].notna() & df[district_column].notna()]
+        subscribers = (
+            df[subscriber_column].astype(str) if subscriber_column in df.columns
+            else pd.Series('', index=df.index)
+        )
+        ordered = df.assign(_subscriber=subscribers, _day=df['Дата'].dt.normalize())
+        ordered = ordered.sort_values(['_subscriber', '_day', 'Час'], kind='stable')
+
+        # Документ - пара (абонент, дата); район зберігається лише при зміні в межах документа
+        subscriber_codes, subscriber_values = pd.factorize(ordered['_subscriber'], sort=True)
+        day_codes, day_values = pd.factorize(ordered['_day'], sort=True)
+        keys = subscriber_codes.astype(np.int64) * max(len(day_values), 1) + day_codes
+        districts = ordered[district_column].astype(str).to_numpy()
+        new_doc = np.ones(len(keys), dtype=bool)
+        new_doc[1:] = keys[1:] != keys[:-1]
+        kept = new_doc.copy()
+        kept[1:] |= districts[1:] != districts[:-1]
+
+        keys, starts = keys[kept], new_doc[kept]
+        self._tokens, self.symbols = pd.factorize(districts[kept], sort=True)
+        self._doc_of = np.cumsum(starts) - 1
+        self._offsets = np.r_[np.flatnonzero(starts), len(self._tokens)]
+
+        doc_keys = keys[starts]
+        self.docs = pd.DataFrame({
+            'subscriber': np.asarray(subscriber_values, dtype=object)[doc_keys // max(len(day_values), 1)],
+            'date': pd.DatetimeIndex(day_values)[doc_keys % max(len(day_values), 1)].date,
+            'length': np.diff(self._offsets)
+        })
+
+        # Списки позицій кожного району
+        self._postings = np.argsort(self._tokens, kind='stable')
+        self._posting_offsets = np.searchsorted(self._tokens[self._postings], np.arange(len(self.symbols) + 1))
+        self._codes = {symbol: code for code, symbol in enumerate(self.symbols)}
+
+        logging.info(
+            f"Побудовано індекс траєкторій: {len(self.docs)} абонент-днів, {len(self._tokens)} переходів, "
+            f"{len(self.symbols)} районів за {time.perf_counter() - started:.2f} с"
+        )
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def trajectory(self, doc: int) -> List[str]:
+        """Послідовність районів документа."""
+        return list(self.symbols[self._tokens[self._offsets[doc]:self._offsets[doc + 1]]])
+
+    def _posting(self, code: int) -> np.ndarray:
+        """Позиції району в масиві траєкторій (за зростанням)."""
+        return self._postings[self._posting_offsets[code]:self._posting_offsets[code + 1]]
+
+    def match(self, path: Sequence[str], contiguous: bool = False) -> np.ndarray:
+        """
+        Документи, траєкторія яких містить шлях.
+
+        Args:
+            path: Послідовність районів
+            contiguous: True - райони шляху йдуть підряд, False - з будь-якими районами між ними
+
+        Returns:
+            np.ndarray: Номери документів за зростанням
+        """
+        if not len(path) or any(district not in self._codes for district in path):
+            return np.empty(0, dtype=np.int64)
+        codes = [self._codes[district] for district in path]
+
+        # Кандидати - документи, що містять усі райони шляху, від найрідшого району
+        docs: Optional[np.ndarray] = None
+        for code in sorted(set(codes), key=lambda c: len(self._posting(c))):
+            found = np.unique(self._doc_of[self._posting(code)])
+            docs = found if docs is None else np.intersect1d(docs, found, assume_unique=True)
+            if not len(docs):
+                return docs
+
+        if contiguous:
+            # Кожне входження першого району перевіряється на продовження шляхом
+            starts = self._posting(codes[0])
+            starts = starts[np.isin(self._doc_of[starts], docs)]
+            starts = starts[starts + len(codes) <= self._offsets[self._doc_of[starts] + 1]]
+            for shift, code in enumerate(codes[1:], 1):
+                starts = starts[self._tokens[starts + shift] == code]
+            return np.unique(self._doc_of[starts])
+
+        # Жадібне зіставлення: наступний район шляху - найближче входження після поточної позиції
+        current = self._offsets[docs] - 1
+        for code in codes:
+            positions = self._posting(code)
+            found = np.searchsorted(positions, current + 1)
+            following = positions[np.minimum(found, len(positions) - 1)]
+            matched = (found < len(positions)) & (following < self._offsets[docs + 1])
+            docs, current = docs[matched], following[matched]
+        return docs
+
+    def find(self, path: Sequence[str], contiguous: bool = False) -> pd.DataFrame:
+        """
+        Абонент-дні, траєкторія яких містить шлях.
+
+        Args:
+            path: Послідовність районів
+            contiguous: Райони шляху мають іти підряд
+
+        Returns:
+            pd.DataFrame: Колонки DOC_COLUMNS
+        """
+        started = time.perf_counter()
+        result = self.docs.iloc[self.match(path, contiguous)].reset_index(drop=True)
+        logging.info(
+            f"Пошук шляху {' → '.join(path)}: {len(result)} з {len(self.docs)} абонент-днів "
+            f"за {time.perf_counter() - started:.3f} с"
+        )
+        return result
+
+    def followers(self, path: Sequence[str], contiguous: bool = False) -> pd.DataFrame:
+        """
+        Абоненти, які проходили шлях, з кількістю таких днів.
+
+        Args:
+            path: Послідовність районів
+            contiguous: Райони шляху мають іти підряд
+
+        Returns:
+            pd.DataFrame: Колонки FOLLOWER_COLUMNS за спаданням кількості днів
+        """
+        found = self.find(path, contiguous)
+        if found.empty:
+            return pd.DataFrame(columns=FOLLOWER_COLUMNS)
+        summary = found.groupby('subscriber').agg(
+            days=('date', 'size'),
+            first_date=('date', 'min'),
+            last_date=('date', 'max')
+        ).reset_index()
+        return summary.sort_values('days', ascending=False, kind='stable').reset_index(drop=True)[FOLLOWER_COLUMNS]
+
+    def frequent_subpaths(
+            self,
+            length: int = 3,
+            min_subscribers: int = 2,
+            limit: Optional[int] = 20
+    ) -> pd.DataFrame:
+        """
+        Найчастіші спільні ділянки траєкторій (n-грами районів підряд).
+
+        Усі n-грами корпусу кодуються одним числом і рахуються одним
+        групуванням: кількість абонентів і абонент-днів, у яких вони є.
+
+        Args:
+            length: Кількість районів у ділянці
+            min_subscribers: Мінімальна кількість абонентів, що проходили ділянку
+            limit: Максимальна кількість ділянок (None - усі)
+
+        Returns:
+            pd.DataFrame: Колонки SUBPATH_COLUMNS за спаданням кількості абонентів і днів
+        """
+        if length < 1:
+            raise ValueError("Довжина ділянки має бути додатною")
+        starts = np.arange(len(self._tokens))
+        starts = starts[starts + length <= self._offsets[self._doc_of + 1]]
+        if not len(starts):
+            return pd.DataFrame(columns=SUBPATH_COLUMNS)
+
+        # Номер ділянки: однакові послідовності районів - однаковий номер
+        windows = self._tokens[starts[:, None] + np.arange(length)[None, :]]
+        if len(self.symbols) ** length < 2 ** 62:
+            keys = np.zeros(len(starts), dtype=np.int64)
+            for column in range(length):
+                keys = keys * len(self.symbols) + windows[:, column]
+            grams = pd.factorize(keys)[0]
+        else:
+            grams = np.unique(windows, axis=0, return_inverse=True)[1].reshape(-1)
+
+        docs = self._doc_of[starts]
+        counts = pd.DataFrame({
+            'gram': grams,
+            'doc': docs,
+            'subscriber': self.docs['subscriber'].to_numpy()[docs]
+        }).drop_duplicates(['gram', 'doc']).groupby('gram').agg(
+            subscribers=('subscriber', 'nunique'),
+            days=('doc', 'size')
+        )
+        counts = counts[counts['subscribers'] >= min_subscribers]
+        counts = counts.sort_values(['subscribers', 'days'], ascending=False, kind='stable')
+        if limit is not None:
+            counts = counts.head(limit)
+
+        # Назва ділянки - за першим входженням
+        first = np.unique(grams, return_index=True)[1]
+        paths = [' → '.join(self.symbols[windows[first[gram]]]) for gram in counts.index]
+        return pd.DataFrame({
+            'path': paths,
+            'subscribers': counts['subscribers'].to_numpy(),
+            'days': counts['days'].to_numpy()
+        })
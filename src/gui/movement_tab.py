@@ -3,21 +3,38 @@
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import numpy as np
 import pandas as pd
 from datetime import datetime, time
 import folium
 from folium.plugins import HeatMap
-import json
 import os
 from math import radians, sin, cos, sqrt, atan2
-from collections import defaultdict
-from shapely.geometry import Point, shape
 from typing import List, Dict, Optional, Tuple
 import logging
+from ..core.co_location import co_location_summary, find_co_locations, one_vs_all
+from ..core.daily_maps import day_payloads, render_daily_maps, render_day_map
+from ..core.day_period import DayWindow
+from ..core.home_work import BatchHomeWork
+from ..core.kinematics import DEFAULT_MAX_SPEED, ELAPSED_COLUMN, JUMP_COLUMN, SPEED_COLUMN, STEP_COLUMN
+from ..core.mobility_cube import CUBE_LABELS, subscriber_mobility
+from ..core.polygon_index import PolygonIndex
+from ..core.route_index import RouteIndex
+from ..core.route_matching import METHOD_DTW, METHOD_FRECHET, RouteMatcher
+from ..core.route_similarity import most_similar_days, route_similarity, similarity_matrix
+from ..core.stay_detection import StayPointDetector, infer_home_work
+from ..core.traffic_dataset import PERIOD_COLUMN, TrafficDataset, parse_time, prepare_frame
 
 class MovementTab(ttk.Frame):
     """Вкладка для аналізу переміщень."""
 
+    # Методи порівняння маршрутів: назва в інтерфейсі -> метод RouteMatcher (None - за точками)
+    SIMILARITY_METHODS = ('Точки', 'DTW', 'Фреше')
+    _MATCHER_METHODS = {'Точки': None, 'DTW': METHOD_DTW, 'Фреше': METHOD_FRECHET}
+
+    # Максимальна кількість рядків аркуша Excel (з рядком заголовків)
+    EXCEL_MAX_ROWS = 1_048_576
+
     def __init__(
         self,
         parent: ttk.Notebook,
@@ -42,13 +59,19 @@ class MovementTab(ttk.Frame):
         # Ініціалізація змінних
         self.traffic_files: List[str] = []
         self.geojson_file: Optional[str] = None
-        self.polygon = None
+        self.polygon: Optional[PolygonIndex] = None
         self.current_time = datetime.strptime(
             "2025-07-21 12:07:55",
             "%Y-%m-%d %H:%M:%S"
         )
         self.current_user = "McNeal1994"
 
+        # Завантажений набір даних усіх файлів (перечитується лише при зміні файлів)
+        self._dataset: Optional[TrafficDataset] = None
+        self._dataset_key: Optional[tuple] = None
+        self._route_index: Optional[RouteIndex] = None
+        self._route_index_source: Optional[TrafficDataset] = None
+
         # Створення віджетів
         self._create_widgets()
 
@@ -103,6 +126,12 @@ class MovementTab(ttk.Frame):
             command=self._process_files
         ).pack(side=tk.LEFT, padx=5, pady=2)
 
+        ttk.Button(
+            frame,
+            text="Дім/робота всіх абонентів",
+            command=self._process_all_subscribers
+        ).pack(side=tk.LEFT, padx=5, pady=2)
+
     def _create_parameters_frame(self, parent) -> None:
         """Створення фрейму параметрів."""
         frame = ttk.LabelFrame(parent, text="Параметри")
@@ -175,13 +204,26 @@ class MovementTab(ttk.Frame):
             width=10
         ).grid(row=2, column=1, padx=5, pady=2, sticky='w')
 
+        # Радіус місця перебування (0 - лише точний збіг координат)
+        ttk.Label(
+            frame,
+            text="Радіус перебування (м):"
+        ).grid(row=3, column=0, padx=5, pady=2, sticky='e')
+
+        self.stay_radius = tk.StringVar(value=str(self.config.get('movement.stay_radius', 500)))
+        ttk.Entry(
+            frame,
+            textvariable=self.stay_radius,
+            width=10
+        ).grid(row=3, column=1, padx=5, pady=2, sticky='w')
+
         # Створення мап
         self.create_daily_maps = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             frame,
             text="Створювати мапи за кожен день",
             variable=self.create_daily_maps
-        ).grid(row=3, column=0, columnspan=2, padx=5, pady=2)
+        ).grid(row=4, column=0, columnspan=2, padx=5, pady=2)
 
     def _create_date_frame(self, parent) -> None:
         """Створення фрейму роботи з датами."""
@@ -235,12 +277,33 @@ class MovementTab(ttk.Frame):
             width=5
         ).pack(side=tk.LEFT, padx=5, pady=2)
 
+        ttk.Label(
+            frame,
+            text="Метод:"
+        ).pack(side=tk.LEFT, padx=5, pady=2)
+
+        # Точки - без урахування порядку; DTW і Фреше - з урахуванням порядку точок
+        self.similarity_method = tk.StringVar(value=self.SIMILARITY_METHODS[0])
+        ttk.Combobox(
+            frame,
+            textvariable=self.similarity_method,
+            values=self.SIMILARITY_METHODS,
+            width=7,
+            state='readonly'
+        ).pack(side=tk.LEFT, padx=5, pady=2)
+
         ttk.Button(
             frame,
             text="Знайти схожі",
             command=self._find_similar_routes
         ).pack(side=tk.LEFT, padx=5, pady=2)
 
+        ttk.Button(
+            frame,
+            text="Схожі дні всіх абонентів",
+            command=self._find_similar_days_all
+        ).pack(side=tk.LEFT, padx=5, pady=2)
+
     def _create_log_frame(self, parent) -> None:
         """Створення фрейму логування."""
         frame = ttk.LabelFrame(parent, text="Лог операцій")
@@ -317,18 +380,16 @@ class MovementTab(ttk.Frame):
             )
             self.log_text.see(tk.END)
 
-    def load_polygon(self) -> Optional[shape]:
+    def load_polygon(self) -> Optional[PolygonIndex]:
         """
-        Завантаження полігону з GeoJSON файлу.
+        Завантаження всіх полігонів з GeoJSON файлу.
 
         Returns:
-            Optional[shape]: Об'єкт полігону або None
+            Optional[PolygonIndex]: Індекс полігонів або None
         """
         try:
             if self.geojson_file and os.path.exists(self.geojson_file):
-                with open(self.geojson_file, 'r', encoding='utf-8') as f:
-                    geojson = json.load(f)
-                self.polygon = shape(geojson['features'][0]['geometry'])
+                self.polygon = PolygonIndex.from_geojson(self.geojson_file)
                 return self.polygon
         except Exception as e:
             logging.error(f"Помилка завантаження полігону: {e}")
@@ -344,16 +405,7 @@ class MovementTab(ttk.Frame):
         Returns:
             Optional[time]: Об'єкт time або None при помилці
         """
-        if isinstance(time_str, time):
-            return time_str
-        try:
-            return datetime.strptime(str(time_str), '%H:%M:%S').time()
-        except ValueError:
-            try:
-                return datetime.strptime(str(time_str), '%H:%M').time()
-            except ValueError:
-                logging.error(f"Неможливо розпізнати формат часу: {time_str}")
-                return None
+        return parse_time(time_str)
 
     def calculate_distance(
             self,
@@ -389,81 +441,54 @@ class MovementTab(ttk.Frame):
             self,
             df: pd.DataFrame,
             min_day_duration: int = 30,
-            min_night_duration: int = 60
+            min_night_duration: int = 60,
+            window: Optional[DayWindow] = None
     ) -> Tuple[Dict, Dict]:
         """
         Аналіз місць перебування для визначення дому та роботи.
 
+        Перебування - серія послідовних за часом подій одного дня з однаковими
+        координатами (округленими до 4 знаків). Серії виділяються одним
+        векторним проходом по всіх днях.
+
         Args:
             df: DataFrame з даними
             min_day_duration: Мінімальна тривалість денного перебування
             min_night_duration: Мінімальна тривалість нічного перебування
+            window: Денне вікно (None - з налаштувань filters.day_start/day_end)
 
         Returns:
             Tuple[Dict, Dict]: (дім, робота) з їх характеристиками
         """
-        locations = defaultdict(
-            lambda: {
-                'day_count': 0,
-                'night_count': 0,
-                'total_duration': 0,
-                'address': None
-            }
+        window = window or DayWindow.from_config(self.config)
+        stays = self._detect_runs(df)
+        is_day = window.is_day_minutes((stays['start_us'] // 60_000_000).to_numpy())
+        min_duration = np.where(is_day, min_day_duration, min_night_duration)
+        keep = stays['duration'].to_numpy() >= min_duration
+        stays, is_day = stays[keep], is_day[keep]
+
+        # Місця в порядку першого тривалого перебування, як у послідовному обході
+        codes, coords = pd.factorize(
+            pd.MultiIndex.from_arrays([stays['lat'], stays['lon']]),
+            sort=False
         )
-
-        for date in df['Дата'].dt.date.unique():
-            day_data = df[df['Дата'].dt.date == date].sort_values('Час')
-
-            i = 0
-            while i < len(day_data):
-                row = day_data.iloc[i]
-                coord = (
-                    round(row['Широта'], 4),
-                    round(row['Долгота'], 4)
-                )
-                current_time = row['Час']
-
-                # Знаходимо тривалість перебування
-                j = i + 1
-                while j < len(day_data):
-                    next_row = day_data.iloc[j]
-                    next_coord = (
-                        round(next_row['Широта'], 4),
-                        round(next_row['Долгота'], 4)
-                    )
-                    if next_coord != coord:
-                        break
-                    j += 1
-
-                if j > i:
-                    end_time = day_data.iloc[j - 1]['Час']
-                    if isinstance(end_time, str):
-                        end_time = self.parse_time(end_time)
-                    if isinstance(current_time, str):
-                        current_time = self.parse_time(current_time)
-
-                    duration = (
-                                       datetime.combine(date, end_time) -
-                                       datetime.combine(date, current_time)
-                               ).total_seconds() / 60
-
-                    min_duration = (
-                        min_night_duration
-                        if current_time.hour >= 22 or current_time.hour <= 6
-                        else min_day_duration
-                    )
-
-                    if duration >= min_duration:
-                        locations[coord]['total_duration'] += duration
-                        locations[coord]['address'] = row['Адреса БС']
-
-                        hour = current_time.hour
-                        if 9 <= hour <= 18:  # Робочий час
-                            locations[coord]['day_count'] += 1
-                        elif hour >= 23 or hour <= 6:  # Нічний час
-                            locations[coord]['night_count'] += 1
-
-                i = j if j > i else i + 1
+        size = len(coords)
+        day_counts = np.bincount(codes, weights=is_day, minlength=size)
+        night_counts = np.bincount(codes, weights=~is_day, minlength=size)
+        durations = np.bincount(codes, weights=stays['duration'].to_numpy(), minlength=size)
+        # Адреса останнього тривалого перебування в кожному місці
+        last = pd.Series(np.arange(len(codes))).groupby(codes).last().to_numpy()
+        addresses = stays['address'].to_numpy()[last]
+
+        locations = {
+            (float(coord[0]), float(coord[1])): {
+                'day_count': int(day_counts[i]),
+                'night_count': int(night_counts[i]),
+                'total_duration': float(durations[i]),
+                'address': addresses[i]
+            }
+            for i, coord in enumerate(coords)
+        }
 
         # Визначаємо дім та роботу
         home = max(
@@ -486,6 +511,67 @@ class MovementTab(ttk.Frame):
 
         return home, work
 
+    def _detect_runs(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Виділення серій подій з однаковими округленими координатами.
+
+        Args:
+            df: DataFrame з колонками Дата, Час, Широта, Довгота, Адреса БС
+
+        Returns:
+            pd.DataFrame: Серії в порядку днів та часу з колонками
+                lat, lon, start_us, duration (хв), address
+        """
+        df = df[df['Дата'].notna() & df['Час'].notna()]
+
+        # Час доби в мікросекундах; рядки часу розбираються по одному разу на значення
+        time_us = {}
+        for value in pd.unique(df['Час']):
+            parsed = self.parse_time(value) if isinstance(value, str) else value
+            time_us[value] = (
+                ((parsed.hour * 60 + parsed.minute) * 60 + parsed.second) * 1_000_000
+                + parsed.microsecond
+            ) if parsed is not None else None
+        micros = df['Час'].map(time_us)
+        df = df[micros.notna()]
+        micros = micros[micros.notna()].to_numpy(dtype=np.int64)
+
+        # round() Python для кожної унікальної координати - як у покоординатному порівнянні
+        lat = df['Широта'].map({v: round(v, 4) for v in pd.unique(df['Широта'])}).to_numpy(dtype=float)
+        lon = df['Довгота'].map({v: round(v, 4) for v in pd.unique(df['Довгота'])}).to_numpy(dtype=float)
+
+        # Дні в порядку появи, події в межах дня - за часом
+        day, _ = pd.factorize(df['Дата'].dt.date, sort=False)
+        order = np.lexsort((micros, day))
+        day, micros, lat, lon = day[order], micros[order], lat[order], lon[order]
+        addresses = df['Адреса БС'].to_numpy()[order]
+
+        new_run = np.ones(len(order), dtype=bool)
+        new_run[1:] = (day[1:] != day[:-1]) | (lat[1:] != lat[:-1]) | (lon[1:] != lon[:-1])
+        starts = np.flatnonzero(new_run)
+        ends = np.append(starts[1:], len(order))[:len(starts)] - 1
+
+        return pd.DataFrame({
+            'lat': lat[starts],
+            'lon': lon[starts],
+            'start_us': micros[starts],
+            'duration': (micros[ends] - micros[starts]) / 1_000_000 / 60,
+            'address': addresses[starts]
+        })
+
+    def _sector_params(self) -> Tuple[float, float]:
+        """Кут і радіус сектора з полів вводу (за замовчуванням 120° та 500 м)."""
+        try:
+            return float(self.sector_angle.get()), float(self.sector_radius.get())
+        except (ValueError, AttributeError):
+            return 120.0, 500.0
+
+    def _with_periods(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Набір даних з колонкою періоду доби (денні та нічні маркери розрізняються кольором)."""
+        if PERIOD_COLUMN in df.columns:
+            return df
+        return TrafficDataset(df).apply_window(DayWindow.from_config(self.config))
+
     def create_map(
             self,
             df: pd.DataFrame,
@@ -509,87 +595,18 @@ class MovementTab(ttk.Frame):
             logging.warning(f"Немає даних для дати {date}")
             return
 
-        # Створюємо базову карту
-        m = folium.Map(
-            location=[
-                day_data['Широта'].mean(),
-                day_data['Долгота'].mean()
-            ],
-            zoom_start=12
-        )
-
-        # Отримуємо параметри секторів
-        try:
-            sector_radius = float(self.sector_radius.get())
-            sector_angle = float(self.sector_angle.get())
-        except (ValueError, AttributeError):
-            sector_radius = 500
-            sector_angle = 120
-
-        # Додаємо маркери та сектори для кожної точки
-        for _, row in day_data.iterrows():
-            # Додаємо маркер
-            folium.Marker(
-                [row['Широта'], row['Довгота']],
-                popup=f"Час: {row['Час']}<br>Адреса: {row['Адреса БС']}"
-            ).add_to(m)
-
-            # Додаємо сектор
-            if 'Азимут' in row:
-                try:
-                    azimuth = float(row['Азимут'])
-                    # Створюємо сектор використовуючи geo_processor
-                    sector = self.geo_processor.create_sector(
-                        row['Широта'],
-                        row['Довгота'],
-                        azimuth,
-                        sector_angle,
-                        sector_radius
-                    )
-
-                    # Додаємо сектор на карту
-                    folium.GeoJson(
-                        sector,
-                        style_function=lambda x: {
-                            'fillColor': '#3388ff',
-                            'color': '#3388ff',
-                            'fillOpacity': 0.2,
-                            'weight': 1
-                        }
-                    ).add_to(m)
-                except (ValueError, TypeError):
-                    logging.warning(f"Неможливо створити сектор для запису: {row}")
-
-        # Додаємо лінії між послідовними точками
-        points = day_data[['Широта', 'Долгота']].values.tolist()
-        if len(points) > 1:
-            folium.PolyLine(
-                points,
-                weight=2,
-                color='blue',
-                opacity=0.8
-            ).add_to(m)
-
-        # Додаємо тепловую мапу
-        heat_data = day_data[['Широта', 'Долгота']].values.tolist()
-        HeatMap(heat_data).add_to(m)
-
-        # Якщо є полігон, додаємо його
-        if self.polygon:
-            folium.GeoJson(
-                self.geojson_file,
-                name='Полігон'
-            ).add_to(m)
-
-        # Додаємо контроль шарів
-        folium.LayerControl().add_to(m)
-
-        # Зберігаємо карту
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
             filename = os.path.join(output_dir, filename)
 
-        m.save(filename)
+        sector_angle, sector_radius = self._sector_params()
+        render_day_map(
+            day_payloads(self._with_periods(day_data))[0],
+            filename,
+            sector_angle,
+            sector_radius,
+            self.geojson_file if self.polygon else None
+        )
 
     def _process_files(self) -> None:
         """Обробка файлів для аналізу переміщень."""
@@ -602,9 +619,13 @@ class MovementTab(ttk.Frame):
                 max_distance = float(self.max_distance.get())
                 day_min_duration = int(self.day_min_duration.get())
                 night_min_duration = int(self.night_min_duration.get())
+                stay_radius = float(self.stay_radius.get())
+                max_speed = float(self.config.get('movement.max_speed', DEFAULT_MAX_SPEED))
             except ValueError as e:
                 raise ValueError("Неправильний формат параметрів") from e
 
+            window = DayWindow.from_config(self.config)
+
             # Створюємо директорію для результатів
             output_dir = os.path.join(
                 os.path.dirname(self.traffic_files[0]),
@@ -624,74 +645,8 @@ class MovementTab(ttk.Frame):
                     df = pd.read_excel(file)
                     logging.info(f"Наявні колонки у файлі: {', '.join(df.columns)}")
 
-                    # Розширений список можливих назв колонок
-                    column_mapping = {
-                        # Широта
-                        'Latitude': 'Широта',
-                        'lat': 'Широта',
-                        'latitude': 'Широта',
-                        'LAT': 'Широта',
-                        'широта': 'Широта',
-                        'Lat': 'Широта',
-                        'latitude_degrees': 'Широта',
-
-                        # Довгота
-                        'Longitude': 'Довгота',
-                        'lon': 'Довгота',
-                        'longitude': 'Довгота',
-                        'LON': 'Довгота',
-                        'довгота': 'Довгота',
-                        'Long': 'Довгота',
-                        'lng': 'Довгота',
-                        'Долгота': 'Довгота',
-                        'longitude_degrees': 'Довгота',
-
-                        # Дата
-                        'Date': 'Дата',
-                        'date': 'Дата',
-                        'DATE': 'Дата',
-                        'дата': 'Дата',
-
-                        # Час
-                        'Time': 'Час',
-                        'time': 'Час',
-                        'TIME': 'Час',
-                        'час': 'Час',
-
-                        # Адреса
-                        'BS Address': 'Адреса БС',
-                        'Address': 'Адреса БС',
-                        'address': 'Адреса БС',
-                        'BS_Address': 'Адреса БС',
-                        'адреса': 'Адреса БС',
-                        'адреса бс': 'Адреса БС',
-
-                        # Азимут
-                        'Azimuth': 'Азимут',
-                        'azimuth': 'Азимут',
-                        'AZIMUTH': 'Азимут',
-                        'азимут': 'Азимут'
-                    }
-
-                    # Друкуємо поточні назви колонок для діагностики
-                    self.log_text.insert(
-                        tk.END,
-                        f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): "
-                        f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                        f"Current User's Login: {self.current_user}\n"
-                        f"Поточні назви колонок у файлі: {', '.join(df.columns)}\n\n"
-                    )
-                    self.log_text.see(tk.END)
-
-                    # Створюємо словник для перейменування, враховуючи тільки існуючі колонки
-                    rename_dict = {}
-                    for old_name, new_name in column_mapping.items():
-                        matching_cols = [col for col in df.columns if col.strip().lower() == old_name.strip().lower()]
-                        if matching_cols:
-                            rename_dict[matching_cols[0]] = new_name
-
-                    # Перейменовуємо колонки
-                    df = df.rename(columns=rename_dict)
+                    # Приводимо колонки до єдиних назв і типів
+                    df, invalid_count = prepare_frame(df)
 
                     # Друкуємо назви колонок після перейменування
                     self.log_text.insert(
@@ -703,63 +658,45 @@ class MovementTab(ttk.Frame):
                     )
                     self.log_text.see(tk.END)
 
-                    # Перевіряємо наявність необхідних колонок
-                    required_columns = ['Дата', 'Час', 'Широта', 'Довгота', 'Адреса БС']
-                    missing_columns = [col for col in required_columns if col not in df.columns]
-
-                    if missing_columns:
-                        raise ValueError(
-                            f"У файлі відсутні необхідні колонки: {', '.join(missing_columns)}\n"
-                            f"Наявні колонки: {', '.join(df.columns)}\n"
-                            f"Очікувані назви колонок: {', '.join(required_columns)}"
-                        )
-
-                    # Конвертуємо дані
-                    try:
-                        df['Дата'] = pd.to_datetime(df['Дата'], format='%d.%m.%Y', dayfirst=True)
-                    except Exception as e:
-                        logging.error(f"Помилка конвертації дати: {e}")
-                        df['Дата'] = pd.to_datetime(df['Дата'], errors='coerce')
-
-                    df['Час'] = df['Час'].apply(self.parse_time)
-
-                    # Конвертуємо координати у числовий формат
-                    try:
-                        df['Широта'] = pd.to_numeric(df['Широта'], errors='coerce')
-                        df['Довгота'] = pd.to_numeric(df['Довгота'], errors='coerce')
-
-                        if 'Азимут' in df.columns:
-                            df['Азимут'] = pd.to_numeric(df['Азимут'], errors='coerce')
-                    except Exception as e:
-                        raise ValueError(
-                            f"Помилка конвертації координат: {str(e)}\n"
-                            f"Приклад даних:\nШирота: {df['Широта'].iloc[0]}\n"
-                            f"Довгота: {df['Довгота'].iloc[0]}"
-                        )
-
-                    # Перевіряємо валідність координат
-                    invalid_coords = df[df['Широта'].isna() | df['Довгота'].isna()]
-                    if not invalid_coords.empty:
+                    # Рядки з невалідними координатами вже відкинуто
+                    if invalid_count:
                         self.log_text.insert(
                             tk.END,
                             f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): "
                             f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n"
                             f"Current User's Login: {self.current_user}\n"
-                            f"Знайдено {len(invalid_coords)} рядків з невалідними координатами\n\n"
+                            f"Знайдено {invalid_count} рядків з невалідними координатами\n\n"
                         )
                         self.log_text.see(tk.END)
-                        # Видаляємо рядки з невалідними координатами
-                        df = df.dropna(subset=['Широта', 'Довгота'])
 
                     if df.empty:
                         raise ValueError("Після обробки даних не залишилось валідних записів")
 
+                    # Колонки періоду доби та кінематики переміщень для карт і звітів
+                    dataset = TrafficDataset(df)
+                    dataset.apply_window(window)
+                    df = dataset.apply_kinematics(max_speed)
+
+                    # Полігон, у якому знаходиться кожна подія
+                    if self.polygon:
+                        df['Полігон'] = self.polygon.label(df)
+
                     # Аналіз місць перебування
-                    home, work = self.analyze_locations(
-                        df,
-                        min_day_duration=day_min_duration,
-                        min_night_duration=night_min_duration
-                    )
+                    stays = StayPointDetector(
+                        radius=stay_radius,
+                        min_dwell=day_min_duration,
+                        min_night_dwell=night_min_duration,
+                        window=window
+                    ).detect(df)
+                    if stay_radius > 0:
+                        home, work = infer_home_work(stays, window)
+                    else:
+                        home, work = self.analyze_locations(
+                            df,
+                            min_day_duration=day_min_duration,
+                            min_night_duration=night_min_duration,
+                            window=window
+                        )
 
                     # Зберігаємо результати
                     results_filename = os.path.join(
@@ -777,6 +714,12 @@ class MovementTab(ttk.Frame):
                             max_distance
                         )
 
+                        # Зберігаємо таблицю перебувань
+                        self._save_stays(writer, stays)
+
+                        # Зберігаємо неправдоподібні стрибки координат
+                        self._save_jumps(writer, df)
+
                         # Зберігаємо дані про переміщення поза полігоном
                         if self.polygon:
                             self._save_outside_polygon_data(
@@ -846,6 +789,137 @@ class MovementTab(ttk.Frame):
             self.progress_bar['value'] = 0
             self.update_idletasks()
 
+    def _process_all_subscribers(self) -> None:
+        """Визначення дому та роботи для всіх абонентів вибраних файлів одним зведенням."""
+        try:
+            if not self.traffic_files:
+                raise ValueError("Не вибрано файли трафіку")
+
+            try:
+                day_min_duration = int(self.day_min_duration.get())
+                night_min_duration = int(self.night_min_duration.get())
+                stay_radius = float(self.stay_radius.get())
+            except ValueError as e:
+                raise ValueError("Неправильний формат параметрів") from e
+
+            output_dir = os.path.join(
+                os.path.dirname(self.traffic_files[0]),
+                "results"
+            )
+            os.makedirs(output_dir, exist_ok=True)
+
+            self.progress_bar['value'] = 10
+            self.update_idletasks()
+
+            dataset = self._load_dataset()
+            window = DayWindow.from_config(self.config)
+            dataset.apply_window(window)
+
+            self.progress_bar['value'] = 30
+            self.update_idletasks()
+
+            summary = BatchHomeWork(
+                radius=stay_radius,
+                min_dwell=day_min_duration,
+                min_night_dwell=night_min_duration,
+                window=window
+            ).run(dataset.frame)
+
+            summary_filename = os.path.join(output_dir, "home_work_summary.xlsx")
+            summary.rename(columns={
+                'subscriber': 'Абонент',
+                'events': 'Подій',
+                'days': 'Днів',
+                'stays': 'Перебувань',
+                'home_latitude': 'Дім: широта',
+                'home_longitude': 'Дім: довгота',
+                'home_address': 'Дім: адреса БС',
+                'home_nights': 'Ночей вдома',
+                'nights_observed': 'Ночей спостереження',
+                'home_confidence': 'Впевненість (дім)',
+                'work_latitude': 'Робота: широта',
+                'work_longitude': 'Робота: довгота',
+                'work_address': 'Робота: адреса БС',
+                'work_days': 'Днів на роботі',
+                'workdays_observed': 'Днів спостереження',
+                'work_confidence': 'Впевненість (робота)'
+            }).to_excel(summary_filename, index=False)
+
+            # Куб мобільності абонент-днів (обчислюється один раз на набір даних)
+            mobility_filename = self._save_mobility(dataset, output_dir)
+
+            self.log_text.insert(
+                tk.END,
+                f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): "
+                f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"Current User's Login: {self.current_user}\n"
+                f"Дім/робота визначено для {len(summary)} абонентів "
+                f"({len(dataset.frame)} подій)\n"
+                f"Зведення збережено в: {summary_filename}\n"
+                f"Показники мобільності збережено в: {mobility_filename}\n\n"
+            )
+            self.log_text.see(tk.END)
+
+            messagebox.showinfo("Успіх", f"Зведення збережено в {summary_filename}")
+
+        except Exception as e:
+            error_msg = f"Помилка пакетного визначення дому/роботи: {str(e)}"
+            messagebox.showerror("Помилка", error_msg)
+            logging.error(error_msg)
+            self.log_text.insert(tk.END, f"{error_msg}\n\n")
+            self.log_text.see(tk.END)
+
+        finally:
+            self.progress_bar['value'] = 0
+            self.update_idletasks()
+
+    def _save_mobility(self, dataset: TrafficDataset, output_dir: str) -> str:
+        """
+        Збереження куба мобільності та рейтингу абонентів за радіусом гірації.
+
+        Args:
+            dataset: Набір даних
+            output_dir: Директорія для збереження
+
+        Returns:
+            str: Шлях до файлу
+        """
+        cube = dataset.mobility()
+        filename = os.path.join(output_dir, "mobility_summary.xlsx")
+        with pd.ExcelWriter(filename) as writer:
+            subscriber_mobility(cube).rename(columns={
+                'subscriber': 'Абонент',
+                'days': 'Днів',
+                'events': 'Подій',
+                'first_seen': 'Перша подія',
+                'last_seen': 'Остання подія',
+                'max_cells': 'Макс. різних БС за день',
+                'mean_radius_of_gyration': 'Середній радіус гірації (м)',
+                'max_radius_of_gyration': 'Макс. радіус гірації (м)',
+                'displacement': 'Сумарне переміщення (м)'
+            }).to_excel(writer, sheet_name='Абоненти', index=False)
+            if len(cube) < self.EXCEL_MAX_ROWS:
+                cube.rename(columns=CUBE_LABELS).to_excel(writer, sheet_name='Абонент-дні', index=False)
+            else:
+                logging.warning(f"Куб мобільності ({len(cube)} рядків) не вміщується в аркуш Excel")
+        return filename
+
+    def _load_dataset(self) -> TrafficDataset:
+        """
+        Набір даних вибраних файлів трафіку.
+
+        Файли перечитуються лише при зміні їх переліку або часу модифікації,
+        тому, наприклад, зміна денного вікна не потребує повторного завантаження.
+
+        Returns:
+            TrafficDataset: Об'єднаний набір даних
+        """
+        key = tuple((file, os.path.getmtime(file)) for file in self.traffic_files)
+        if self._dataset is None or key != self._dataset_key:
+            self._dataset = TrafficDataset.from_files(self.traffic_files)
+            self._dataset_key = key
+        return self._dataset
+
     def _save_location_data(
             self,
             writer: pd.ExcelWriter,
@@ -884,6 +958,42 @@ class MovementTab(ttk.Frame):
         }])
         work_df.to_excel(writer, sheet_name='Місце роботи', index=False)
 
+    def _save_stays(self, writer: pd.ExcelWriter, stays: pd.DataFrame) -> None:
+        """
+        Збереження таблиці перебувань.
+
+        Args:
+            writer: ExcelWriter для запису
+            stays: Таблиця перебувань StayPointDetector.detect
+        """
+        stays_df = pd.DataFrame({
+            'Початок': stays['start'],
+            'Кінець': stays['end'],
+            'Широта': stays['latitude'],
+            'Довгота': stays['longitude'],
+            'Тривалість (хв)': stays['dwell'],
+            'Кількість подій': stays['events'],
+            'Місце': stays['place'],
+            'БС': stays['bs'].map(lambda bs: '; '.join(bs))
+        })
+        stays_df.to_excel(writer, sheet_name='Перебування', index=False)
+
+    def _save_jumps(self, writer: pd.ExcelWriter, df: pd.DataFrame) -> None:
+        """
+        Збереження подій з неправдоподібним стрибком від попередньої події.
+
+        Args:
+            writer: ExcelWriter для запису
+            df: DataFrame з колонками кінематики
+        """
+        if JUMP_COLUMN not in df.columns:
+            return
+        jumps = df[df[JUMP_COLUMN]]
+        columns = [c for c in ['Дата', 'Час', 'Адреса БС', 'Широта', 'Довгота'] if c in df.columns]
+        jumps[columns + [STEP_COLUMN, ELAPSED_COLUMN, SPEED_COLUMN]].to_excel(
+            writer, sheet_name='Стрибки', index=False
+        )
+
     def _save_outside_polygon_data(
             self,
             writer: pd.ExcelWriter,
@@ -892,30 +1002,39 @@ class MovementTab(ttk.Frame):
         """
         Збереження даних про переміщення поза полігоном.
 
+        Кожна подія позначається назвою полігона, в якому вона знаходиться;
+        окремим аркушем зберігається кількість подій у кожному полігоні.
+
         Args:
             writer: ExcelWriter для запису
             df: DataFrame з даними
         """
-        outside_locations = []
-        for _, row in df.iterrows():
-            point = Point(row['Довгота'], row['Широта'])
-            if not self.polygon.contains(point):
-                outside_locations.append({
-                    'Дата': row['Дата'],
-                    'Час': row['Час'],
-                    'Широта': row['Широта'],
-                    'Довгота': row['Долгота'],
-                    'Адреса БС': row['Адреса БС']
-                })
-
-        if outside_locations:
-            outside_df = pd.DataFrame(outside_locations)
+        labels = df['Полігон'] if 'Полігон' in df.columns else self.polygon.label(df)
+        outside_df = df.loc[labels.isna(), ['Дата', 'Час', 'Широта', 'Довгота', 'Адреса БС']]
+
+        if not outside_df.empty:
             outside_df.to_excel(writer, sheet_name='Поза полігоном', index=False)
         else:
             pd.DataFrame({
                 'Інформація': ['Немає локацій поза вказаним полігоном']
             }).to_excel(writer, sheet_name='Поза полігоном', index=False)
 
+        counts = labels.value_counts().reindex(self.polygon.names, fill_value=0)
+
+        # Днів у полігоні - кількість унікальних пар (полігон, дата), одним групуванням
+        days = (
+            pd.DataFrame({'polygon': labels.to_numpy(), 'day': df['Дата'].dt.normalize().to_numpy()})
+            .dropna()
+            .drop_duplicates()['polygon']
+            .value_counts()
+            .reindex(self.polygon.names, fill_value=0)
+        )
+        pd.DataFrame({
+            'Полігон': counts.index,
+            'Кількість подій': counts.to_numpy(),
+            'Днів': days.to_numpy()
+        }).to_excel(writer, sheet_name='Полігони', index=False)
+
     def _create_daily_maps(
             self,
             df: pd.DataFrame,
@@ -928,14 +1047,20 @@ class MovementTab(ttk.Frame):
             df: DataFrame з даними
             output_dir: Директорія для збереження
         """
-        for date in df['Дата'].dt.date.unique():
-            map_filename = f"map_{date.strftime('%Y%m%d')}.html"
-            self.create_map(
-                df,
-                datetime.combine(date, datetime.min.time()),
-                map_filename,
-                output_dir=output_dir
-            )
+        def progress(done: int, total: int) -> None:
+            self.progress_bar['value'] = done / total * 100
+            self.update_idletasks()
+
+        sector_angle, sector_radius = self._sector_params()
+        filenames = render_daily_maps(
+            self._with_periods(df),
+            output_dir,
+            sector_angle,
+            sector_radius,
+            polygon_file=self.geojson_file if self.polygon else None,
+            progress=progress
+        )
+        logging.info(f"Створено {len(filenames)} денних карт у {output_dir}")
 
     def _log_processing_results(
             self,
@@ -998,23 +1123,7 @@ class MovementTab(ttk.Frame):
         Returns:
             float: Відсоток схожості (0-100)
         """
-        # Мінімальна кількість схожих точок
-        min_points = min(len(route1), len(route2)) * 0.5
-        similar_points = 0
-
-        for _, point1 in route1.iterrows():
-            for _, point2 in route2.iterrows():
-                distance = self.calculate_distance(
-                    point1['Широта'],
-                    point1['Довгота'],
-                    point2['Широта'],
-                    point2['Довгота']
-                )
-                if distance <= max_distance:
-                    similar_points += 1
-                    break
-
-        return (similar_points / len(route1)) * 100
+        return route_similarity(route1, route2, max_distance)
 
     def _find_similar_routes(self) -> None:
         """Пошук схожих маршрутів."""
@@ -1060,48 +1169,37 @@ class MovementTab(ttk.Frame):
                     self.progress_bar['value'] = (file_idx / total_files) * 100
                     self.update_idletasks()
 
-                    df = pd.read_excel(file)
-                    df['Дата'] = pd.to_datetime(
-                        df['Дата'],
-                        format='%d.%m.%Y',
-                        dayfirst=True
-                    )
-                    df['Час'] = df['Час'].apply(self.parse_time)
-
-                    # Отримуємо маршрут за вказану дату
-                    base_route = df[
-                        df['Дата'].dt.date == selected_date.date()
-                        ].sort_values('Час')
+                    df, _ = prepare_frame(pd.read_excel(file))
+                    df = df.sort_values(['Дата', 'Час'], kind='stable')
 
-                    if len(base_route) == 0:
+                    if not (df['Дата'].dt.date == selected_date.date()).any():
                         continue
 
-                    # Шукаємо схожі маршрути
-                    similar_routes = []
-
-                    for date in df['Дата'].dt.date.unique():
-                        if date == selected_date.date():
-                            continue
-
-                        compare_route = df[
-                            df['Дата'].dt.date == date
-                            ].sort_values('Час')
+                    max_distance = float(self.max_distance.get())
+                    routes = {date: route for date, route in df.groupby(df['Дата'].dt.date, sort=False)}
+                    base_route = routes[selected_date.date()]
 
-                        if len(compare_route) == 0:
-                            continue
-
-                        similarity = self.calculate_route_similarity(
-                            base_route,
-                            compare_route,
-                            max_distance=float(self.max_distance.get())
+                    method = self._MATCHER_METHODS.get(self.similarity_method.get())
+                    if method is None:
+                        # Схожість усіх днів між собою одним обчисленням
+                        matrix = similarity_matrix(df, max_distance=max_distance)
+                        matches = most_similar_days(matrix, selected_date.date(), threshold=similarity_threshold)
+                    else:
+                        # Відстань max_distance відповідає 0% схожості, збіг маршрутів - 100%
+                        matrix = None
+                        matches, _ = RouteMatcher(df, method).query(
+                            selected_date.date(),
+                            max_distance=max_distance * (1 - similarity_threshold / 100)
                         )
+                        matches = [
+                            (date, (1 - distance / max_distance) * 100)
+                            for date, distance in matches
+                        ]
 
-                        if similarity >= similarity_threshold:
-                            similar_routes.append({
-                                'date': date,
-                                'similarity': similarity,
-                                'route': compare_route
-                            })
+                    similar_routes = [
+                        {'date': date, 'similarity': similarity, 'route': routes[date]}
+                        for date, similarity in matches
+                    ]
 
                     # Створюємо звіт, якщо знайдено схожі маршрути
                     if similar_routes:
@@ -1110,7 +1208,8 @@ class MovementTab(ttk.Frame):
                             similar_routes,
                             base_route,
                             selected_date,
-                            output_dir
+                            output_dir,
+                            matrix=matrix
                         )
 
                 except Exception as e:
@@ -1141,12 +1240,86 @@ class MovementTab(ttk.Frame):
             )
             self.log_text.see(tk.END)
 
+    def _find_similar_days_all(self) -> None:
+        """
+        Пошук днів усіх абонентів, схожих на маршрут номера 1 за вказану дату.
+
+        Використовується індекс відбитків маршрутів, який будується один раз
+        для завантаженого набору даних.
+        """
+        try:
+            if not self.traffic_files:
+                raise ValueError("Не вибрано файли трафіку")
+
+            try:
+                selected_date = datetime.strptime(self.similar_routes_date.get().strip(), '%d.%m.%Y')
+                similarity_threshold = float(self.similarity_threshold.get())
+                max_distance = float(self.max_distance.get())
+            except ValueError as e:
+                raise ValueError("Неправильний формат дати або параметрів пошуку") from e
+
+            subscriber = self.number1_var.get().strip()
+            if not subscriber:
+                raise ValueError("Оберіть номер 1 у блоці спільних переміщень")
+
+            dataset = self._load_dataset()
+            if self._route_index is None or self._route_index_source is not dataset:
+                self._route_index = RouteIndex(dataset.frame)
+                self._route_index_source = dataset
+
+            doc = self._route_index.find(subscriber, selected_date.date())
+            if doc is None:
+                raise ValueError(f"Немає даних номера {subscriber} за {selected_date.strftime('%d.%m.%Y')}")
+
+            results = self._route_index.query(
+                self._route_index.route(doc),
+                max_distance=max_distance,
+                threshold=similarity_threshold,
+                exclude=doc
+            )
+
+            output_dir = os.path.join(os.path.dirname(self.traffic_files[0]), "results")
+            os.makedirs(output_dir, exist_ok=True)
+            results_filename = os.path.join(
+                output_dir,
+                f"similar_days_{subscriber}_{selected_date.strftime('%Y%m%d')}.xlsx"
+            )
+            results.assign(
+                date=[date.strftime('%d.%m.%Y') for date in results['date']],
+                jaccard=results['jaccard'].round(3),
+                similarity=results['similarity'].round(2)
+            ).rename(columns={
+                'subscriber': 'Абонент',
+                'date': 'Дата',
+                'points': 'Кількість точок',
+                'jaccard': 'Оцінка MinHash',
+                'similarity': 'Схожість (%)'
+            }).to_excel(results_filename, index=False)
+
+            self.log_text.insert(
+                tk.END,
+                f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): "
+                f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"Current User's Login: {self.current_user}\n"
+                f"Знайдено {len(results)} схожих днів серед {len(self._route_index)} абонент-днів\n"
+                f"Результати збережено в: {results_filename}\n\n"
+            )
+            self.log_text.see(tk.END)
+
+        except Exception as e:
+            error_msg = f"Помилка пошуку схожих днів: {str(e)}"
+            messagebox.showerror("Помилка", error_msg)
+            logging.error(error_msg)
+            self.log_text.insert(tk.END, f"{error_msg}\n\n")
+            self.log_text.see(tk.END)
+
     def _create_similar_routes_report(
             self,
             similar_routes: List[Dict],
             base_route: pd.DataFrame,
             selected_date: datetime,
-            output_dir: str
+            output_dir: str,
+            matrix: Optional[pd.DataFrame] = None
     ) -> None:
         """
         Створення звіту про схожі маршрути.
@@ -1156,6 +1329,7 @@ class MovementTab(ttk.Frame):
             base_route: Базовий маршрут
             selected_date: Вибрана дата
             output_dir: Директорія для збереження
+            matrix: Матриця схожості всіх днів (зберігається окремим аркушем)
         """
         # Сортуємо за схожістю
         similar_routes.sort(key=lambda x: x['similarity'], reverse=True)
@@ -1200,6 +1374,15 @@ class MovementTab(ttk.Frame):
                 index=False
             )
 
+            # Зберігаємо матрицю схожості: рядок - день, колонка - день порівняння
+            if matrix is not None:
+                labels = [date.strftime('%d.%m.%Y') for date in matrix.index]
+                pd.DataFrame(
+                    matrix.to_numpy().round(2),
+                    index=labels,
+                    columns=labels
+                ).to_excel(writer, sheet_name='Матриця схожості')
+
         # Створюємо карту з маршрутами
         self._create_similar_routes_map(
             similar_routes,
@@ -1524,6 +1707,13 @@ class MovementTab(ttk.Frame):
             width=30  # Фіксована ширина кнопки
         ).pack(pady=2)
 
+        ttk.Button(
+            button_frame,
+            text="Номер 1 з усіма номерами",
+            command=self._analyze_common_movements_all,
+            width=30
+        ).pack(pady=2)
+
     def _select_traffic_files(self) -> None:
         """Вибір файлів трафіку та оновлення списків номерів."""
         files = filedialog.askopenfilenames(
@@ -1550,35 +1740,13 @@ class MovementTab(ttk.Frame):
     def _update_phone_numbers(self) -> None:
         """Оновлення списків номерів з файлів трафіку."""
         try:
-            all_numbers = set()
-
-            # Читаємо всі файли та збираємо унікальні номери
-            for file in self.traffic_files:
-                try:
-                    df = pd.read_excel(file)
-                    # Перевіряємо наявність колонки 'Абонент А'
-                    if 'Абонент А' in df.columns:
-                        # Конвертуємо номери в рядки та видаляємо пробіли
-                        numbers = df['Абонент А'].astype(str).str.strip()
-                        # Додаємо тільки непусті значення
-                        all_numbers.update(
-                            num for num in numbers
-                            if num and num.lower() != 'nan'
-                        )
-                    else:
-                        logging.warning(f"Не знайдено колонку 'Абонент А' у файлі {file}")
-
-                except Exception as e:
-                    logging.error(f"Помилка читання файлу {file}: {e}")
-                    continue
+            # Номери всіх файлів набору, зокрема номери лише з рядками без координат
+            sorted_numbers = self._load_dataset().listed_subscribers
 
             # Перевіряємо чи є номери
-            if not all_numbers:
+            if not sorted_numbers:
                 raise ValueError("Не знайдено жодного номера в файлах")
 
-            # Сортуємо номери
-            sorted_numbers = sorted(list(all_numbers))
-
             # Оновлюємо комбобокси
             if hasattr(self, 'number1_combo') and hasattr(self, 'number2_combo'):
                 self.number1_combo['values'] = sorted_numbers
@@ -1652,24 +1820,10 @@ class MovementTab(ttk.Frame):
             )
             os.makedirs(output_dir, exist_ok=True)
 
-            # Зчитуємо та обробляємо дані
-            all_data = []
-            for file in self.traffic_files:
-                df = pd.read_excel(file)
-                all_data.append(df)
-
-            # Об'єднуємо всі дані
-            combined_df = pd.concat(all_data, ignore_index=True)
-            combined_df['Дата'] = pd.to_datetime(
-                combined_df['Дата'],
-                format='%d.%m.%Y',
-                dayfirst=True
-            )
-            combined_df['Час'] = combined_df['Час'].apply(self.parse_time)
-
-            # Знаходимо дані для кожного номера
-            data1 = combined_df[combined_df['Абонент А'] == number1]
-            data2 = combined_df[combined_df['Абонент А'] == number2]
+            # Події кожного номера - діапазони індексу абонентів
+            dataset = self._load_dataset()
+            data1 = dataset.events(number1)
+            data2 = dataset.events(number2)
 
             if data1.empty or data2.empty:
                 raise ValueError("Дані для одного або обох номерів відсутні")
@@ -1727,60 +1881,74 @@ class MovementTab(ttk.Frame):
         Returns:
             List[Dict]: Список спільних переміщень
         """
-        common_movements = []
+        movements = find_co_locations(data1, data2, max_distance, time_window)
+        return movements.drop(columns='Абонент2').to_dict('records')
 
-        # Групуємо дані за датою
-        for date in data1['Дата'].dt.date.unique():
-            day_data1 = data1[data1['Дата'].dt.date == date].sort_values('Час')
-            day_data2 = data2[data2['Дата'].dt.date == date].sort_values('Час')
+    def _analyze_common_movements_all(self) -> None:
+        """Спільні переміщення номера 1 з усіма іншими номерами вибраних файлів."""
+        try:
+            if not self.traffic_files:
+                raise ValueError("Не вибрано файли трафіку")
 
-            if day_data2.empty:
-                continue
+            number1 = self.number1_var.get()
+            if not number1:
+                raise ValueError("Виберіть номер 1")
 
-            # Перевіряємо кожну точку першого номера
-            for _, point1 in day_data1.iterrows():
-                point1_time = datetime.combine(
-                    date,
-                    point1['Час']
+            try:
+                max_distance = float(self.common_max_distance.get())
+                time_window = int(self.time_window.get())
+            except ValueError:
+                raise ValueError(
+                    "Неправильний формат відстані або часового вікна"
                 )
 
-                # Знаходимо відповідні точки другого номера
-                for _, point2 in day_data2.iterrows():
-                    point2_time = datetime.combine(
-                        date,
-                        point2['Час']
-                    )
+            output_dir = os.path.join(
+                os.path.dirname(self.traffic_files[0]),
+                "results"
+            )
+            os.makedirs(output_dir, exist_ok=True)
 
-                    # Перевіряємо часову різницю
-                    time_diff = abs(
-                        (point2_time - point1_time).total_seconds() / 60
-                    )
+            movements = one_vs_all(self._load_dataset().frame, number1, max_distance, time_window)
+            if movements.empty:
+                messagebox.showinfo(
+                    "Результат",
+                    "Спільних переміщень не знайдено"
+                )
+                return
 
-                    if time_diff > time_window:
-                        continue
+            summary = co_location_summary(movements)
+            excel_file = os.path.join(
+                output_dir,
+                f"common_movements_{number1}_all_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            )
+            with pd.ExcelWriter(excel_file) as writer:
+                summary.to_excel(writer, sheet_name='Зведення', index=False)
+                movements.assign(
+                    Координати1=movements['Координати1'].astype(str),
+                    Координати2=movements['Координати2'].astype(str)
+                ).to_excel(writer, sheet_name='Спільні переміщення', index=False)
 
-                    # Перевіряємо відстань
-                    distance = self.calculate_distance(
-                        point1['Широта'],
-                        point1['Довгота'],
-                        point2['Широта'],
-                        point2['Долгота']
-                    )
+            self.log_text.insert(
+                tk.END,
+                f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): "
+                f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"Current User's Login: {self.current_user}\n"
+                f"Номер {number1}: спільні переміщення з {len(summary)} номерами "
+                f"({len(movements)} подій)\n"
+                f"Результати збережено в: {excel_file}\n\n"
+            )
+            self.log_text.see(tk.END)
 
-                    if distance <= max_distance:
-                        common_movements.append({
-                            'Дата': date,
-                            'Час1': point1['Час'],
-                            'Адреса1': point1['Адреса БС'],
-                            'Час2': point2['Час'],
-                            'Адреса2': point2['Адреса БС'],
-                            'Відстань': round(distance, 2),
-                            'Часова_різниця': round(time_diff, 2),
-                            'Координати1': (point1['Широта'], point1['Довгота']),
-                            'Координати2': (point2['Широта'], point2['Довгота'])
-                        })
-
-        return common_movements
+        except Exception as e:
+            messagebox.showerror("Помилка", str(e))
+            self.log_text.insert(
+                tk.END,
+                f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): "
+                f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"Current User's Login: {self.current_user}\n"
+                f"Помилка: {str(e)}\n\n"
+            )
+            self.log_text.see(tk.END)
 
     def _save_common_movements_results(
             self,
@@ -0,0 +1,183 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import List, Optional
+import logging
+from ..core.address_registry import RegistryPager
+from ..core.database import Database
+
+
+class RegistryViewer(tk.Toplevel):
+    """Вікно посторінкового перегляду реєстру адрес з пошуком та сортуванням."""
+
+    HEADINGS = {
+        'address': 'Адреса',
+        'original_address': 'Оригінальна адреса',
+        'locality': 'Населений пункт',
+        'street': 'Вулиця',
+        'house_number': 'Номер',
+        'latitude': 'Широта',
+        'longitude': 'Довгота'
+    }
+
+    SEARCH_MODES = ["Префікс", "Нечіткий"]
+
+    def __init__(self, parent: tk.Widget, database: Database, page_size: int = 200):
+        """
+        Ініціалізація вікна перегляду.
+
+        Args:
+            parent: Батьківський віджет
+            database: Шар доступу до бази даних
+            page_size: Кількість рядків на сторінці
+        """
+        super().__init__(parent)
+        self.pager = RegistryPager(database, page_size)
+
+        self.sort_column = 'address'
+        self.descending = False
+        self.search = ''
+        # Ключі останніх рядків попередніх сторінок для переходу назад
+        self._page_starts: List[Optional[tuple]] = [None]
+        self._next_key: Optional[tuple] = None
+        self._total = 0
+
+        self.title("Вміст бази даних")
+        self.geometry("1000x600")
+
+        self._create_widgets()
+        self._reload()
+
+    def _create_widgets(self) -> None:
+        """Створення віджетів."""
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(search_frame, text="Пошук:").pack(side=tk.LEFT, padx=5)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=50)
+        search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        search_entry.bind('<Return>', lambda e: self._apply_search())
+
+        self.mode_var = tk.StringVar(value=self.SEARCH_MODES[0])
+        ttk.Combobox(
+            search_frame,
+            textvariable=self.mode_var,
+            values=self.SEARCH_MODES,
+            width=10,
+            state='readonly'
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(search_frame, text="Знайти", command=self._apply_search).pack(side=tk.LEFT, padx=5)
+
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        columns = tuple(RegistryPager.COLUMNS)
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+        for col in columns:
+            self.tree.heading(col, text=self.HEADINGS[col], command=lambda c=col: self._sort_by(c))
+            self.tree.column(col, width=250 if 'address' in col else 100)
+
+        self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        nav_frame = ttk.Frame(self)
+        nav_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.prev_button = ttk.Button(nav_frame, text="◀ Назад", command=self._prev_page)
+        self.prev_button.pack(side=tk.LEFT, padx=5)
+        self.next_button = ttk.Button(nav_frame, text="Вперед ▶", command=self._next_page)
+        self.next_button.pack(side=tk.LEFT, padx=5)
+
+        self.status_label = ttk.Label(nav_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+    def _apply_search(self) -> None:
+        """Застосування пошуку з поля введення."""
+        self.search = self.search_var.get().strip()
+        self._reload()
+
+    def _sort_by(self, column: str) -> None:
+        """Зміна сортування за натисканням на заголовок колонки."""
+        if column not in RegistryPager.SORT_COLUMNS:
+            return
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        self._reload()
+
+    def _reload(self) -> None:
+        """Перехід на першу сторінку з поточними пошуком та сортуванням."""
+        try:
+            self._page_starts = [None]
+
+            if self.search and self.mode_var.get() == "Нечіткий":
+                rows = self.pager.fuzzy(self.search)
+                self._total = len(rows)
+                self._next_key = None
+                self._show_rows(rows)
+                return
+
+            self._total = self.pager.count(self.search, self.sort_column)
+            self._load_page()
+
+        except Exception as e:
+            self._show_error(e)
+
+    def _show_error(self, error: Exception) -> None:
+        """Повідомлення про помилку читання бази."""
+        logging.error(f"Помилка перегляду бази даних: {error}")
+        messagebox.showerror("Помилка", f"Помилка перегляду бази даних: {error}", parent=self)
+
+    def _load_page(self) -> None:
+        """Завантаження сторінки, що починається після останнього збереженого ключа."""
+        # Зайвий рядок показує, чи є наступна сторінка
+        rows = self.pager.page(
+            self.search,
+            self.sort_column,
+            self.descending,
+            after=self._page_starts[-1],
+            limit=self.pager.page_size + 1
+        )
+        has_next = len(rows) > self.pager.page_size
+        rows = rows[:self.pager.page_size]
+        self._next_key = self.pager.page_key(rows[-1], self.sort_column) if has_next else None
+        self._show_rows(rows)
+
+    def _show_rows(self, rows: List[tuple]) -> None:
+        """Заміна вмісту таблиці рядками сторінки."""
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert('', tk.END, values=['' if v is None else v for v in row])
+
+        page = len(self._page_starts)
+        self.status_label.config(text=f"Сторінка {page}, записів: {self._total}")
+        self.prev_button.config(state=tk.NORMAL if page > 1 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if self._next_key is not None else tk.DISABLED)
+
+    def _next_page(self) -> None:
+        """Перехід на наступну сторінку."""
+        if self._next_key is None:
+            return
+        self._page_starts.append(self._next_key)
+        try:
+            self._load_page()
+        except Exception as e:
+            self._page_starts.pop()
+            self._show_error(e)
+
+    def _prev_page(self) -> None:
+        """Перехід на попередню сторінку."""
+        if len(self._page_starts) <= 1:
+            return
+        current = self._page_starts.pop()
+        try:
+            self._load_page()
+        except Exception as e:
+            self._page_starts.append(current)
+            self._show_error(e)
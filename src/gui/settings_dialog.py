@@ -187,6 +187,9 @@ class SettingsDialog(tk.Toplevel):
                 hours, minutes = map(int, time_str.split(':'))
                 if not (0 <= hours < 24 and 0 <= minutes < 60):
                     raise ValueError("Неправильний формат часу")
+
+            if self.day_start_var.get().strip() == self.day_end_var.get().strip():
+                raise ValueError("Початок і кінець дня мають відрізнятися")
                     
             return True
             
@@ -216,7 +219,8 @@ class SettingsDialog(tk.Toplevel):
             }
             
             # Зберігаємо конфігурацію
-            self.config._save_config(new_config)
+            for section, values in new_config.items():
+                self.config.set(section, {**(self.config.get(section) or {}), **values})
             
             messagebox.showinfo(
                 "Успіх",
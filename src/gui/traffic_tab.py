@@ -7,13 +7,26 @@ import os
 from datetime import datetime, timedelta, time  # Додано timedelta
 from math import radians, sin, cos, sqrt, atan2, degrees
 from shapely.geometry import Point, shape
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Mapping, Optional, Tuple
 from pathlib import Path
 import logging
-from fuzzywuzzy import fuzz
 import re
+from fuzzywuzzy import fuzz
 from ..utils.config import Config
 from ..core.data_processor import DataProcessor
+from ..core.address_normalizer import normalize_address, parse_address
+from ..core.address_registry import load_registry_snapshot
+from ..core.address_resolver import AddressResolver
+from ..core.cell_registry import CellRegistry
+from ..core.day_period import DAY, DayWindow
+from ..core.district_assignment import DistrictAssigner, assign_districts, daily_trajectories
+from ..core.trajectory_index import TrajectoryIndex
+from ..core.gazetteer import Gazetteer
+from ..core.resolution_cache import ResolutionCache
+from ..core.registry_backup import RegistryBackup
+from ..core.registry_importer import create_registry_schema
+from ..core.traffic_dataset import PERIOD_COLUMN, TrafficDataset
+from .registry_viewer import RegistryViewer
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
@@ -22,6 +35,9 @@ import folium
 from folium import plugins
 
 class TrafficTab(ttk.Frame):
+    # Максимальна кількість рядків аркуша Excel (з рядком заголовків)
+    EXCEL_MAX_ROWS = 1_048_576
+
     def __init__(self, parent: ttk.Notebook, config: 'Config', data_processor: 'DataProcessor'):
         """
         Ініціалізація вкладки обробки трафіку.
@@ -36,12 +52,22 @@ class TrafficTab(ttk.Frame):
         # Зберігаємо залежності
         self.config = config
         self.data_processor = data_processor
+        self.database = data_processor.database
+        self.registry_backup = RegistryBackup(
+            self.database,
+            keep=config.get('database.backup_keep', 10)
+        )
 
         # Ініціалізація змінних
         self.current_time = datetime.now()
         self.current_user = os.getenv('USERNAME', 'Unknown')
         self.traffic_files = []
         self.date_filter_file = None
+        self.district_assigner: Optional[DistrictAssigner] = None
+
+        # Індекс траєкторій районів (перебудовується лише при зміні файлів або шару районів)
+        self._trajectory_index: Optional[TrajectoryIndex] = None
+        self._trajectory_index_key: Optional[tuple] = None
 
         # Створюємо прогрес-бар
         self.progress_bar = ttk.Progressbar(self, mode='determinate')
@@ -69,6 +95,7 @@ class TrafficTab(ttk.Frame):
             ("Вибрати файли трафіку", self._select_traffic_files),
             ("Вибрати GeoJSON", self._select_geojson),
             ("Обробити", self._process_files),
+            ("Геокодувати адреси", self._geocode_no_coords),
             ("Об'єднати файли", lambda: self.data_processor.merge_traffic_files()),
             ("Знайти зустрічі", self.find_meetings),
             ("Аналіз активності", self._analyze_activity)
@@ -184,10 +211,63 @@ class TrafficTab(ttk.Frame):
             command=self._filter_by_date
         ).pack(side=tk.LEFT, padx=5)
 
+        # Фрейм пошуку за траєкторіями районів
+        trajectory_frame = ttk.LabelFrame(main_frame, text="Траєкторії районів")
+        trajectory_frame.grid(row=3, column=0, sticky='ew', padx=5, pady=5)
+
+        path_frame = ttk.Frame(trajectory_frame)
+        path_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(path_frame, text="Шлях (A > B > C):").pack(side=tk.LEFT, padx=5)
+        self.trajectory_path = tk.StringVar()
+        ttk.Entry(
+            path_frame,
+            textvariable=self.trajectory_path,
+            width=40
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.trajectory_contiguous = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            path_frame,
+            text="Райони підряд",
+            variable=self.trajectory_contiguous
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            path_frame,
+            text="Хто проходив шлях",
+            command=self._find_path_followers
+        ).pack(side=tk.LEFT, padx=5)
+
+        subpath_frame = ttk.Frame(trajectory_frame)
+        subpath_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(subpath_frame, text="Довжина ділянки:").pack(side=tk.LEFT, padx=5)
+        self.subpath_length = tk.StringVar(value="3")
+        ttk.Entry(
+            subpath_frame,
+            textvariable=self.subpath_length,
+            width=5
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(subpath_frame, text="Мін. абонентів:").pack(side=tk.LEFT, padx=5)
+        self.subpath_min_subscribers = tk.StringVar(value="2")
+        ttk.Entry(
+            subpath_frame,
+            textvariable=self.subpath_min_subscribers,
+            width=5
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            subpath_frame,
+            text="Спільні ділянки шляхів",
+            command=self._export_frequent_subpaths
+        ).pack(side=tk.LEFT, padx=5)
+
         # Фрейм для логу операцій (нижній ряд)
         log_frame = ttk.LabelFrame(main_frame, text="Лог операцій")
-        log_frame.grid(row=3, column=0, sticky='nsew', padx=5, pady=5)
-        main_frame.rowconfigure(3, weight=1)
+        log_frame.grid(row=4, column=0, sticky='nsew', padx=5, pady=5)
+        main_frame.rowconfigure(4, weight=1)
 
         # Текстове поле для логу
         self.log_text = tk.Text(log_frame, wrap=tk.WORD, height=10)
@@ -212,88 +292,69 @@ class TrafficTab(ttk.Frame):
         self.log_text.see(tk.END)
 
     def _backup_database(self):
-        """Експорт бази даних в Excel файл."""
+        """Створення стисненого знімка бази даних."""
         try:
-            # Підключаємось до бази
-            conn = sqlite3.connect("addresses.db")
-            cursor = conn.cursor()
-
-            # Отримуємо всі записи (змінюємо запит щоб отримати тільки існуючі колонки)
-            cursor.execute(
-                "SELECT address, latitude, longitude FROM addresses"
-            )
-            rows = cursor.fetchall()
-
-            if not rows:
+            if not os.path.exists(self.database.path):
                 messagebox.showwarning(
                     "Попередження",
                     "База даних порожня"
                 )
                 return
 
-            # Створюємо DataFrame
-            df = pd.DataFrame(
-                rows,
-                columns=['Адреса', 'Широта', 'Довгота']
-            )
+            stats = self.registry_backup.create()
 
-            # Вибираємо шлях для збереження
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel файли", "*.xlsx")],
-                title="Зберегти базу даних як"
+            self.log_text.insert(
+                tk.END,
+                f"Створено знімок бази: {stats['path']} "
+                f"({stats['size'] / 1024 / 1024:.1f} МБ, {stats['seconds']:.1f} с)\n"
             )
-
-            if not file_path:
-                return
-
-            # Зберігаємо в Excel
-            df.to_excel(file_path, index=False)
+            self.log_text.see(tk.END)
 
             messagebox.showinfo(
                 "Успіх",
-                f"База даних експортована в {file_path}\n"
-                f"Збережено {len(rows)} записів"
+                f"Знімок бази даних збережено в {stats['path']}\n"
+                f"Час: {stats['seconds']:.1f} с"
             )
 
-            conn.close()
-
         except Exception as e:
             messagebox.showerror(
                 "Помилка",
-                f"Помилка експорту бази даних: {e}"
+                f"Помилка резервування бази даних: {e}"
             )
 
     def _restore_database(self):
-        """Відновлення бази даних з Excel файлу."""
+        """Відновлення бази даних зі знімка."""
         try:
-            # Вибираємо файл для імпорту
+            # Вибираємо знімок, за замовчуванням - з теки резервних копій
             file_path = filedialog.askopenfilename(
-                title="Виберіть файл для відновлення бази",
-                filetypes=[("Excel файли", "*.xlsx")]
+                title="Виберіть знімок для відновлення бази",
+                initialdir=self.registry_backup.backup_dir,
+                filetypes=[("Знімки бази", "*.db.gz")]
             )
 
             if not file_path:
                 return
 
-            # Імпортуємо дані
-            conn = self.data_processor.import_addresses_to_sqlite(
-                file_path=file_path
-            )
+            if not messagebox.askyesno(
+                    "Підтвердження",
+                    "Поточний вміст бази буде замінено вмістом знімка. Продовжити?"
+            ):
+                return
 
-            if conn:
-                # Перевіряємо кількість записів
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM addresses")
-                count = cursor.fetchone()[0]
+            stats = self.registry_backup.restore(file_path)
 
-                messagebox.showinfo(
-                    "Успіх",
-                    f"База даних відновлена з {file_path}\n"
-                    f"Імпортовано {count} записів"
-                )
+            self.log_text.insert(
+                tk.END,
+                f"Базу відновлено зі знімка {file_path}: {stats['rows']} записів, "
+                f"{stats['seconds']:.1f} с\n"
+            )
+            self.log_text.see(tk.END)
 
-                conn.close()
+            messagebox.showinfo(
+                "Успіх",
+                f"База даних відновлена з {file_path}\n"
+                f"Всього записів в базі: {stats['rows']}"
+            )
 
         except Exception as e:
             messagebox.showerror(
@@ -304,29 +365,14 @@ class TrafficTab(ttk.Frame):
     def _recreate_database(self):
         """Очищення і перестворення бази даних."""
         try:
-            # Видаляємо стару базу
-            if os.path.exists("addresses.db"):
-                os.remove("addresses.db")
+            # Закриваємо з'єднання та видаляємо стару базу разом з WAL-файлами
+            self.database.close_all()
+            for path in (self.database.path, f"{self.database.path}-wal", f"{self.database.path}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
 
-            # Створюємо нову базу
-            conn = sqlite3.connect("addresses.db")
-            cursor = conn.cursor()
-
-            # Створюємо таблицю
-            cursor.execute('''
-                CREATE TABLE addresses (
-                    address TEXT PRIMARY KEY,
-                    original_address TEXT,
-                    latitude REAL,
-                    longitude REAL
-                )
-            ''')
-
-            # Створюємо індекс
-            cursor.execute('CREATE INDEX idx_address ON addresses (address)')
-
-            conn.commit()
-            conn.close()
+            # Створюємо нову базу з порожнім реєстром
+            create_registry_schema(self.database)
 
             self.log_text.insert(
                 tk.END,
@@ -351,35 +397,13 @@ class TrafficTab(ttk.Frame):
     def _show_database_content(self):
         """Показати вміст бази даних."""
         try:
-            conn = sqlite3.connect("addresses.db")
-            cursor = conn.cursor()
-
-            # Отримуємо всі записи
-            cursor.execute("SELECT * FROM addresses")
-            rows = cursor.fetchall()
-
-            if not rows:
+            if not self.database.table_exists('addresses') or \
+                    self.database.query_one("SELECT 1 FROM addresses LIMIT 1") is None:
                 messagebox.showinfo("База даних", "База даних порожня")
                 return
 
-            # Створюємо нове вікно
-            window = tk.Toplevel(self)
-            window.title("Вміст бази даних")
-            window.geometry("800x600")
-
-            # Створюємо текстове поле з прокруткою
-            text = tk.Text(window, wrap=tk.WORD)
-            text.pack(fill=tk.BOTH, expand=True)
-
-            # Додаємо записи
-            for row in rows:
-                text.insert(tk.END, f"Адреса: {row[0]}\n")
-                text.insert(tk.END, f"Оригінальна адреса: {row[1]}\n")
-                text.insert(tk.END, f"Широта: {row[2]}\n")
-                text.insert(tk.END, f"Довгота: {row[3]}\n")
-                text.insert(tk.END, "-" * 50 + "\n")
-
-            conn.close()
+            # Вікно читає реєстр посторінково, в пам'яті лише видима сторінка
+            RegistryViewer(self, self.database)
 
         except Exception as e:
             messagebox.showerror("Помилка", f"Помилка перегляду бази даних: {e}")
@@ -397,31 +421,26 @@ class TrafficTab(ttk.Frame):
                 return
 
             # Завантаження даних в базу
-            conn = self.data_processor.import_addresses_to_sqlite(
+            stats = self.data_processor.import_addresses_to_sqlite(
                 file_path=file_path
             )
 
-            if conn:
-                # Перевіряємо кількість записів
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM addresses")
-                count = cursor.fetchone()[0]
-
-                self.log_text.insert(
-                    tk.END,
-                    f"Завантажено базові станції з файлу: {file_path}\n"
-                    f"Всього записів в базі: {count}\n"
-                )
-                self.log_text.see(tk.END)
-
-                conn.close()
+            self.log_text.insert(
+                tk.END,
+                f"Завантажено базові станції з файлу: {file_path}\n"
+                f"Імпортовано записів: {stats['rows']}, пропущено: {stats['skipped']}\n"
+                f"Час імпорту: {stats['seconds']:.2f} с "
+                f"({stats['rows_per_second']:.0f} записів/с)\n"
+                f"Всього записів в базі: {stats['total']}\n"
+            )
+            self.log_text.see(tk.END)
 
-                # Показуємо повідомлення про успіх
-                messagebox.showinfo(
-                    "Успіх",
-                    f"Базові станції успішно завантажено\n"
-                    f"Всього записів в базі: {count}"
-                )
+            # Показуємо повідомлення про успіх
+            messagebox.showinfo(
+                "Успіх",
+                f"Базові станції успішно завантажено\n"
+                f"Всього записів в базі: {stats['total']}"
+            )
 
         except Exception as e:
             error_msg = f"Помилка завантаження базових станцій: {str(e)}"
@@ -550,19 +569,42 @@ class TrafficTab(ttk.Frame):
             logging.error(error_msg)
 
     def _select_geojson(self):
-        """Вибір файлу GeoJSON з полігонами."""
+        """Вибір файлу GeoJSON або GeoPackage з полігонами районів."""
         file = filedialog.askopenfilename(
             title="Виберіть файл GeoJSON",
-            filetypes=[("GeoJSON файли", "*.geojson"), ("Всі файли", "*.*")]
+            filetypes=[
+                ("GeoJSON файли", "*.geojson"),
+                ("GeoPackage файли", "*.gpkg"),
+                ("Всі файли", "*.*")
+            ]
         )
         if file:
             self.geojson_file = file
+            try:
+                self.district_assigner = DistrictAssigner.from_file(file)
+                districts = f"завантажено районів: {len(self.district_assigner.polygons)}"
+            except Exception as e:
+                self.district_assigner = None
+                districts = f"райони не завантажено ({e})"
+                logging.error(f"Помилка завантаження шару районів {file}: {e}")
             self.log_text.insert(
                 tk.END,
-                f"Вибрано файл полігонів: {file}\n"
+                f"Вибрано файл полігонів: {file}, {districts}\n"
             )
             self.log_text.see(tk.END)
 
+    def assign_districts(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Райони подій: за завантаженим шаром полігонів, інакше - умовні зони 0.1°.
+
+        Args:
+            df: Події з колонками Широта, Долгота
+
+        Returns:
+            pd.Series: Назви районів
+        """
+        return assign_districts(df, self.district_assigner)
+
     @staticmethod
     def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
@@ -585,78 +627,39 @@ class TrafficTab(ttk.Frame):
         c = 2 * atan2(sqrt(a), sqrt(1 - a))
         return R * c
 
-    def extract_street_and_number(address):
-        """
-        Розділяє адресу на компоненти.
-
-        Args:
-            address (str): Повна адреса
-
-        Returns:
-            tuple: (регіон, район, населений пункт, вулиця, номер)
-        """
-        try:
-            # Нормалізуємо адресу
-            parts = address.split(',')
-            parts = [p.strip() for p in parts]
-
-            region = None
-            district = None
-            locality = None
-            street = None
-            number = None
-
-            # Шукаємо компоненти
-            for part in parts:
-                part = part.upper()
-                if 'ОБЛАСТЬ' in part or 'ОБЛ.' in part:
-                    region = part
-                elif 'РАЙОН' in part:
-                    district = part
-                elif any(x in part for x in ['М.', 'МІСТО', 'С.', 'СЕЛО', 'СМТ']):
-                    locality = part
-                elif any(x in part for x in ['ВУЛ.', 'ВУЛИЦЯ', 'БУЛ.', 'БУЛЬВАР', 'ПР.', 'ПРОСПЕКТ']):
-                    # Виділяємо номер будинку, якщо є
-                    match = re.search(r'(.+?)\s*(?:(?:БУД\.|БУДИНОК|Б\.)\s*)?(\d+(?:\/\d+)?)?$', part)
-                    if match:
-                        street = match.group(1).strip()
-                        number = match.group(2)
-                    else:
-                        street = part
-
-            return region, district, locality, street, number
-
-        except Exception as e:
-            logging.error(f"Помилка при розборі адреси {address}: {str(e)}")
-            return None, None, None, None, None
-
-    def find_closest_address(address, conn, threshold=90):
+    def find_closest_address(address, database, threshold=90):
         """
         Знаходить найближчу адресу в базі даних.
 
         Args:
             address (str): Адреса для пошуку
-            conn: З'єднання з базою даних
+            database: Шар доступу до бази даних
             threshold (int): Поріг схожості (за замовчуванням 90)
 
         Returns:
             tuple: (широта, довгота) або None якщо не знайдено
         """
         try:
-            normalized_address = ' '.join(str(address).split()).upper()
-            traffic_region, traffic_district, traffic_locality, traffic_street, traffic_number = extract_street_and_number(
+            normalized_address = normalize_address(address)
+            traffic_region, traffic_district, traffic_locality, traffic_street, traffic_number = parse_address(
                 normalized_address)
 
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM addresses")
-            if cursor.fetchone()[0] == 0:
+            if database.query_one("SELECT COUNT(*) FROM addresses")[0] == 0:
                 logging.error("База адресов пуста")
                 return None
 
-            query = "SELECT address, latitude, longitude FROM addresses WHERE address LIKE ?"
-            search_pattern = f"%{traffic_street or normalized_address}%"
-            cursor.execute(query, (search_pattern,))
-            candidates = cursor.fetchall()
+            # Компоненти адрес реєстру розібрані при імпорті, кандидати беремо за індексом вулиці
+            columns = "address, latitude, longitude, region, district, locality, street, house_number"
+            if traffic_street:
+                candidates = database.query(
+                    f"SELECT {columns} FROM addresses WHERE street = ?",
+                    (traffic_street,)
+                )
+            else:
+                candidates = database.query(
+                    f"SELECT {columns} FROM addresses WHERE address LIKE ?",
+                    (f"%{normalized_address}%",)
+                )
 
             if not candidates:
                 logging.warning(f"Для адреса {address} не найдено кандидатов")
@@ -667,8 +670,7 @@ class TrafficTab(ttk.Frame):
             best_coords = None
 
             for candidate in candidates:
-                db_address, latitude, longitude = candidate
-                db_region, db_district, db_locality, db_street, db_number = extract_street_and_number(db_address)
+                db_address, latitude, longitude, db_region, db_district, db_locality, db_street, db_number = candidate
 
                 score = fuzz.ratio(normalized_address, db_address)
                 if score >= threshold and score > best_score:
@@ -701,38 +703,24 @@ class TrafficTab(ttk.Frame):
             logging.error(f"Помилка пошуку адреси {address}: {str(e)}")
             return None
 
-    def load_address_coords_from_db(self):
+    def load_address_coords_from_db(self) -> Mapping:
         """
         Завантажує словник координат з SQLite бази даних.
-        """
-        unique_address_coords = {}
-        db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'addresses.db')
 
+        Returns:
+            Mapping: Знімок реєстру адреса -> (широта, довгота), спільний для всіх споживачів
+        """
         try:
-            if not os.path.exists(db_path):
-                logging.error(f"База даних не знайдена: {db_path}")
-                return unique_address_coords
-
-            conn = sqlite3.connect(db_path)
-
-            # Для кожної адреси спробуємо знайти найближчу відповідність
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT address FROM addresses")
-            addresses = cursor.fetchall()
-
-            for (address,) in addresses:
-                coords = find_closest_address(address, conn)
-                if coords:
-                    unique_address_coords[str(address).strip()] = coords
+            snapshot = load_registry_snapshot(self.database)
+            if snapshot is None:
+                return {}
 
-            logging.info(f"Завантажено {len(unique_address_coords)} адрес з бази даних")
-
-            conn.close()
-            return unique_address_coords
+            logging.info(f"Завантажено {len(snapshot)} адрес з бази даних")
+            return snapshot
 
         except Exception as e:
             logging.error(f"Помилка при завантаженні координат з бази даних: {str(e)}")
-            return unique_address_coords
+            return {}
 
     def create_temp_traffic_db(self, meetings_files):
         """
@@ -957,14 +945,6 @@ class TrafficTab(ttk.Frame):
             if not self.traffic_files:
                 raise ValueError("Не вибрано файли трафіку")
 
-            # Отримуємо параметри
-            try:
-                max_distance = float(self.max_distance.get())
-                day_min_duration = int(self.day_min_duration.get())
-                night_min_duration = int(self.night_min_duration.get())
-            except ValueError as e:
-                raise ValueError("Неправильний формат параметрів") from e
-
             # Створюємо директорію для результатів
             output_dir = os.path.join(
                 os.path.dirname(self.traffic_files[0]),
@@ -973,26 +953,33 @@ class TrafficTab(ttk.Frame):
             os.makedirs(output_dir, exist_ok=True)
 
             # Ініціалізуємо список для адрес без координат
-            no_coords_data = []
+            self.no_coords_data = []
 
-            # Завантажуємо словник координат з бази даних
-            unique_address_coords = self.load_address_coords_from_db()
+            # Реєстр сот для join за LAC/CI або хешем адреси
+            cell_registry = CellRegistry(self.database)
 
-            if not unique_address_coords:
+            # Нечітке зіставлення для адрес, яких немає в реєстрі сот
+            unique_address_coords = self.load_address_coords_from_db()
+            resolver = None
+            if unique_address_coords:
+                resolver = AddressResolver.from_snapshot(
+                    unique_address_coords,
+                    threshold=self.config.get('traffic.similarity_threshold', 90),
+                    cache=ResolutionCache(self.database)
+                )
+            else:
                 logging.warning("Не знайдено координат в базі даних")
 
             # Обробляємо кожен файл
             processed_files = []
-            for file in self.traffic_files:
+            self.progress_bar['maximum'] = len(self.traffic_files)
+            self.progress_bar['value'] = 0
+            for idx, file in enumerate(self.traffic_files, 1):
                 try:
-                    # Викликаємо process_traffic_file як глобальну функцію
-                    output_file, polygons_file = process_traffic_file(
+                    output_file = self.process_traffic_file(
                         file,
-                        unique_address_coords,
-                        self.geojson_file if hasattr(self, 'geojson_file') else None,
-                        no_coords_data,
-                        self.progress_bar,
-                        self,
+                        cell_registry,
+                        resolver,
                         output_dir
                     )
 
@@ -1003,6 +990,10 @@ class TrafficTab(ttk.Frame):
                     logging.error(f"Помилка обробки файлу {file}: {str(e)}")
                     continue
 
+                finally:
+                    self.progress_bar['value'] = idx
+                    self.update_idletasks()
+
             # Зберігаємо список адрес без координат
             if self.no_coords_data:
                 output_dir = os.path.dirname(self.traffic_files[0])
@@ -1012,6 +1003,15 @@ class TrafficTab(ttk.Frame):
                     f"Збережено список адрес без координат\n"
                 )
 
+                # Геокодування газетиром, якщо його вже вказано в налаштуваннях
+                if os.path.isfile(self.config.get('traffic.gazetteer_path') or ''):
+                    self._geocode_no_coords(output_dir)
+                else:
+                    self.log_text.insert(
+                        tk.END,
+                        "Адреси без координат можна геокодувати кнопкою \"Геокодувати адреси\"\n"
+                    )
+
             # Виводимо підсумок
             self.log_text.insert(
                 tk.END,
@@ -1026,6 +1026,111 @@ class TrafficTab(ttk.Frame):
             messagebox.showerror("Помилка", str(e))
             logging.error(f"Помилка обробки файлів: {e}")
 
+    def process_traffic_file(
+            self,
+            file: str,
+            cell_registry: CellRegistry,
+            resolver: Optional[AddressResolver],
+            output_dir: str
+    ) -> Optional[str]:
+        """
+        Додавання координат БС до одного файлу трафіку.
+
+        Координати приєднуються за ключем соти (LAC/CI або хеш адреси),
+        рядки без координат додаються до self.no_coords_data. Якщо вибрано
+        шар районів, події отримують колонку Район.
+
+        Args:
+            file: Шлях до файлу трафіку
+            cell_registry: Реєстр сот
+            resolver: Обробник нечіткого зіставлення адрес або None
+            output_dir: Тека для збереження результату
+
+        Returns:
+            Optional[str]: Шлях до збереженого файлу або None, якщо файл порожній
+        """
+        df = pd.read_excel(file)
+        if df.empty:
+            logging.warning(f"Файл {file} порожній")
+            return None
+
+        matched, unmatched = cell_registry.enrich(df, 'Адреса БС', resolver)
+
+        # Район кожної події за завантаженим шаром полігонів
+        if self.district_assigner is not None and not matched.empty:
+            matched['Район'] = self.assign_districts(matched)
+
+        if not unmatched.empty and 'Адреса БС' in unmatched.columns:
+            self.no_coords_data.extend(
+                unmatched[['Адреса БС']].dropna().to_dict('records')
+            )
+
+        output_file = os.path.join(
+            output_dir,
+            f"{Path(file).stem}_coords.xlsx"
+        )
+        matched.to_excel(output_file, index=False)
+
+        self.log_text.insert(
+            tk.END,
+            f"Оброблено {os.path.basename(file)}: з координатами {len(matched)}, "
+            f"без координат {len(unmatched)}\n"
+        )
+        logging.info(f"Збережено файл з координатами: {output_file}")
+        return output_file
+
+    def _geocode_no_coords(self, output_dir: Optional[str] = None):
+        """
+        Геокодування адрес без координат за локальним газетиром.
+
+        Газетир береться з traffic.gazetteer_path, інакше вибирається
+        користувачем і запам'ятовується в налаштуваннях.
+
+        Args:
+            output_dir: Тека файлу "БС без координат.xlsx" для оновлення (None - не оновлювати)
+        """
+        try:
+            addresses = [row['Адреса БС'] for row in getattr(self, 'no_coords_data', [])]
+            if not addresses:
+                no_coords_file = filedialog.askopenfilename(
+                    title="Виберіть файл з адресами без координат",
+                    filetypes=[("Excel файли", "*.xlsx")]
+                )
+                if not no_coords_file:
+                    return
+                addresses = pd.read_excel(no_coords_file)['Адреса БС'].dropna().tolist()
+
+            gazetteer_file = self.config.get('traffic.gazetteer_path') or ''
+            if not os.path.isfile(gazetteer_file):
+                gazetteer_file = filedialog.askopenfilename(
+                    title="Виберіть файл газетира",
+                    filetypes=[("Газетир", "*.csv *.gpkg"), ("Всі файли", "*.*")]
+                )
+                if not gazetteer_file:
+                    return
+                self.config.set('traffic.gazetteer_path', gazetteer_file)
+
+            gazetteer = Gazetteer.from_file(gazetteer_file)
+            resolved = gazetteer.resolve(addresses)
+            stats = Gazetteer.write_to_registry(self.database, resolved)
+
+            unresolved = resolved[resolved['latitude'].isna()]
+            self.no_coords_data = [{'Адреса БС': a} for a in unresolved['raw_address']]
+            if output_dir:
+                self._save_no_coords_file(output_dir)
+
+            self.log_text.insert(
+                tk.END,
+                f"Геокодовано газетиром: {stats['rows']} з {len(resolved)} адрес, "
+                f"лишилось без координат: {len(unresolved)}\n"
+                f"Знайдені координати додано до реєстру та буде застосовано при повторній обробці\n"
+            )
+            self.log_text.see(tk.END)
+
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Помилка геокодування: {e}")
+            logging.error(f"Помилка геокодування: {e}")
+
     def _get_current_datetime_and_user(self) -> str:
         """
         Отримати поточні дату, час та користувача.
@@ -1145,7 +1250,14 @@ class TrafficTab(ttk.Frame):
 
             # Додаємо місяць та рік до даних
             combined_df['Місяць_Рік'] = combined_df['Дата'].dt.strftime('%Y-%m')
-            combined_df['Година'] = pd.to_datetime(combined_df['Час'], format='%H:%M:%S').dt.hour
+            event_time = pd.to_datetime(combined_df['Час'], format='%H:%M:%S')
+            combined_df['Година'] = event_time.dt.hour
+
+            # Період доби за налаштованим денним вікном
+            window = DayWindow.from_config(self.config)
+            combined_df[PERIOD_COLUMN] = window.labels(
+                window.is_day_minutes((event_time.dt.hour * 60 + event_time.dt.minute).to_numpy())
+            )
 
             # Групуємо дані по місяцях
             months = sorted(combined_df['Місяць_Рік'].unique())
@@ -1173,7 +1285,7 @@ class TrafficTab(ttk.Frame):
                 # Графік активності по годинах
                 hourly_activity = month_data.groupby('Година').size()
                 ax2 = fig.add_subplot(122)
-                hourly_activity.plot(kind='bar', ax=ax2)
+                hourly_activity.plot(kind='bar', ax=ax2, color=self._hour_colors(hourly_activity.index, window))
                 ax2.set_title('Активність по годинах')
                 ax2.set_xlabel('Година')
                 ax2.set_ylabel('Кількість подій')
@@ -1192,9 +1304,12 @@ class TrafficTab(ttk.Frame):
                 avg_daily = total_events / unique_dates if unique_dates > 0 else 0
                 peak_hour = hourly_activity.idxmax() if not hourly_activity.empty else 0
                 peak_day = daily_activity.idxmax() if not daily_activity.empty else None
+                day_events = int((month_data[PERIOD_COLUMN] == DAY).sum())
 
                 stats_text = (
                     f"Загальна кількість подій: {total_events}\n"
+                    f"Вдень / вночі: {day_events} / {total_events - day_events} "
+                    f"(день {window.format(window.start)}-{window.format(window.end)})\n"
                     f"Кількість днів: {unique_dates}\n"
                     f"Середня кількість подій за день: {avg_daily:.2f}\n"
                     f"Пікова година: {peak_hour}:00\n"
@@ -1228,6 +1343,12 @@ class TrafficTab(ttk.Frame):
             )
             self.log_text.see(tk.END)
 
+    @staticmethod
+    def _hour_colors(hours, window: DayWindow) -> List[str]:
+        """Кольори стовпців погодинного графіка: денні години - помаранчеві, нічні - сині."""
+        is_day = window.is_day_minutes(np.asarray(hours, dtype=int) * 60)
+        return ['#f0a30a' if day else '#1f3a93' for day in is_day]
+
     def _analyze_specific_date(self):
         """Аналіз активності за конкретний день."""
         try:
@@ -1269,9 +1390,10 @@ class TrafficTab(ttk.Frame):
             fig = Figure(figsize=(12, 8))
 
             # Графік активності по годинах
+            window = DayWindow.from_config(self.config)
             hourly_activity = day_data.groupby('Година').size()
             ax1 = fig.add_subplot(211)
-            hourly_activity.plot(kind='bar', ax=ax1)
+            hourly_activity.plot(kind='bar', ax=ax1, color=self._hour_colors(hourly_activity.index, window))
             ax1.set_title(f'Активність по годинах за {date_str}')
             ax1.set_xlabel('Година')
             ax1.set_ylabel('Кількість подій')
@@ -2804,30 +2926,144 @@ class TrafficTab(ttk.Frame):
             output_dir
         )
 
-    @staticmethod
-    def assign_district_by_coords(lat, lon):
-        """Присвоєння району за координатами."""
-        if pd.isna(lat) or pd.isna(lon):
-            return "Неизвестный"
-        lat_zone = int(lat * 10) / 10
-        lon_zone = int(lon * 10) / 10
-        return f"Зона_{lat_zone}_{lon_zone}"
+    def assign_district_by_coords(self, lat, lon):
+        """Присвоєння району за координатами (за шаром районів або умовною зоною 0.1°)."""
+        return self.assign_districts(pd.DataFrame({'Широта': [lat], 'Долгота': [lon]})).iloc[0]
 
-    @staticmethod
-    def get_daily_trajectories(df):
-        """Отримання щоденних траєкторій."""
-        trajectories = {}
-        grouped = df.groupby('Дата')
-        for date, group in grouped:
-            group = group.sort_values('Час')
-            districts = group['district'].tolist()
-            cleaned_districts = [districts[0]] if districts else []
-            for d in districts[1:]:
-                if d != cleaned_districts[-1]:
-                    cleaned_districts.append(d)
-            if cleaned_districts:
-                trajectories[date] = cleaned_districts
-        return trajectories
+    def build_trajectory_index(self, df: pd.DataFrame) -> TrajectoryIndex:
+        """
+        Індекс траєкторій районів усіх абонент-днів для пошуку шляхів і спільних ділянок.
+
+        Райони визначаються за завантаженим шаром; без шару використовується
+        колонка Район оброблених файлів, а за її відсутності - умовні зони 0.1°.
+
+        Args:
+            df: Події з колонками Абонент А, Дата, Час, Широта, Долгота (або Довгота)
+
+        Returns:
+            TrajectoryIndex: Індекс траєкторій
+        """
+        if self.district_assigner is None and 'Район' in df.columns:
+            districts = df['Район']
+        else:
+            lon_column = 'Долгота' if 'Долгота' in df.columns else 'Довгота'
+            districts = assign_districts(df, self.district_assigner, lon_column=lon_column)
+        return TrajectoryIndex(df.assign(district=districts))
+
+    def _load_trajectory_index(self) -> TrajectoryIndex:
+        """
+        Індекс траєкторій вибраних файлів трафіку.
+
+        Індекс будується один раз і перебудовується лише при зміні переліку
+        файлів, часу їх модифікації або шару районів.
+
+        Returns:
+            TrajectoryIndex: Індекс траєкторій
+        """
+        if not self.traffic_files:
+            raise ValueError("Не вибрано файли трафіку")
+        key = (
+            tuple((file, os.path.getmtime(file)) for file in self.traffic_files),
+            id(self.district_assigner)
+        )
+        if self._trajectory_index is None or key != self._trajectory_index_key:
+            dataset = TrafficDataset.from_files(self.traffic_files)
+            self._trajectory_index = self.build_trajectory_index(dataset.frame)
+            self._trajectory_index_key = key
+        return self._trajectory_index
+
+    def _trajectory_output_dir(self) -> str:
+        """Тека results поруч з першим файлом трафіку."""
+        output_dir = os.path.join(os.path.dirname(self.traffic_files[0]), "results")
+        os.makedirs(output_dir, exist_ok=True)
+        return output_dir
+
+    def _find_path_followers(self):
+        """Пошук абонентів, траєкторія яких проходила вказаний шлях районів."""
+        try:
+            path = [part for part in re.split(r'\s*(?:>|→|;)\s*', self.trajectory_path.get().strip()) if part]
+            if not path:
+                raise ValueError("Вкажіть шлях районів, наприклад: Район A > Район B > Район C")
+
+            index = self._load_trajectory_index()
+            contiguous = self.trajectory_contiguous.get()
+            unknown = [district for district in path if district not in index.symbols]
+            if unknown:
+                raise ValueError(f"Райони відсутні в траєкторіях: {', '.join(unknown)}")
+
+            days = index.find(path, contiguous)
+            followers = index.followers(path, contiguous)
+
+            results_filename = os.path.join(
+                self._trajectory_output_dir(),
+                f"path_followers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            )
+            with pd.ExcelWriter(results_filename) as writer:
+                followers.rename(columns={
+                    'subscriber': 'Абонент',
+                    'days': 'Днів',
+                    'first_date': 'Перша дата',
+                    'last_date': 'Остання дата'
+                }).to_excel(writer, sheet_name='Абоненти', index=False)
+                days.rename(columns={
+                    'subscriber': 'Абонент',
+                    'date': 'Дата',
+                    'length': 'Районів за день'
+                }).to_excel(writer, sheet_name='Абонент-дні', index=False)
+
+            self.log_text.insert(
+                tk.END,
+                f"{self._get_current_datetime_and_user()}\n"
+                f"Шлях {' → '.join(path)}{' (підряд)' if contiguous else ''}: "
+                f"{len(followers)} абонентів, {len(days)} з {len(index)} абонент-днів\n"
+                f"Результати збережено в: {results_filename}\n"
+            )
+            self.log_text.see(tk.END)
+
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Помилка пошуку шляху: {e}")
+            logging.error(f"Помилка пошуку шляху: {e}")
+
+    def _export_frequent_subpaths(self):
+        """Експорт найчастіших спільних ділянок траєкторій усіх абонентів."""
+        try:
+            try:
+                length = int(self.subpath_length.get())
+                min_subscribers = int(self.subpath_min_subscribers.get())
+            except ValueError as e:
+                raise ValueError("Неправильний формат параметрів ділянок") from e
+
+            index = self._load_trajectory_index()
+            subpaths = index.frequent_subpaths(length, min_subscribers, limit=self.EXCEL_MAX_ROWS - 1)
+
+            results_filename = os.path.join(
+                self._trajectory_output_dir(),
+                f"frequent_subpaths_{length}.xlsx"
+            )
+            subpaths.rename(columns={
+                'path': 'Ділянка',
+                'subscribers': 'Абонентів',
+                'days': 'Абонент-днів'
+            }).to_excel(results_filename, index=False)
+
+            self.log_text.insert(
+                tk.END,
+                f"{self._get_current_datetime_and_user()}\n"
+                f"Спільних ділянок з {length} районів: {len(subpaths)} "
+                f"(не менше {min_subscribers} абонентів)\n"
+                f"Результати збережено в: {results_filename}\n"
+            )
+            self.log_text.see(tk.END)
+
+        except Exception as e:
+            messagebox.showerror("Помилка", f"Помилка пошуку спільних ділянок: {e}")
+            logging.error(f"Помилка пошуку спільних ділянок: {e}")
+
+    def get_daily_trajectories(self, df):
+        """Отримання щоденних траєкторій (райони визначаються, якщо колонки district немає)."""
+        if 'district' not in df.columns:
+            df = df.assign(district=self.assign_districts(df))
+        return daily_trajectories(df)
 
     @staticmethod
     def is_subsequence(sub, full, min_match_length):
@@ -53,11 +53,21 @@ class Config:
                 ],
                 "similarity_threshold": 90,
                 "max_distance": 400,
-                "time_window": 30
+                "time_window": 30,
+                "gazetteer_path": ""
+            },
+            "movement": {
+                "stay_radius": 500,
+                "max_speed": 200
+            },
+            "filters": {
+                "day_start": "07:00",
+                "day_end": "20:00"
             },
             "database": {
                 "path": "addresses.db",
-                "backup_path": "backups/"
+                "backup_path": "backups/",
+                "backup_keep": 10
             }
         }
 